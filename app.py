@@ -7,12 +7,14 @@ Created on Thu May 18 23:31:42 2023
 
 import threading
 import argparse
+import atexit
 
 import pygame
 
 from mixmancer.gui.frames import Controller, StartFrame, MenuBar, get_frames
+from mixmancer.gui.scheduler import Scheduler
 from mixmancer.api.api import start_fastapi, data_queue
-from mixmancer.config.parameters import FRAME_RATE
+from mixmancer.profiler import profiler
 
 
 class App(Controller):
@@ -29,7 +31,6 @@ class App(Controller):
         # Initialize pygame
         pygame.init()
         pygame.mixer.init()
-        self.clock = pygame.time.Clock()
 
         # Initialize frames
         for F in get_frames():
@@ -45,19 +46,19 @@ class App(Controller):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the app with or without API thread.")
     parser.add_argument("-local", action="store_true", help="Run the app without API thread")
+    parser.add_argument("-profile", action="store_true", help="Time main loop stages and show them on the projector")
+    parser.add_argument("-profile_output", default="profile.json", help="JSON file the stage timings are dumped to")
     args = parser.parse_args()
 
+    if args.profile:
+        profiler.enable()
+        atexit.register(profiler.dump, args.profile_output)
+
     if not args.local:
         thread = threading.Thread(target=start_fastapi)
         thread.daemon = True
         thread.start()
 
     app = App()
-    while True:
-        app.update()
-        app.clock.tick(FRAME_RATE)
-
-        # Check the queue for new data
-        while not data_queue.empty():
-            data = data_queue.get()
-            app.process_data(data)
+    scheduler = Scheduler(app, data_queue)
+    scheduler.run()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of Coordinate operations.
+
+Reports the cost per operation of the Coordinate used on the render and physics paths, next to the pydantic model
+it replaced. Run from the repository root:
+
+    python -m benchmarks.bench_coordinate
+"""
+
+import argparse
+import sys
+import timeit
+from typing import Any, Callable
+
+from pydantic import BaseModel, field_validator
+
+from mixmancer.config.data_models import Coordinate
+
+
+class PydanticCoordinate(BaseModel):
+    """The pydantic Coordinate previously used on the render and physics paths, kept for comparison"""
+
+    x: int
+    y: int
+
+    def __init__(self, x: int, y: int):
+        super().__init__(x=x, y=y)
+
+    def __add__(self, other: "PydanticCoordinate") -> "PydanticCoordinate":
+        return PydanticCoordinate(x=self.x + other.x, y=self.y + other.y)
+
+    def __sub__(self, other: "PydanticCoordinate") -> "PydanticCoordinate":
+        return PydanticCoordinate(x=self.x - other.x, y=self.y - other.y)
+
+    def divide(self, constant: float) -> "PydanticCoordinate":
+        return PydanticCoordinate(x=int(self.x / constant), y=int(self.y / constant))
+
+    @field_validator("x", "y")  # type: ignore
+    def check_integer(cls, v: Any) -> int:
+        if not isinstance(v, int):
+            raise ValueError(f"Value must be int, got {type(v).__name__}")
+        return v
+
+
+def operations(cls: Any) -> dict[str, Callable[[], Any]]:
+    """The operations measured for a coordinate class"""
+    a, b = cls(640, 360), cls(3, -2)
+    return {
+        "construct": lambda: cls(640, 360),
+        "add": lambda: a + b,
+        "sub": lambda: a - b,
+        "divide": lambda: a.divide(2),
+        "attribute": lambda: a.x,
+        "normalize": lambda: (a - b + a).divide(2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the cost per operation of Coordinate.")
+    parser.add_argument("--number", type=int, default=200_000, help="Number of calls per repeat")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed repeats, the fastest is reported")
+    args = parser.parse_args()
+
+    classes: dict[str, Any] = {"Coordinate": Coordinate, "pydantic": PydanticCoordinate}
+    results: dict[str, dict[str, float]] = {}
+    for name, cls in classes.items():
+        results[name] = {}
+        for op, fn in operations(cls).items():
+            best = min(timeit.repeat(fn, number=args.number, repeat=args.repeats))
+            results[name][op] = best / args.number * 1e9
+
+    print(f"{'operation':<12}" + "".join(f"{name:>16}" for name in classes))
+    for op in results["Coordinate"]:
+        print(f"{op:<12}" + "".join(f"{results[name][op]:>13.1f} ns" for name in classes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Headless benchmarks for the display subsystem.
+
+Runs pygame with the SDL dummy video driver, so it works without a screen. Run from the repository root:
+
+    python -m benchmarks.bench_display                  # run and compare against benchmarks/baseline.json
+    python -m benchmarks.bench_display --save-baseline  # run and store the results as the new baseline
+    python -m benchmarks.bench_display --filter dice    # only run benchmarks whose name contains "dice"
+
+Results are written as JSON. A benchmark whose median is slower than its baseline by more than the tolerance is
+reported as a regression and makes the run exit with status 1.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+import pygame
+from PIL import Image
+
+from mixmancer.config.data_models import Coordinate
+from mixmancer.display.dice import Dice, generate_dice
+from mixmancer.display.effects import TextSprite
+from mixmancer.display.hexmap import HexMap
+from mixmancer.display.image import ImageProjector
+from mixmancer.display.sprite import Spritesheet, rotations, spritesheets
+from mixmancer.gui.thumbnails import make_thumbnail
+
+BASELINE_PATH = "benchmarks/baseline.json"
+OUTPUT_PATH = "benchmarks/results.json"
+RESOLUTIONS = [(1280, 720), (1920, 1080), (3840, 2160)]
+DICE_COUNTS = [1, 10, 50, 100]
+
+
+class Benchmark:
+    """A single named benchmark.
+
+    Attributes:
+        name (str): Unique name of the benchmark, used to match results against the baseline.
+        run (Callable): Function being measured. Receives the state returned by setup.
+        setup (Optional[Callable]): Function preparing fresh state before each repeat. Not timed.
+        number (int): Number of calls per repeat. Results are reported per call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Any], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        number: int = 1,
+    ):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.number = number
+
+    def measure(self, repeats: int) -> dict[str, float]:
+        """Time the benchmark and summarize the per-call durations in milliseconds"""
+        samples: list[float] = []
+        for _ in range(repeats):
+            state = self.setup() if self.setup else None
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.run(state)
+            samples.append((time.perf_counter() - start) * 1000 / self.number)
+        samples.sort()
+        return {
+            "median_ms": round(statistics.median(samples), 4),
+            "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 4),
+            "min_ms": round(samples[0], 4),
+            "repeats": repeats,
+        }
+
+
+def make_image_file(directory: str, name: str, size: tuple[int, int]) -> str:
+    """Write a noisy test image, so decoders and scalers cannot take shortcuts on flat colour"""
+    path = os.path.join(directory, name)
+    Image.effect_noise(size, 64).convert("RGB").save(path, quality=90)
+    return path
+
+
+def make_hexmap(directory: str, history_length: int) -> HexMap:
+    """Build a hexmap over a synthetic 4000x3000 map with a synthetic movement history"""
+    map_path = os.path.join(directory, "map.png")
+    if not os.path.exists(map_path):
+        make_image_file(directory, "map.png", (4000, 3000))
+    history_file = os.path.join(directory, f"history_{history_length}.txt")
+    with open(history_file, "w") as f:
+        x, y = 30, 20
+        for _ in range(history_length):
+            x, y = x + random.choice([-1, 0, 1]), y + random.choice([-1, 0, 1])
+            f.write(f"{x},{y}\n")
+    return HexMap(map_path, Coordinate(1280, 900), 56, Coordinate(8, 85), Coordinate(30, 20), history_file=history_file)
+
+
+def make_dice(projector: ImageProjector, count: int) -> list[Dice]:
+    """Build dice through the same placement as a real roll"""
+    dice: list[Dice] = []
+    for _ in range(count):
+        dice.append(generate_dice("d20", projector.resolution, [Coordinate(d.rect.x, d.rect.y) for d in dice]))
+    return dice
+
+
+def build_benchmarks(directory: str) -> Iterator[Benchmark]:
+    """Build all benchmarks lazily. Each projector resets the display mode, so its benchmarks must run before
+    the next one is created."""
+    random.seed(0)
+
+    # Projector blit at several resolutions
+    image_path = make_image_file(directory, "image.jpg", (4000, 3000))
+    for resolution in RESOLUTIONS:
+        projector = ImageProjector(Coordinate(*resolution), 0)
+        projector.load_image_file(image_path)
+
+        def full_frame(_: Any, projector: ImageProjector = projector):
+            projector.blit()
+            projector.update()
+
+        name = f"{resolution[0]}x{resolution[1]}"
+        yield Benchmark(f"projector_blit_{name}", full_frame, number=5)
+        yield Benchmark(f"projector_idle_frame_{name}", lambda _, p=projector: p.update(), number=20)
+
+    # Dice physics and collisions
+    projector = ImageProjector(Coordinate(1920, 1080), 0)
+    for count in DICE_COUNTS:
+
+        def dice_setup(count: int = count) -> pygame.sprite.Group:  # type: ignore[type-arg]
+            return pygame.sprite.Group(make_dice(projector, count))
+
+        def dice_update(group: pygame.sprite.Group) -> None:  # type: ignore[type-arg]
+            group.update()
+
+        def collisions_setup(count: int = count) -> None:
+            projector.clear_dice()
+            projector.dice_group.add(make_dice(projector, count))
+            projector.dice_group.update()
+
+        yield Benchmark(f"dice_update_{count}", dice_update, dice_setup, number=10)
+        yield Benchmark(
+            f"check_collisions_{count}", lambda _: projector.check_collisions(), collisions_setup, number=10
+        )
+
+    # Dice creation with a cold and a warm spritesheet cache
+    def spawn_ten(_: Any) -> None:
+        for _ in range(10):
+            generate_dice("d20", projector.resolution, [])
+
+    yield Benchmark("generate_dice_10_cold", spawn_ten, lambda: spritesheets.clear())
+    yield Benchmark("generate_dice_10_warm", spawn_ten)
+    yield Benchmark("spawn_dice_100_crowded", lambda _: make_dice(projector, 100))
+
+    # Sprites
+    sheet = Spritesheet("assets/dice/d20/d20_20.png")
+    yield Benchmark("spritesheet_get_sprite", lambda _: sheet.get_sprite("0"), number=100)
+    yield Benchmark("spritesheet_get_frames_cold", lambda _: sheet.get_frames((100, 100)), sheet.frame_bank.clear)
+    frame = sheet.get_frames((100, 100))[-1]
+    yield Benchmark("rotate_frame_cold", lambda _: rotations.rotate(frame, 45), rotations.surfaces.clear, number=1)
+    yield Benchmark("rotate_frame_warm", lambda _: rotations.rotate(frame, 45), number=100)
+    text = TextSprite("20", (960, 540))
+    yield Benchmark("text_sprite_update", lambda _: text.update(), number=100)
+
+    # Hexmap rendering
+    for history_length in (0, 100, 1000):
+        hexmap = make_hexmap(directory, history_length)
+        hexmap.history_flag = history_length > 0
+        name = f"hexmap_surface_history_{history_length}" if history_length else "hexmap_surface"
+        yield Benchmark(name, lambda _, h=hexmap: h.get_current_surface(), number=5)
+    hexmap.fog_flag = True
+    yield Benchmark("hexmap_surface_fog", lambda _, h=hexmap: h.get_current_surface(), number=5)
+    yield Benchmark("hexmap_fog_reveal", lambda _, h=hexmap: h.move(Coordinate(1, 0)), number=5)
+
+    def pan_setup(h: HexMap = hexmap) -> HexMap:
+        h.command("right")
+        return h
+
+    def pan_frame(h: HexMap) -> None:
+        h.camera.step()
+        h.get_current_surface()
+
+    yield Benchmark("hexmap_pan_frame", pan_frame, pan_setup, number=5)
+
+    # Route between the first and last passable hexes, from a cold distance field cache
+    passable = np.argwhere(np.isfinite(hexmap.pathfinder.costs))
+    (start_y, start_x), (goal_y, goal_x) = passable[0].tolist(), passable[-1].tolist()
+
+    def path_across_map(_: Any, h: HexMap = hexmap) -> None:
+        route = h.pathfinder.path((start_x, start_y), (goal_x, goal_y))
+        assert route is not None, "benchmark route endpoints are not connected"
+
+    yield Benchmark("hexmap_path_across_map", path_across_map, hexmap.pathfinder.fields.clear)
+
+    # ImageFrame thumbnail generation
+    thumbnail_jpg = make_image_file(directory, "thumbnail.jpg", (4000, 3000))
+    thumbnail_png = make_image_file(directory, "thumbnail.png", (2000, 1500))
+    yield Benchmark("thumbnail_jpg", lambda _: make_thumbnail(thumbnail_jpg, (100, 100)))
+    yield Benchmark("thumbnail_png", lambda _: make_thumbnail(thumbnail_png, (100, 100)))
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results (dict): Benchmark results keyed by name.
+        baseline (dict): Baseline results keyed by name.
+        tolerance (float): Allowed relative slowdown of the median before reporting a regression.
+
+    Returns:
+        list[str]: Names of benchmarks that regressed.
+    """
+    regressions: list[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<36}{result['median_ms']:>10.3f} ms   (new)")
+            continue
+        before = baseline[name]["median_ms"]
+        change = result["median_ms"] / before - 1 if before else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<36}{result['median_ms']:>10.3f} ms {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run headless display benchmarks.")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="JSON file the results are written to")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON file of baseline results")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown, e.g. 0.2 for 20%%")
+    parser.add_argument("--repeats", type=int, default=15, help="Number of timed repeats per benchmark")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    with tempfile.TemporaryDirectory() as directory:
+        results: dict[str, Any] = {}
+        for benchmark in build_benchmarks(directory):
+            if args.filter in benchmark.name:
+                results[benchmark.name] = benchmark.measure(args.repeats)
+    pygame.quit()
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+
+    baseline: dict[str, Any] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, field_validator
-from typing import Any, Tuple
+from pydantic import BaseModel
+from typing import NamedTuple, Tuple
 
 
 class DataModel(BaseModel):
@@ -15,41 +15,41 @@ class DataModel(BaseModel):
     disadvantage: bool
 
 
-class Coordinate(BaseModel):
+class Coordinate(NamedTuple):
+    """Immutable integer x/y pair used on the render and physics paths.
+
+    This is a plain tuple rather than a pydantic model, so building one and doing arithmetic on it costs no
+    validation. Values are trusted to be ints; validation belongs where values enter the app, in `DataModel` for
+    the API and in `Settings` for the settings file. Being a tuple, it can also be passed straight to pygame
+    wherever a position or size is expected. `+`, `-` and `*` are element-wise, like the model it replaced, rather
+    than tuple concatenation and repetition.
+    """
+
     x: int
     y: int
 
-    def __init__(self, x: int, y: int):
-        super().__init__(x=x, y=y)
-
     def __call__(self) -> Tuple[int, int]:
         return (self.x, self.y)
 
     def __repr__(self) -> str:
         return f"Coordinate(x={self.x}, y={self.y})"
 
-    def __add__(self, other: "Coordinate") -> "Coordinate":
-        return Coordinate(x=self.x + other.x, y=self.y + other.y)
+    def __add__(self, other: "Coordinate") -> "Coordinate":  # type: ignore[override]
+        return Coordinate(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other: "Coordinate") -> "Coordinate":
-        return Coordinate(x=self.x - other.x, y=self.y - other.y)
+        return Coordinate(self.x - other.x, self.y - other.y)
 
-    def __mul__(self, other: "Coordinate") -> "Coordinate":
-        return Coordinate(x=self.x * other.x, y=self.y * other.y)
+    def __mul__(self, other: "Coordinate") -> "Coordinate":  # type: ignore[override]
+        return Coordinate(self.x * other.x, self.y * other.y)
 
     def divide(self, constant: float) -> "Coordinate":
         if constant == 0:
             raise ValueError("Cannot divide by zero")
-        return Coordinate(x=int(self.x / constant), y=int(self.y / constant))
-
-    def float(self) -> tuple[float, float]:
-        return (float(self.x), float(self.y))
+        return Coordinate(int(self.x / constant), int(self.y / constant))
 
     def half(self) -> Tuple[int, int]:
         return (self.x // 2, self.y // 2)
 
-    @field_validator("x", "y")  # type: ignore
-    def check_integer(cls, v: Any) -> int:
-        if not isinstance(v, int):
-            raise ValueError(f"Value must be int, got {type(v).__name__}")
-        return v
+    def float(self) -> tuple[float, float]:
+        return (float(self.x), float(self.y))
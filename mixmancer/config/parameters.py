@@ -1 +1,30 @@
 FRAME_RATE: int = 20
+IDLE_POLL_RATE: int = 10
+IDLE_GRACE_PERIOD: float = 1.0
+IMAGE_CACHE_BUDGET: int = 256 * 1024 * 1024
+TILE_CACHE_BUDGET: int = 64 * 1024 * 1024
+ROTATION_CACHE_BUDGET: int = 32 * 1024 * 1024
+ROTATION_STEP: int = 5
+FOG_REVEAL_RADIUS: int = 1
+FOG_MASK_HEX_PIXELS: int = 8
+FOG_SAVE_INTERVAL: float = 30.0
+TERRAIN_COLORS: dict[str, tuple[int, int, int]] = {
+    "water": (70, 110, 160),
+    "plains": (165, 175, 105),
+    "forest": (60, 100, 55),
+    "hills": (150, 130, 90),
+    "mountains": (120, 115, 110),
+    "desert": (220, 200, 140),
+    "snow": (240, 240, 240),
+}
+TERRAIN_COSTS: dict[str, float] = {
+    "water": 4.0,
+    "plains": 1.0,
+    "forest": 2.0,
+    "hills": 2.0,
+    "mountains": 3.0,
+    "desert": 1.5,
+    "snow": 2.5,
+}
+CAMERA_PAN_DURATION: float = 0.4
+TRAVEL_COST_LIMIT: float = 1000.0
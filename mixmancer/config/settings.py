@@ -1,6 +1,14 @@
 import json
+from typing import Any
 from mixmancer.config.data_models import Coordinate
 
+COORDINATE_SETTINGS = ("app_resolution", "projector_resolution", "hexmap_offset", "hexmap_start")
+
+
+def is_integer(value: Any) -> bool:
+    """Check if a JSON value is an integer, rejecting booleans"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
 
 class Settings:
     """This class represents the settings of the application, such as resolution configurations, display preferences, and color schemes.
@@ -68,6 +76,7 @@ class Settings:
         with open(filename, "r") as f:
             data = json.load(f)
         self.check_keys(data)
+        self.check_values(data)
         self.__dict__.update(data)
 
     def check_keys(self, data: dict[str, str]):
@@ -80,3 +89,16 @@ class Settings:
             for color_key in data["color"]:
                 if color_key not in self.color:
                     raise ValueError(f"Missing color key '{color_key}' in settings JSON.")
+
+    def check_values(self, data: dict[str, Any]):
+        """Check that coordinate and size settings hold integers, converting coordinate pairs to tuples"""
+        for key in COORDINATE_SETTINGS:
+            value = data[key]
+            if not isinstance(value, (list, tuple)) or len(value) != 2 or not all(is_integer(v) for v in value):
+                raise ValueError(f"Setting '{key}' must be a pair of integers, got {value!r}.")
+            data[key] = tuple(value)
+        for key in ("display", "hex_size"):
+            if not is_integer(data[key]):
+                raise ValueError(f"Setting '{key}' must be an integer, got {data[key]!r}.")
+        if data["hex_size"] <= 0 or min(data["projector_resolution"]) <= 0 or min(data["app_resolution"]) <= 0:
+            raise ValueError("Settings 'hex_size', 'projector_resolution' and 'app_resolution' must be positive.")
@@ -0,0 +1,149 @@
+import sys
+import pygame
+from contextlib import contextmanager
+from PIL import Image
+from typing import Iterator, Optional
+
+from mixmancer.profiler import profiler
+
+
+class BridgeStats:
+    """Running totals of pixel bytes passed between pygame and PIL.
+
+    Attributes:
+        shared_bytes (int): Bytes exposed through the buffer protocol without copying.
+        copied_bytes (int): Bytes copied because the pixel layouts could not be shared.
+    """
+
+    def __init__(self):
+        self.shared_bytes: int = 0
+        self.copied_bytes: int = 0
+
+    def reset(self):
+        """Reset the running totals"""
+        self.shared_bytes = 0
+        self.copied_bytes = 0
+
+    def report(self) -> str:
+        """Summarize the running totals"""
+        return f"bridge: {self.shared_bytes // 1024} KiB shared, {self.copied_bytes // 1024} KiB copied"
+
+
+stats = BridgeStats()
+profiler.add_report(stats.report)
+
+
+def surface_rawmode(surface: pygame.Surface) -> Optional[str]:
+    """Describe the byte order of a surface's pixels as a PIL raw mode, e.g. "BGRX" or "RGBA".
+
+    Args:
+        surface (pygame.Surface): The surface to describe.
+
+    Returns:
+        Optional[str]: The raw mode, or None for palette and 16-bit surfaces.
+    """
+    bytesize = surface.get_bytesize()
+    if bytesize not in (3, 4):
+        return None
+    channels = ["X"] * bytesize
+    for name, mask, shift in zip("RGBA", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            channels[shift // 8] = name
+    if sys.byteorder == "big":
+        channels.reverse()
+    return "".join(channels)
+
+
+@contextmanager
+def pil_view(surface: pygame.Surface) -> Iterator[Image.Image]:
+    """Expose a surface's pixels to PIL through the buffer protocol.
+
+    When the surface layout matches a PIL mode (RGBX/RGBA) the image shares the surface memory. Otherwise the
+    pixels are unpacked once straight from the buffer. The surface stays locked while the view is open, so the
+    image must not be used or kept after the block.
+
+    Args:
+        surface (pygame.Surface): The surface to expose.
+
+    Yields:
+        Image.Image: A read-only PIL image of the surface pixels.
+    """
+    size = surface.get_size()
+    rawmode = surface_rawmode(surface)
+    nbytes = surface.get_pitch() * size[1]
+    if rawmode is None:
+        stats.copied_bytes += nbytes
+        yield Image.frombytes("RGBA", size, pygame.image.tostring(surface, "RGBA"))  # type: ignore[reportUnknownMemberType]
+        return
+
+    mode = rawmode if rawmode in ("RGBX", "RGBA") else ("RGBA" if "A" in rawmode else "RGB")
+    if mode == rawmode:
+        stats.shared_bytes += nbytes
+    else:
+        stats.copied_bytes += nbytes
+    buffer = surface.get_buffer()
+    try:
+        yield Image.frombuffer(mode, size, buffer, "raw", rawmode, surface.get_pitch(), 1)  # type: ignore[reportUnknownMemberType]
+    finally:
+        del buffer
+
+
+def surface_to_pil(surface: pygame.Surface) -> Image.Image:
+    """Copy a surface's pixels into a PIL image owned by the caller, in a single copy.
+
+    Args:
+        surface (pygame.Surface): The surface to copy.
+
+    Returns:
+        Image.Image: An RGB or RGBA PIL image.
+    """
+    with pil_view(surface) as view:
+        if not view.readonly:
+            return view
+        image = view.convert("RGBA" if view.mode == "RGBA" else "RGB")
+    stats.copied_bytes += len(image.getbands()) * image.width * image.height
+    return image
+
+
+def thumbnail(surface: pygame.Surface, dimensions: tuple[int, int]) -> Image.Image:
+    """Make a PIL thumbnail of a surface without copying the full frame.
+
+    Display surfaces are usually BGRX, which PIL cannot share, so 24 and 32-bit surfaces are shrunk by pygame
+    first and only the thumbnail-sized pixels cross the bridge.
+
+    Args:
+        surface (pygame.Surface): The surface to shrink.
+        dimensions (tuple[int, int]): Maximum dimensions of the thumbnail.
+
+    Returns:
+        Image.Image: An RGB thumbnail that keeps the surface aspect ratio.
+    """
+    w, h = surface.get_size()
+    t = min(1, dimensions[0] / w, dimensions[1] / h)
+    size = (max(1, round(t * w)), max(1, round(t * h)))
+    if size != (w, h) and surface.get_bytesize() in (3, 4):
+        surface = pygame.transform.smoothscale(surface, size)
+    with pil_view(surface) as view:
+        if view.size != size:
+            return view.resize(size, Image.Resampling.BICUBIC, reducing_gap=2.0).convert("RGB")
+        image = view.convert("RGB")
+    return image
+
+
+def pil_to_surface(image: Image.Image) -> pygame.Surface:
+    """Expose a PIL image's pixels to pygame.
+
+    PIL does not export its pixel memory, so the pixels are copied once into a bytes buffer which the
+    surface then shares instead of copying again.
+
+    Args:
+        image (Image.Image): The PIL image.
+
+    Returns:
+        pygame.Surface: A surface backed by the copied pixels.
+    """
+    if image.mode not in ("RGB", "RGBA", "RGBX"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    data = image.tobytes()  # type: ignore[reportUnknownMemberType]
+    stats.copied_bytes += len(data)
+    return pygame.image.frombuffer(data, image.size, image.mode)  # type: ignore[reportArgumentType]
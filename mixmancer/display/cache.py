@@ -0,0 +1,79 @@
+import pygame
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    """Approximate memory footprint of a pygame surface in bytes"""
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceCache:
+    """Least-recently-used cache of pygame surfaces bounded by a memory budget.
+
+    Attributes:
+        budget (int): Maximum number of bytes held by cached surfaces.
+        size (int): Number of bytes currently held by cached surfaces.
+        surfaces (OrderedDict): Cached surfaces ordered from least to most recently used.
+    """
+
+    def __init__(self, budget: int):
+        """
+        Initializes an empty cache.
+
+        Args:
+            budget (int): Maximum number of bytes held by cached surfaces.
+        """
+        self.budget = budget
+        self.size: int = 0
+        self.surfaces: OrderedDict[Hashable, pygame.Surface] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.surfaces
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        """Get a cached surface and mark it as most recently used.
+
+        Args:
+            key (Hashable): Cache key of the surface.
+
+        Returns:
+            Optional[pygame.Surface]: The cached surface, or None if not cached.
+        """
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key: Hashable, surface: pygame.Surface):
+        """Add a surface to the cache, evicting least recently used surfaces to stay within budget.
+
+        Surfaces larger than the whole budget are not cached.
+
+        Args:
+            key (Hashable): Cache key of the surface.
+            surface (pygame.Surface): The surface to cache.
+        """
+        self.discard(key)
+        nbytes = surface_bytes(surface)
+        if nbytes > self.budget:
+            return
+        while self.surfaces and self.size + nbytes > self.budget:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size -= surface_bytes(evicted)
+        self.surfaces[key] = surface
+        self.size += nbytes
+
+    def discard(self, key: Hashable):
+        """Remove a surface from the cache if present"""
+        surface = self.surfaces.pop(key, None)
+        if surface is not None:
+            self.size -= surface_bytes(surface)
+
+    def clear(self):
+        """Remove all surfaces from the cache"""
+        self.surfaces.clear()
+        self.size = 0
@@ -0,0 +1,68 @@
+import time
+from typing import Optional
+
+from mixmancer.config.parameters import CAMERA_PAN_DURATION
+
+
+class Camera:
+    """Point the hexmap view is centred on, panning smoothly to a new point over a fixed duration.
+
+    Positions are in the same pixel units as `HexMap.location_pixel`. The pan follows wall-clock time with an
+    ease-out curve, so it takes the same time whatever the frame rate.
+
+    Attributes:
+        duration (float): Length of a pan in seconds.
+        position (tuple[float, float]): The current centre of the view.
+        start (tuple[float, float]): The centre of the view when the current pan started.
+        target (Optional[tuple[int, int]]): The centre the view is panning to, None before the first jump.
+        start_time (float): Time the current pan started, from time.perf_counter.
+    """
+
+    def __init__(self, duration: float = CAMERA_PAN_DURATION):
+        self.duration = duration
+        self.position: tuple[float, float] = (0.0, 0.0)
+        self.start: tuple[float, float] = (0.0, 0.0)
+        self.target: Optional[tuple[int, int]] = None
+        self.start_time: float = 0.0
+
+    def jump(self, target: tuple[int, int]):
+        """Centre the view on a point immediately"""
+        self.position = self.start = (float(target[0]), float(target[1]))
+        self.target = target
+        self.start_time = 0.0
+
+    def pan_to(self, target: tuple[int, int]):
+        """Start panning to a point from wherever the view is now, including partway through another pan"""
+        if self.target is None:
+            self.jump(target)
+        elif target != self.target:
+            self.start = self.position
+            self.target = target
+            self.start_time = time.perf_counter()
+
+    def moving(self) -> bool:
+        """Check if the view has not reached its target yet"""
+        return self.target is not None and self.position != self.target
+
+    def step(self) -> tuple[int, int]:
+        """Move the view to where it should be at the current time.
+
+        Returns:
+            tuple[int, int]: The new centre of the view, rounded to whole pixels.
+        """
+        if self.target is None:
+            return 0, 0
+        t = (time.perf_counter() - self.start_time) / self.duration if self.duration > 0 else 1.0
+        if t >= 1:
+            self.position = (float(self.target[0]), float(self.target[1]))
+        else:
+            eased = 1 - (1 - t) ** 3
+            self.position = (
+                self.start[0] + (self.target[0] - self.start[0]) * eased,
+                self.start[1] + (self.target[1] - self.start[1]) * eased,
+            )
+        return self.pixel()
+
+    def pixel(self) -> tuple[int, int]:
+        """The current centre of the view, rounded to whole pixels"""
+        return round(self.position[0]), round(self.position[1])
@@ -2,10 +2,15 @@ import pygame
 import random
 from typing import Any
 import os
+import threading
 import math
-from mixmancer.display.sprite import Spritesheet
+import functools
+from mixmancer.display.sprite import Spritesheet, rotations, spritesheets
 from mixmancer.config.data_models import Coordinate
 
+DICE_SIDES = [4, 6, 8, 10, 12, 20]
+DICE_SIZE = (100, 100)
+
 
 class Dice(pygame.sprite.Sprite):
     """
@@ -15,6 +20,7 @@ class Dice(pygame.sprite.Sprite):
         roll (int): The initial roll value of the dice.
         bounds (tuple[int, int]): The boundaries within which the dice can move (width, height).
         sprite_sheets (list[Spritesheet]): A list of spritesheets used for the dice's animation.
+        frames (list[list[pygame.Surface]]): The frames of each spritesheet, pre-sliced at the size of the dice.
         sheet_index (int): The current index of the spritesheet being used.
         sprite_index (int): The current index of the sprite in the spritesheet being displayed.
         last_sheet (int): The index of the last spritesheet in sprite_sheets.
@@ -31,11 +37,8 @@ class Dice(pygame.sprite.Sprite):
         rotation (int): The rotation angle of the dice.
 
     Methods:
-        initialize_position() -> tuple[int, int]:
-            Initializes and returns a random valid position within the bounds.
-
-        check_valid_spawn(current_positions: list[tuple[int, int]]) -> bool:
-            Checks if the dice can be spawned at its current position without overlapping others.
+        spawn_position(other_dice: list[Coordinate]) -> tuple[int, int]:
+            Picks a free spawn slot along the edge of the bounds.
 
         load_spritesheets(sheet_list: list[str]) -> list[Spritesheet]:
             Loads and returns the spritesheets from the given list of file paths.
@@ -72,54 +75,57 @@ class Dice(pygame.sprite.Sprite):
         self.initial_velocity = pygame.Vector2(random.randint(20, 60), random.randint(20, 60))
         self.velocity = self.initial_velocity.copy()
         self.damping = 1
-        self.w, self.h = 100, 100
+        self.w, self.h = DICE_SIZE
+        self.frames = [sheet.get_frames(DICE_SIZE) for sheet in self.sprite_sheets]
 
-        # Initialize starting position, velocity, and direction
-        while True:  # Keep trying until valid
-            self.x, self.y = self.initialize_position()
-            self.rect = pygame.Rect(self.x, self.y, self.w, self.h)
-            if self.check_valid_spawn(self.rect, other_dice):
-                break
-
-    def initialize_position(self) -> tuple[int, int]:
-        """
-        Initializes a random position for the dice within the bounds.
+        # Rotate the landing frames now rather than in the frame where every dice lands together
+        for frames in self.frames[:-1]:
+            rotations.rotate(frames[-1], self.rotation)
 
-        Returns:
-            tuple[int, int]: A tuple containing the x and y coordinates of the initialized position.
-        """
-        if random.choices([True, False], weights=self.bounds()):
-            if random.choice([True, False]):
-                x, y = random.randint(0, self.bounds.x - self.w), 0
-            else:
-                x, y = random.randint(0, self.bounds.x - self.w), self.bounds.y - self.h
-        else:
-            if random.choice([True, False]):
-                x, y = 0, random.randint(0, self.bounds.y - self.h)
-            else:
-                x, y = self.bounds.x - self.w, random.randint(0, self.bounds.y - self.h)
-        return x, y
+        # Initialize starting position
+        self.x, self.y = self.spawn_position(other_dice)
+        self.rect = pygame.Rect(self.x, self.y, self.w, self.h)
 
-    def check_valid_spawn(self, rect: pygame.Rect, other_dice: list[Coordinate]) -> bool:
+    def spawn_position(self, other_dice: list[Coordinate]) -> tuple[int, int]:
         """
-        Checks if the current position is valid and does not overlap with other dice.
+        Picks a random spawn slot along the edge of the bounds that does not overlap other dice. When every slot is
+        taken, the slot overlapping the fewest dice is used instead and the dice bounce apart as they roll.
 
         Args:
-            other_dice (list[tuple[int, int]]): A list of tuples containing the positions of other dice.
+            other_dice (list[Coordinate]): The positions of other dice to avoid.
 
         Returns:
-            bool: True if the position is valid, False otherwise.
+            tuple[int, int]: The x and y coordinates of the spawn position.
         """
-        if other_dice:
-            for other in other_dice:
-                another_dice = pygame.Rect(other.x, other.y, rect.w, rect.h)
-                if rect.colliderect(another_dice):
-                    return False
-        return True
+        slots = spawn_slots(self.bounds, (self.w, self.h))
+        if not slots:
+            return 0, 0
+
+        # Bucket the other dice by dice-sized cells, so each slot only checks the dice in neighbouring cells
+        cells: dict[tuple[int, int], list[Coordinate]] = {}
+        for other in other_dice:
+            cells.setdefault((other.x // self.w, other.y // self.h), []).append(other)
+
+        def overlaps(slot: tuple[int, int]) -> int:
+            x, y = slot
+            column, row = x // self.w, y // self.h
+            return sum(
+                abs(other.x - x) < self.w and abs(other.y - y) < self.h
+                for dx in (-1, 0, 1)
+                for dy in (-1, 0, 1)
+                for other in cells.get((column + dx, row + dy), ())
+            )
+
+        crowding = [overlaps(slot) for slot in slots]
+        free = [slot for slot, count in zip(slots, crowding) if not count]
+        if free:
+            return random.choice(free)
+        least = min(crowding)
+        return random.choice([slot for slot, count in zip(slots, crowding) if count == least])
 
     def load_spritesheets(self, sheet_list: list[str]):
         """
-        Loads the sprite sheets from the given list of file paths.
+        Gets the sprite sheets for the given list of file paths from the shared spritesheet cache.
 
         Args:
             sheet_list (list[str]): List of file paths to the sprite sheets.
@@ -129,7 +135,7 @@ class Dice(pygame.sprite.Sprite):
         """
         sprite_sheets: list[Spritesheet] = []
         for sheet in sheet_list:
-            sprite_sheets.append(Spritesheet(sheet))
+            sprite_sheets.append(spritesheets.get(sheet))
         return sprite_sheets
 
     def update_position(self):
@@ -161,11 +167,14 @@ class Dice(pygame.sprite.Sprite):
     def update(self, *args: Any, **kwargs: Any):
         """Updates the sprite's animation and movement."""
         if not self.end_flag:
-            self.image, next_sheet = self.sprite_sheets[self.sheet_index].get_sprite(str(self.sprite_index))
-            self.image = pygame.transform.scale(self.image, (self.w, self.h))
-            if next_sheet:
+            frames = self.frames[self.sheet_index]
+            self.image = frames[self.sprite_index]
+            if self.rect.size != DICE_SIZE:
+                self.rect = pygame.Rect(self.x, self.y, self.w, self.h)
+            if self.sprite_index == len(frames) - 1:
                 if self.sheet_index != self.last_sheet:
-                    self.image = pygame.transform.rotate(self.image, angle=self.rotation)
+                    self.image = rotations.rotate(self.image, self.rotation)
+                    self.rect = rotations.bounds(DICE_SIZE, self.rotation).move(self.x, self.y)
                     self.sheet_index += 1
                     self.sprite_index = 0
                 else:
@@ -175,6 +184,36 @@ class Dice(pygame.sprite.Sprite):
         self.update_position()
 
 
+@functools.lru_cache(maxsize=8)
+def spawn_slots(bounds: Coordinate, size: tuple[int, int]) -> list[tuple[int, int]]:
+    """
+    Lays out non-overlapping dice positions along the edges of the bounds. Each edge holds as many slots as fit,
+    spread evenly from corner to corner, and the corner slots are shared between edges.
+
+    Parameters:
+        bounds (Coordinate): The width and height of the area the dice roll in.
+        size (tuple[int, int]): The width and height of a dice.
+
+    Returns:
+        list[tuple[int, int]]: The top-left corner of each slot. Empty if a dice does not fit in the bounds.
+    """
+    w, h = size
+    right, bottom = bounds.x - w, bounds.y - h
+    if right < 0 or bottom < 0:
+        return []
+
+    def spread(length: int, step: int) -> list[int]:
+        count = length // step + 1
+        if count == 1:
+            return [0]
+        return [round(i * length / (count - 1)) for i in range(count)]
+
+    xs, ys = spread(right, w), spread(bottom, h)
+    slots = {(x, y) for x in xs for y in (0, bottom)}
+    slots.update((x, y) for y in ys[1:-1] for x in (0, right))
+    return sorted(slots)
+
+
 def generate_dice(dice: str, bounds: Coordinate, current_positions: list[Coordinate]) -> Dice:
     """
     Generates a dice object with the specified number of sides.
@@ -197,6 +236,23 @@ def generate_dice(dice: str, bounds: Coordinate, current_positions: list[Coordin
         )
 
     roll = random.randint(1, val)
+    return Dice(dice_sheet_paths(val, roll), roll, bounds, current_positions)
+
+
+def dice_sheet_paths(val: int, roll: int) -> list[str]:
+    """
+    Gets the file paths of the sprite sheets animating a roll.
+
+    Parameters:
+        val (int): The number of sides of the dice.
+        roll (int): The rolled value.
+
+    Returns:
+        list[str]: The sprite sheet file paths, in animation order.
+
+    Raises:
+        KeyError: If the specified dice value is not found in the 'sprite_sheets' dictionary.
+    """
     sprite_path = "assets/dice"
     sprite_sheets = {
         4: ["d20/single_roll.png", f"d20/d20_{roll}.png"],
@@ -211,5 +267,13 @@ def generate_dice(dice: str, bounds: Coordinate, current_positions: list[Coordin
     if val not in sprite_sheets:
         raise KeyError(f"Dice with {val} sides not found in the sprite_sheets dictionary.")
 
-    sheet_paths = [os.path.join(sprite_path, sheet) for sheet in sprite_sheets[val]]
-    return Dice(sheet_paths, roll, bounds, current_positions)
+    return [os.path.join(sprite_path, sheet) for sheet in sprite_sheets[val]]
+
+
+def preload_dice_sheets() -> threading.Thread:
+    """Loads the sprite sheets of every possible roll into the shared spritesheet cache on a background thread"""
+    paths: dict[str, None] = {}
+    for val in DICE_SIDES:
+        for roll in range(1, val + 1):
+            paths.update(dict.fromkeys(dice_sheet_paths(val, roll)))
+    return spritesheets.preload(list(paths), DICE_SIZE)
@@ -2,7 +2,7 @@ import pygame
 import random
 from typing import Any
 
-from mixmancer.display.sprite import Spritesheet
+from mixmancer.display.sprite import rotations, spritesheets
 from mixmancer.display.utils import resize_image_with_aspect_ratio
 
 
@@ -17,7 +17,8 @@ class ResultWisp(pygame.sprite.Sprite):
         self.y = float(starting_location[1])
         self.target_location = target_location
         self.w, self.h = 100, 100
-        self.sprite_sheet = Spritesheet("assets/dice/fx/green.png")
+        self.sprite_sheet = spritesheets.get("assets/dice/fx/green.png")
+        self.frames = self.sprite_sheet.get_frames((self.w, self.h))
         self.sprite_index = 0
         self.end_flag = False
         self.rect = pygame.Rect(int(self.x), int(self.y), self.w, self.h)
@@ -33,9 +34,8 @@ class ResultWisp(pygame.sprite.Sprite):
     def update(self, *args: Any, **kwargs: Any):
         """Updates the sprite's animation and movement."""
         if not self.rect.colliderect(pygame.Rect(self.target_location[0], self.target_location[1], 10, 10)):
-            self.image, self.end_flag = self.sprite_sheet.get_sprite(str(self.sprite_index))
-            self.image = pygame.transform.scale(self.image, (self.w, self.h))
-            self.image = pygame.transform.rotate(self.image, angle=self.rotation)
+            self.image = rotations.rotate(self.frames[self.sprite_index], self.rotation)
+            self.end_flag = self.sprite_index == len(self.frames) - 1
             if self.end_flag:
                 self.sprite_index = 0
                 self.end_flag = False
@@ -0,0 +1,260 @@
+import math
+import os
+import time
+import pygame
+import numpy as np
+from numpy.typing import NDArray
+from typing import Optional
+
+from mixmancer.config.parameters import FOG_MASK_HEX_PIXELS, FOG_REVEAL_RADIUS, FOG_SAVE_INTERVAL
+from mixmancer.display.hexgrid import HexLayout, axial_to_offset, hex_range, offset_to_axial
+
+
+class FogOfWar:
+    """Fog of war over a hexmap, backed by a per-hex explored bitmap.
+
+    Unexplored hexes are covered by a cached alpha mask that holds roughly `hex_pixels` mask pixels across each
+    hex. Revealing hexes only recomputes the part of the mask around them. The explored bitmap is saved to disk
+    together with the layout it was built for, at most once every `save_interval` seconds and on `flush`. The
+    bitmap can always be rebuilt by revealing the movement history, so a change lost in a crash is not lost for
+    good.
+
+    Attributes:
+        path (str): File path the explored bitmap is saved to.
+        map_size (tuple[int, int]): Width and height of the map in pixels.
+        radius (int): Number of hexes revealed around the player in every direction.
+        hex_pixels (int): Approximate width of a hex in mask pixels.
+        save_interval (float): Minimum number of seconds between saves.
+        explored (NDArray): Explored flags indexed by grid row then column.
+        layout (HexLayout): The hex grid placement the explored bitmap is indexed by.
+        mask_layout (Optional[HexLayout]): The hex grid placement the mask was drawn for, or None before the first
+            `configure`.
+        mask (pygame.Surface): Black surface whose alpha is opaque over unexplored hexes.
+        mask_scale (float): Mask pixels per map pixel.
+        generation (int): Counter bumped whenever the mask changes.
+        scaled (Optional[pygame.Surface]): Reused surface the visible part of the mask is scaled into.
+        scaled_key (Optional[tuple]): The (region, zoom, generation) the scaled surface holds.
+        dirty (bool): Flag indicating whether the bitmap changed since it was last saved.
+        saved_at (float): perf_counter time of the last save.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        map_size: tuple[int, int],
+        radius: int = FOG_REVEAL_RADIUS,
+        hex_pixels: int = FOG_MASK_HEX_PIXELS,
+        save_interval: float = FOG_SAVE_INTERVAL,
+    ):
+        """
+        Loads the explored bitmap if it was saved before. `configure` must be called before use.
+
+        Args:
+            path (str): File path the explored bitmap is saved to.
+            map_size (tuple[int, int]): Width and height of the map in pixels.
+            radius (int): Number of hexes revealed around the player in every direction.
+            hex_pixels (int): Approximate width of a hex in mask pixels.
+            save_interval (float): Minimum number of seconds between saves.
+        """
+        self.path = path
+        self.map_size = map_size
+        self.radius = radius
+        self.hex_pixels = hex_pixels
+        self.save_interval = save_interval
+        self.explored: NDArray[np.bool_] = np.zeros((0, 0), dtype=bool)
+        self.layout = HexLayout(0, (0, 0), 0.0)
+        self.mask_layout: Optional[HexLayout] = None
+        self.mask: pygame.Surface = pygame.Surface((1, 1), pygame.SRCALPHA)
+        self.mask_scale: float = 1.0
+        self.generation: int = 0
+        self.scaled: Optional[pygame.Surface] = None
+        self.scaled_key: Optional[tuple[tuple[int, int, int, int], int, int]] = None
+        self.dirty: bool = False
+        self.saved_at: float = time.perf_counter()
+        self.reach = {parity: self.offsets_in_range(parity) for parity in (0, 1)}
+        if os.path.exists(self.path):
+            self.load()
+
+    def offsets_in_range(self, parity: int) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Offset coordinate steps to all hexes within the reveal radius of a hex on a row of the given parity.
+
+        Returns:
+            tuple[NDArray, NDArray]: The x and y steps.
+        """
+        center = np.array([0, parity])
+        steps = axial_to_offset(hex_range(offset_to_axial(center), self.radius)) - center
+        return steps[:, 0], steps[:, 1]
+
+    def configure(self, layout: HexLayout):
+        """Lay out the bitmap and mask for the map geometry. A bitmap built for another layout is carried over
+        through map pixel space, so explored areas stay where they were on the map.
+
+        Args:
+            layout (HexLayout): The hex grid placement on the map.
+        """
+        if layout == self.mask_layout:
+            return
+        if layout != self.layout:
+            self.explored = self.remap(layout)
+            self.layout = layout
+            self.dirty = True
+        self.mask_layout = layout
+        width, height = self.map_size
+        self.mask_scale = self.hex_pixels / layout.hex_size
+        self.mask = pygame.Surface(
+            (max(1, math.ceil(width * self.mask_scale)), max(1, math.ceil(height * self.mask_scale))), pygame.SRCALPHA
+        )
+        self.mask.fill((0, 0, 0, 255))
+        self.update_mask(self.mask.get_rect())
+        self.flush()
+
+    def remap(self, layout: HexLayout) -> NDArray[np.bool_]:
+        """Carry the explored flags over to another layout. Each hex takes the flag of the hex under its centre in
+        the current layout.
+
+        Args:
+            layout (HexLayout): The new hex grid placement on the map.
+
+        Returns:
+            NDArray: Explored flags of the new layout, indexed by grid row then column.
+        """
+        explored = np.zeros(layout.grid_shape(self.map_size), dtype=bool)
+        if self.layout.hex_size <= 0 or not self.explored.any():
+            return explored
+        rows, columns = explored.shape
+        ys, xs = np.divmod(np.arange(rows * columns), columns)
+        old = self.layout.pixel_to_offset(layout.offset_to_pixel(np.stack([xs, ys], axis=-1)))
+        ox, oy = old[:, 0], old[:, 1]
+        old_rows, old_columns = self.explored.shape
+        inside = np.flatnonzero((ox >= 0) & (ox < old_columns) & (oy >= 0) & (oy < old_rows))
+        explored.ravel()[inside] = self.explored[oy[inside], ox[inside]]
+        return explored
+
+    def reveal(self, grid_locations: NDArray[np.int32]) -> bool:
+        """Mark the hexes within the reveal radius of each grid location as explored.
+
+        Args:
+            grid_locations (NDArray): Grid locations, one (x, y) row per location.
+
+        Returns:
+            bool: True if any hex was newly explored, False otherwise.
+        """
+        rows, columns = self.explored.shape
+        x: list[NDArray[np.int64]] = []
+        y: list[NDArray[np.int64]] = []
+        for parity, (dx, dy) in self.reach.items():
+            centers = grid_locations[grid_locations[:, 1] % 2 == parity].astype(np.int64)
+            x.append((centers[:, :1] + dx).ravel())
+            y.append((centers[:, 1:] + dy).ravel())
+        xs, ys = np.concatenate(x), np.concatenate(y)
+        inside = (xs >= 0) & (xs < columns) & (ys >= 0) & (ys < rows)
+        xs, ys = xs[inside], ys[inside]
+        new = ~self.explored[ys, xs]
+        if not new.any():
+            return False
+        xs, ys = xs[new], ys[new]
+        self.explored[ys, xs] = True
+
+        # Only the mask around the newly explored hexes changes
+        hex_size, _, side_length = self.layout
+        centers = self.layout.offset_to_pixel(np.stack([xs, ys], axis=1))
+        low = (centers.min(axis=0) - (hex_size, 2 * side_length)) * self.mask_scale
+        high = (centers.max(axis=0) + (hex_size, 2 * side_length)) * self.mask_scale
+        area = pygame.Rect(int(low[0]), int(low[1]), int(high[0] - low[0]) + 1, int(high[1] - low[1]) + 1)
+        self.update_mask(area.clip(self.mask.get_rect()))
+        self.dirty = True
+        self.flush()
+        return True
+
+    def update_mask(self, area: pygame.Rect, band: int = 256):
+        """Recompute the mask alpha over an area, in bands of rows to bound memory use.
+
+        Args:
+            area (pygame.Rect): Area of the mask in mask pixels.
+            band (int): Number of mask rows computed at once.
+        """
+        rows, columns = self.explored.shape
+        alpha = pygame.surfarray.pixels_alpha(self.mask)
+        mask_x = (np.arange(area.left, area.right) + 0.5) / self.mask_scale
+        for top in range(area.top, area.bottom, band):
+            mask_y = (np.arange(top, min(top + band, area.bottom)) + 0.5) / self.mask_scale
+            pixels = np.stack(np.meshgrid(mask_x, mask_y, indexing="ij"), axis=-1)
+            grid = self.layout.pixel_to_offset(pixels)
+            gx, gy = grid[..., 0], grid[..., 1]
+            inside = (gx >= 0) & (gx < columns) & (gy >= 0) & (gy < rows)
+            explored = np.zeros(gx.shape, dtype=bool)
+            explored[inside] = self.explored[gy[inside], gx[inside]]
+            alpha[area.left : area.right, top : top + len(mask_y)] = np.where(explored, 0, 255)
+        del alpha
+        self.generation += 1
+
+    def blit(self, surface: pygame.Surface, zoom: int, area: pygame.Rect, destination: tuple[int, int]):
+        """Blit the fog over a region of the map with a single blit. The mask region is only rescaled when the
+        region, zoom level or mask changed since the last call.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+            zoom (int): Zoom level the region is drawn at.
+            area (pygame.Rect): Region of the map in zoom level pixel coordinates.
+            destination (tuple[int, int]): Position on the surface of the top-left corner of the region.
+        """
+        if not area.w or not area.h:
+            return
+        to_mask = 2**zoom * self.mask_scale
+        left, top = area.left * to_mask, area.top * to_mask
+        region = pygame.Rect(math.floor(left), math.floor(top), 0, 0)
+        region.w = math.ceil(area.right * to_mask) - region.x
+        region.h = math.ceil(area.bottom * to_mask) - region.y
+        region = region.clip(self.mask.get_rect())
+        if not region.w or not region.h:
+            return
+
+        # Scale whole mask pixels and crop the fraction of a mask pixel that lies outside the region
+        size = (max(1, round(region.w / to_mask)), max(1, round(region.h / to_mask)))
+        key = (tuple(region), zoom, self.generation)
+        if self.scaled is None or self.scaled.get_size() != size:
+            self.scaled = pygame.Surface(size, pygame.SRCALPHA)
+            self.scaled_key = None
+        if key != self.scaled_key:
+            pygame.transform.smoothscale(self.mask.subsurface(region), size, self.scaled)
+            self.scaled_key = key
+        crop = pygame.Rect(round((left - region.x) / to_mask), round((top - region.y) / to_mask), area.w, area.h)
+        surface.blit(self.scaled, destination, crop)
+
+    def load(self):
+        """Load the explored bitmap and its layout saved by `save`. An unreadable file is ignored, since the bitmap
+        is rebuilt from the movement history."""
+        try:
+            with np.load(self.path) as data:
+                shape = tuple(data["shape"])
+                explored = np.unpackbits(data["bits"], count=shape[0] * shape[1]).reshape(shape).astype(bool)
+                hex_size, x, y, side_length = data["layout"].tolist()
+        except (OSError, KeyError, ValueError):
+            return
+        self.explored = explored
+        self.layout = HexLayout(int(hex_size), (int(x), int(y)), side_length)
+
+    def flush(self, force: bool = False):
+        """Save the explored bitmap if it changed and the save interval has passed since the last save.
+
+        Args:
+            force (bool): Save any change regardless of the interval, e.g. at shutdown.
+        """
+        if self.dirty and (force or time.perf_counter() - self.saved_at >= self.save_interval):
+            self.save()
+
+    def save(self):
+        """Save the explored bitmap, packed to one bit per hex, with its layout. The file is replaced atomically."""
+        temp_path = self.path + ".tmp"
+        hex_size, (x, y), side_length = self.layout
+        with open(temp_path, "wb") as file:
+            np.savez(
+                file,
+                shape=np.array(self.explored.shape),
+                bits=np.packbits(self.explored),
+                layout=np.array([hex_size, x, y, side_length]),
+            )
+        os.replace(temp_path, self.path)
+        self.dirty = False
+        self.saved_at = time.perf_counter()
+
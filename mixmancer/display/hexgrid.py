@@ -0,0 +1,139 @@
+"""
+Vectorized hex grid geometry.
+
+Three coordinate systems are supported, all as integer NumPy arrays with the coordinates in the last axis:
+
+- offset (x, y): the staggered grid used by HexMap, where odd rows sit half a hex to the left of even rows.
+- axial (q, r): r is the row and q runs along it, skewed so that hex arithmetic is linear.
+- cube (q, r, s): axial with s = -q - r, which makes distances and rounding symmetric.
+
+Every function accepts any number of leading axes, so thousands of hexes are converted in one call.
+"""
+
+import math
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from typing import NamedTuple
+
+AXIAL_DIRECTIONS: NDArray[np.int64] = np.array([(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)])
+
+
+def offset_to_axial(offset: ArrayLike) -> NDArray[np.int64]:
+    """Convert offset coordinates to axial coordinates"""
+    offset = np.asarray(offset, dtype=np.int64)
+    x, y = offset[..., 0], offset[..., 1]
+    return np.stack([x - (y + (y & 1)) // 2, y], axis=-1)
+
+
+def axial_to_offset(axial: ArrayLike) -> NDArray[np.int64]:
+    """Convert axial coordinates to offset coordinates"""
+    axial = np.asarray(axial, dtype=np.int64)
+    q, r = axial[..., 0], axial[..., 1]
+    return np.stack([q + (r + (r & 1)) // 2, r], axis=-1)
+
+
+def axial_to_cube(axial: ArrayLike) -> NDArray[np.int64]:
+    """Convert axial coordinates to cube coordinates"""
+    axial = np.asarray(axial, dtype=np.int64)
+    return np.concatenate([axial, -axial.sum(axis=-1, keepdims=True)], axis=-1)
+
+
+def cube_to_axial(cube: ArrayLike) -> NDArray[np.int64]:
+    """Convert cube coordinates to axial coordinates"""
+    return np.asarray(cube, dtype=np.int64)[..., :2]
+
+
+def axial_round(axial: ArrayLike) -> NDArray[np.int64]:
+    """Round fractional axial coordinates to the axial coordinates of the hex containing them"""
+    axial = np.asarray(axial, dtype=np.float64)
+    q, r = axial[..., 0], axial[..., 1]
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = abs(rq - q), abs(rr - r), abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return np.stack([rq, rr], axis=-1).astype(np.int64)
+
+
+def neighbours(axial: ArrayLike) -> NDArray[np.int64]:
+    """Axial coordinates of the six neighbours of each hex, with shape (..., 6, 2)"""
+    return np.asarray(axial, dtype=np.int64)[..., None, :] + AXIAL_DIRECTIONS
+
+
+def distance(a: ArrayLike, b: ArrayLike) -> NDArray[np.int64]:
+    """Number of steps between hexes in axial coordinates"""
+    d = np.asarray(a, dtype=np.int64) - np.asarray(b, dtype=np.int64)
+    return np.maximum(np.maximum(abs(d[..., 0]), abs(d[..., 1])), abs(d[..., 0] + d[..., 1]))
+
+
+def hex_range(center: ArrayLike, radius: int) -> NDArray[np.int64]:
+    """Axial coordinates of all hexes within a radius of a hex, with shape (hexes, 2)"""
+    dq, dr = np.mgrid[-radius : radius + 1, -radius : radius + 1]
+    within = abs(dq + dr) <= radius
+    return np.stack([dq[within], dr[within]], axis=-1) + np.asarray(center, dtype=np.int64)
+
+
+def ring(center: ArrayLike, radius: int) -> NDArray[np.int64]:
+    """Axial coordinates of the hexes exactly a radius away from a hex, with shape (hexes, 2)"""
+    center = np.asarray(center, dtype=np.int64)
+    if radius == 0:
+        return center[None, :]
+    # Walk each of the six sides, starting from the corner reached by going `radius` steps in the direction before
+    steps = np.arange(radius)[:, None, None]
+    corners = center + AXIAL_DIRECTIONS[[4, 5, 0, 1, 2, 3]] * radius
+    return (corners + steps * AXIAL_DIRECTIONS).transpose(1, 0, 2).reshape(-1, 2)
+
+
+class HexLayout(NamedTuple):
+    """Placement of a hex grid on the map, converting between hex coordinates and map pixels.
+
+    Hexes are pointy-topped, so rows are 1.5 side lengths apart.
+
+    Attributes:
+        hex_size (int): The width of each hexagon in pixels.
+        origin (tuple[int, int]): Map pixel centre of the hex at offset (0, 0).
+        side_length (float): The length of each side of a hexagon.
+    """
+
+    hex_size: int
+    origin: tuple[int, int]
+    side_length: float
+
+    def grid_shape(self, map_size: tuple[int, int]) -> tuple[int, int]:
+        """Number of rows and columns of offset coordinates needed to cover a map, with spare hexes along the far edges"""
+        rows = math.ceil((map_size[1] - self.origin[1]) / (1.5 * self.side_length)) + 2
+        columns = math.ceil((map_size[0] - self.origin[0]) / self.hex_size) + 2
+        return max(rows, 1), max(columns, 1)
+
+    def axial_to_pixel(self, axial: ArrayLike) -> NDArray[np.float64]:
+        """Map pixel centres of hexes in axial coordinates"""
+        axial = np.asarray(axial, dtype=np.float64)
+        q, r = axial[..., 0], axial[..., 1]
+        return np.stack(
+            [self.origin[0] + self.hex_size * (q + r / 2), self.origin[1] + 1.5 * self.side_length * r], axis=-1
+        )
+
+    def offset_to_pixel(self, offset: ArrayLike) -> NDArray[np.float64]:
+        """Map pixel centres of hexes in offset coordinates"""
+        return self.axial_to_pixel(offset_to_axial(offset))
+
+    def cube_to_pixel(self, cube: ArrayLike) -> NDArray[np.float64]:
+        """Map pixel centres of hexes in cube coordinates"""
+        return self.axial_to_pixel(cube_to_axial(cube))
+
+    def pixel_to_axial(self, pixels: ArrayLike) -> NDArray[np.int64]:
+        """Axial coordinates of the hexes containing map pixels"""
+        pixels = np.asarray(pixels, dtype=np.float64)
+        r = (pixels[..., 1] - self.origin[1]) / (1.5 * self.side_length)
+        q = (pixels[..., 0] - self.origin[0]) / self.hex_size - r / 2
+        return axial_round(np.stack([q, r], axis=-1))
+
+    def pixel_to_offset(self, pixels: ArrayLike) -> NDArray[np.int64]:
+        """Offset coordinates of the hexes containing map pixels"""
+        return axial_to_offset(self.pixel_to_axial(pixels))
+
+    def pixel_to_cube(self, pixels: ArrayLike) -> NDArray[np.int64]:
+        """Cube coordinates of the hexes containing map pixels"""
+        return axial_to_cube(self.pixel_to_axial(pixels))
@@ -1,29 +1,52 @@
 import pygame
+import logging
 import math
-from PIL import Image
-from numpy import arange, linspace, float_
+import os
+from typing import Optional
+import numpy as np
 from numpy.typing import NDArray
 from mixmancer.config.data_models import Coordinate
-
-from scipy import interpolate  # type: ignore[reportMissingTypeStubs]
-
+from mixmancer.display.tiles import open_pyramid
+from mixmancer.display.history import MovementHistory
+from mixmancer.display.trail import TrailRenderer
+from mixmancer.display.fog import FogOfWar
+from mixmancer.display.hexgrid import HexLayout
+from mixmancer.display.pathfinding import Pathfinder
+from mixmancer.display.terrain import TerrainIndex, open_terrain_index
+from mixmancer.display.camera import Camera
+from mixmancer.config.parameters import TERRAIN_COSTS, TRAVEL_COST_LIMIT
+
+logger = logging.getLogger(__name__)
 
 class HexMap:
     """Hexmap object. Displays a hexagonal map and allows for movement and exploration.
 
     Attributes:
-        image (pygame.Surface): The image representing the map.
+        tiles (TilePyramid): The map image cut into tiles at several zoom levels, loaded lazily.
+        zoom (int): The current zoom level. 0 shows the map at full resolution, each level above halves it.
         resolution (Coordinate): The resolution of the map.
         hex_size (int): The size of each hexagon in pixels.
         offset (Coordinate): The offset of the map.
         location_grid (Coordinate): The current location on the grid.
         location_pixel (Coordinate): The current location in pixels.
+        camera (Camera): Centre of the view, panning smoothly to location_pixel after a move.
         side_length (float): The length of each side of a hexagon.
+        layout (HexLayout): Hex size, offset and side length for converting arrays of hexes at once.
         fog_flag (bool): Flag indicating whether fog is enabled.
         history_flag (bool): Flag indicating whether history is being shown.
         yellow (tuple[int, int, int]): RGB tuple representing the color yellow.
         stagger (bool): Flag indicating whether staggered hex layout is used.
-        history_file (str): path to text log of past player movement
+        history_file (str): path to the journal of past player movement
+        history (MovementHistory): past player movement held in memory, oldest first
+        trail (TrailRenderer): Cached curve drawn through the movement history.
+        fog (FogOfWar): Explored hexes and the fog mask covering the rest, saved next to the history file.
+        image_path (str): The file path of the map image.
+        terrain_file (str): Path of the cached terrain index of the map.
+        terrain (TerrainIndex): Terrain type of every hex, classified from the map image.
+        cost_file (str): Path of the edited movement cost layer, saved with the hex layout it was edited for. Costs
+            follow the terrain when the file is missing or was saved for another layout.
+        pathfinder (Pathfinder): Routes across the grid weighted by the movement cost layer.
+        viewport (pygame.Surface): Reused output surface the visible part of the map is rendered into.
     """
 
     def __init__(
@@ -33,6 +56,8 @@ class HexMap:
         hex_size: int,
         offset: Coordinate,
         start_coordinates: Coordinate,
+        tile_dir: Optional[str] = None,
+        history_file: str = "./assets/map/history.txt",
     ):
         """
         Initialize the HexMap object.
@@ -43,31 +68,113 @@ class HexMap:
             hex_size (int): The size of each hexagon in pixels.
             offset (Coordinate): The offset of the map (x, y).
             start_coordinates (Coordinate): The starting coordinates on the grid (row, column).
+            tile_dir (Optional[str]): Directory of the map tile pyramid. Defaults to `<image name>_tiles` next to
+                the image. The pyramid is built from the image on first use and whenever the image changes.
+            history_file (str): The file path of the movement history journal.
         """
-        self.image = pygame.image.load(image_path)
+        self.image_path = image_path
+        self.tiles = open_pyramid(image_path, tile_dir or os.path.splitext(image_path)[0] + "_tiles")
+        self.zoom: int = 0
         self.resolution = resolution
+        self.viewport = pygame.Surface(self.resolution())
         self.location_pixel: Coordinate
+        self.camera = Camera()
         self.stagger: bool
         self.fog_flag = False
         self.history_flag = False
         self.yellow = (255, 215, 0)
-        self.history_file: str = "./assets/map/history.txt"
-        data = self.read_history(self.history_file)
-        if data:
-            start_coordinates = data[-1]
+        self.history_file = history_file
+        self.history = MovementHistory(self.history_file)
+        self.trail = TrailRenderer()
+        self.fog = FogOfWar(os.path.splitext(self.history_file)[0] + "_fog.npz", self.tiles.size)
+        self.terrain_file = os.path.splitext(image_path)[0] + "_terrain.npz"
+        self.terrain: TerrainIndex
+        self.cost_file = os.path.splitext(image_path)[0] + "_costs.npz"
+        self.pathfinder = Pathfinder(np.ones((1, 1)))
+        self.layout = HexLayout(0, (0, 0), 0.0)
+        if len(self.history):
+            start_coordinates = Coordinate(*self.history.last())
+        else:
+            self.history.append(*start_coordinates())
         self.update_parameters(hex_size, offset, start_coordinates)
+        self.fog.reveal(self.history_array())
 
     def update_parameters(self, hex_size: int, offset: Coordinate, location_grid: Coordinate):
         self.hex_size = hex_size
         self.offset = offset
         self.location_grid = location_grid
         self.side_length: float = 2 * ((self.hex_size / 2) / math.tan(math.pi / 3))
+        layout = HexLayout(self.hex_size, self.offset(), self.side_length)
+        if layout != self.layout:
+            self.layout = layout
+            self.fog.configure(self.layout)
+            self.terrain = open_terrain_index(self.image_path, self.terrain_file, self.layout)
+            self.pathfinder.set_costs(self.load_costs())
         self.update()
+        self.camera.jump(self.location_pixel())
+
+    def layout_key(self) -> NDArray[np.float64]:
+        """The hex layout as an array, stored with files that are only valid for that layout"""
+        hex_size, (x, y), side_length = self.layout
+        return np.array([hex_size, x, y, side_length])
+
+    def load_costs(self) -> NDArray[np.float64]:
+        """Load the movement cost layer for the current grid. A saved layer that is unreadable, was saved for
+        another layout or does not match the grid, e.g. after the map image was replaced, is ignored and the costs
+        follow the terrain."""
+        if os.path.exists(self.cost_file):
+            shape = self.layout.grid_shape(self.tiles.size)
+            try:
+                with np.load(self.cost_file) as data:
+                    if np.array_equal(data["layout"], self.layout_key()):
+                        costs = data["costs"]
+                        if costs.shape == shape:
+                            return costs
+                        logger.warning(
+                            "Ignoring movement costs in '%s': expected shape %s, got %s",
+                            self.cost_file,
+                            shape,
+                            costs.shape,
+                        )
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning("Ignoring movement costs in '%s': %s", self.cost_file, e)
+        return self.terrain.costs(TERRAIN_COSTS)
+
+    def save_costs(self):
+        """Save the movement cost layer with the layout it belongs to. The file is replaced atomically."""
+        temp_path = self.cost_file + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, layout=self.layout_key(), costs=self.pathfinder.costs)
+        os.replace(temp_path, self.cost_file)
+
+    def toggle_blocked(self, target: Coordinate) -> bool:
+        """Make a hex impassable, or passable again at the cost of its terrain. Only the cached routes that
+        reached the hex are dropped.
+
+        Args:
+            target (Coordinate): The grid location of the hex.
+
+        Returns:
+            bool: True if the cost changed, False if the hex is off the map.
+        """
+        terrain = self.terrain.at(*target())
+        if terrain is None:
+            return False
+        x, y = target()
+        cost = TERRAIN_COSTS.get(terrain, 1.0) if np.isinf(self.pathfinder.costs[y, x]) else np.inf
+        self.pathfinder.set_cost(x, y, cost)
+        self.save_costs()
+        return True
+
+    def terrain_at_location(self) -> Optional[str]:
+        """Get the terrain type under the player, or None if the player is off the map"""
+        return self.terrain.at(*self.location_grid())
 
     def update(self):
         """Update pixel location and stagger bool according to the player location on the map."""
         self.stagger = self.check_stagger(self.location_grid)
         self.location_pixel = self.grid_to_pixel(self.location_grid)
+        self.camera.pan_to(self.location_pixel())
 
     def check_stagger(self, grid_location: Coordinate) -> bool:
         """Check if current location is on a staggered hex row or not.
@@ -81,14 +188,22 @@ class HexMap:
         return grid_location.y % 2 == 0  # True = 1-3-3, False = 3-3-1
 
     def frame(self) -> tuple[int, ...]:
-        """Calculate the center of the screen from the pixel location of the player"""
-        center = self.resolution - self.location_pixel
-        return center.half()
+        """Calculate the screen position of the map origin that centers the camera at the current zoom level"""
+        scale = 2**self.zoom
+        camera_x, camera_y = self.camera.pixel()
+        return (
+            (self.resolution.x * scale - camera_x) // (2 * scale),
+            (self.resolution.y * scale - camera_y) // (2 * scale),
+        )
+
+    def close(self):
+        """Save any unsaved map state"""
+        self.fog.flush(force=True)
 
     def reset_history(self):
-        """Reset player movement text log file"""
-        with open(self.history_file, "w") as file:
-            file.truncate(0)
+        """Reset player movement history, keeping the current location as its start"""
+        self.history.reset()
+        self.history.append(*self.location_grid())
 
     def grid_to_pixel(self, grid_location: Coordinate) -> Coordinate:
         """Convert grid coordinates to pixel coordinates.
@@ -107,18 +222,42 @@ class HexMap:
         )
         return Coordinate(x, y)
 
+    def grid_to_pixel_array(self, grid_locations: NDArray[np.int32]) -> NDArray[np.float64]:
+        """Convert an array of grid coordinates to pixel coordinates in one pass. Matches grid_to_pixel.
+
+        Args:
+            grid_locations (NDArray): Grid locations, one (x, y) row per location.
+
+        Returns:
+            NDArray: The pixel coordinates, one (x, y) row per location.
+        """
+        return 2 * np.trunc(self.layout.offset_to_pixel(grid_locations))
+
+    def history_array(self) -> NDArray[np.int32]:
+        """View the movement history as an array with one (x, y) row per grid location, without copying"""
+        return np.frombuffer(self.history.coordinates, dtype=np.int32).reshape(-1, 2)
+
+    def draw_history(self, surface: pygame.Surface):
+        """Draw the movement history as a curve. Only the segments changed since the last call are refitted."""
+        self.trail.sync(self.history_array(), self.grid_to_pixel_array, self.layout)
+        scale = 1 / 2 ** (self.zoom + 1)
+        camera_x, camera_y = self.camera.pixel()
+        origin = (self.resolution.x / 2 - camera_x * scale, self.resolution.y / 2 - camera_y * scale)
+        self.trail.draw(surface, self.yellow, scale, origin)
+
     def hex_points(self):
         """Calculate the points of a hexagon to indicate the players location."""
-        x, y = self.resolution.divide(2)()
+        x, y = self.normalize_pixel_location(self.location_pixel)()
+        hex_size, side_length = self.hex_size / 2**self.zoom, self.side_length / 2**self.zoom
         pad = 1
         return [
-            (x - self.hex_size / 2 - pad, y - self.side_length / 2 - pad),
-            (x, y - self.side_length - pad),
-            (x + self.hex_size / 2 + pad, y - self.side_length / 2 - pad),
-            (x + self.hex_size / 2 + pad, y + self.side_length / 2 - pad),
-            (x, y + self.side_length),
-            (x - self.hex_size / 2 - pad, y + self.side_length / 2 - pad),
-            (x - self.hex_size / 2 - pad, y - self.side_length / 2 - pad),
+            (x - hex_size / 2 - pad, y - side_length / 2 - pad),
+            (x, y - side_length - pad),
+            (x + hex_size / 2 + pad, y - side_length / 2 - pad),
+            (x + hex_size / 2 + pad, y + side_length / 2 - pad),
+            (x, y + side_length),
+            (x - hex_size / 2 - pad, y + side_length / 2 - pad),
+            (x - hex_size / 2 - pad, y - side_length / 2 - pad),
         ]
 
     def check_on_screen(self, pixel_coordinates: Coordinate) -> bool:
@@ -130,11 +269,11 @@ class HexMap:
         Returns:
             bool: True if on screen, False otherwise.
         """
-        screen = pygame.Rect(*(self.location_pixel - self.resolution.divide(2))(), *self.resolution())
+        screen = pygame.Rect(*(Coordinate(*self.camera.pixel()) - self.resolution.divide(2))(), *self.resolution())
         return pygame.Rect(pixel_coordinates()).colliderect(screen)
 
     def normalize_pixel_location(self, pixel_coordinates: Coordinate) -> Coordinate:
-        """Normalize pixel coordinates given a screen frame centered on the player's frame of reference.
+        """Normalize pixel coordinates given a screen frame centered on the camera, at the current zoom level.
 
         Args:
             pixel_coordinates (Coordinate): The pixel coordinates (x, y).
@@ -142,37 +281,19 @@ class HexMap:
         Returns:
             Coordinate: The normalized pixel coordinates (x, y).
         """
-        return (pixel_coordinates - self.location_pixel + self.resolution).divide(2)
-
-    def read_history(self, file_location: str) -> list[Coordinate]:
-        """Read historical grid coordinates from file.
-
-        Returns:
-            list[Coordinate]: List of historical grid coordinates.
-        """
-        with open(file_location, "r") as file:
-            data: list[Coordinate] = []
-            for line in file:
-                try:
-                    x, y = map(int, line.strip().split(","))
-                    data.append(Coordinate(x, y))
-                except ValueError as e:
-                    raise ValueError(f"Error converting line '{line.strip()}' to int: {e}")
-        return data
+        scale = 2**self.zoom
+        screen = Coordinate(self.resolution.x * scale, self.resolution.y * scale)
+        return (pixel_coordinates - Coordinate(*self.camera.pixel()) + screen).divide(2 * scale)
 
     def undo_movement(self):
-        """Undo the last movement."""
-        data = self.read_history(self.history_file)
-        data = data[:-1]
-        self.location_grid = data[len(data) - 1]
-        with open(self.history_file, "w") as f:
-            f.writelines(",".join(map(str, x())) + "\n" for x in data)
-        self.update()
+        """Undo the last movement. Does nothing when the player is back at the start of the history."""
+        if self.history.undo():
+            self.location_grid = Coordinate(*self.history.last())
+            self.update()
 
     def log_movement(self):
-        """Log the last movement in the history file."""
-        with open(self.history_file, "a") as f:
-            f.write(f"{','.join([str(x) for x in self.location_grid()])}\n")
+        """Log the last movement in the movement history."""
+        self.history.append(*self.location_grid())
 
     def get_direction_mapping(self):
         """Translate direction into grid point coordinates with respect to the staggered grid layout."""
@@ -192,9 +313,17 @@ class HexMap:
         self.update()
 
     def toggle_fog_flag(self):
-        """Toggle the fog flag. This allows the user to enable or disable fog to obscure unexplored areas of the map. - UNFINISHED"""
+        """Toggle the fog flag. This allows the user to enable or disable fog to obscure unexplored areas of the map."""
         self.fog_flag = not self.fog_flag
 
+    def zoom_in(self):
+        """Zoom in one level, up to the full resolution of the map."""
+        self.zoom = max(0, self.zoom - 1)
+
+    def zoom_out(self):
+        """Zoom out one level, down to the smallest level of the tile pyramid."""
+        self.zoom = min(self.tiles.levels - 1, self.zoom + 1)
+
     def move(self, direction: Coordinate):
         """Move the player across the map in a specified direction.
 
@@ -203,6 +332,27 @@ class HexMap:
         """
         self.location_grid += direction
         self.log_movement()
+        self.fog.reveal(np.array([self.location_grid()]))
+
+    def travel_to(self, target: Coordinate) -> bool:
+        """Travel along the cheapest route to a hex, recording every hex of the route in the history at once.
+
+        Args:
+            target (Coordinate): The grid location to travel to.
+
+        Returns:
+            bool: True if the player moved, False if the target is unreachable within TRAVEL_COST_LIMIT or already
+                the current location.
+        """
+        route = self.pathfinder.path(self.location_grid(), target(), TRAVEL_COST_LIMIT)
+        if route is None or len(route) < 2:
+            return False
+        steps = route[1:]
+        self.history.extend(steps)
+        self.fog.reveal(np.array(steps))
+        self.location_grid = Coordinate(*steps[-1])
+        self.update()
+        return True
 
     def command(self, command: str):
         """Execute a command. This routes all possible inputs from the tkinter widgets to the HexMap object.
@@ -215,6 +365,8 @@ class HexMap:
             "undo": self.undo_movement,
             "history": self.toggle_history_flag,
             "fog": self.toggle_fog_flag,
+            "zoom_in": self.zoom_in,
+            "zoom_out": self.zoom_out,
             **self.get_direction_mapping(),
         }
 
@@ -223,40 +375,54 @@ class HexMap:
             action()
             self.update()
 
+    def render_viewport(self) -> pygame.Surface:
+        """Render the visible part of the map into the reused viewport surface.
+
+        Only the tiles under the rectangle of the map that lands on screen are loaded and copied, so the cost
+        depends on the screen size rather than the map size.
+
+        Returns:
+            pygame.Surface: The viewport surface. Its content is replaced on the next render.
+        """
+        if self.viewport.get_size() != self.resolution():
+            self.viewport = pygame.Surface(self.resolution())
+        x, y = self.frame()
+        visible = self.visible_rect()
+        if visible != self.viewport.get_rect():
+            self.viewport.fill((0, 0, 0))
+        if visible.w and visible.h:
+            self.tiles.blit_region(self.viewport, self.zoom, visible.move(-x, -y), visible.topleft)
+        return self.viewport
+
+    def visible_rect(self) -> pygame.Rect:
+        """Get the part of the screen covered by the map at the current location and zoom level"""
+        x, y = self.frame()
+        return pygame.Rect(x, y, *self.tiles.level_size(self.zoom)).clip(pygame.Rect(0, 0, *self.resolution()))
+
     def get_current_surface(self) -> pygame.Surface:
         """Get the current playing surface of the hexmap
 
         Returns:
-            pygame.Surface: The current cropped map centered on player location
+            pygame.Surface: The current cropped map centered on player location. The surface is reused by the
+                next call, so copy it to keep its content.
         """
-        surface = pygame.Surface((self.resolution.x, self.resolution.y))
-        surface.fill((0, 0, 0))
-        surface.blit(self.image, self.frame())
+        surface = self.render_viewport()
 
         # Draw current location
         pygame.draw.polygon(surface, color=self.yellow, points=self.hex_points(), width=3)
 
         # Draw history
         if self.history_flag:
-            data = self.read_history(self.history_file)
-            normalized_points = [self.normalize_pixel_location(self.grid_to_pixel(pt)).float() for pt in data]
-            x = [pt[0] for pt in normalized_points]
-            y = [pt[1] for pt in normalized_points]
-            draw_spline_curve(surface, self.yellow, x, y)
+            self.draw_history(surface)
 
         # Draw fog
         if self.fog_flag:
-            pass
+            x, y = self.frame()
+            visible = self.visible_rect()
+            self.fog.blit(surface, self.zoom, visible.move(-x, -y), visible.topleft)
 
         return surface
 
-    def get_current_surface_PIL(self) -> Image.Image:
-        """Convert pygame surface to PIL image object"""
-        surface = self.get_current_surface()
-        image_data = pygame.image.tostring(surface, "RGBA")
-        image_pil = Image.frombytes("RGBA", surface.get_size(), image_data)  # type: ignore[reportUnknownMemberType]
-        return image_pil
-
     def dump(self) -> str:
         """Dump an image of the current frame of the map image."""
         temp_file = "./assets/map/tmp.png"
@@ -264,26 +430,3 @@ class HexMap:
         pygame.image.save(surface, temp_file)
         return temp_file
 
-
-def interpolate_curve(
-    x: list[float], y: list[float], num_points: int = 1000
-) -> tuple[NDArray[float_], NDArray[float_]]:
-    spline_x = interpolate.UnivariateSpline(arange(len(x)), x, s=0)
-    spline_y = interpolate.UnivariateSpline(arange(len(y)), y, s=0)
-    u = linspace(0, len(x) - 1, num_points)
-    xi = spline_x(u)  # type: ignore
-    yi = spline_y(u)  # type: ignore
-    return xi, yi  # type: ignore
-
-
-def draw_spline_curve(
-    surface: pygame.Surface,
-    color: tuple[int, int, int],
-    x: list[float],
-    y: list[float],
-    num_points: int = 1000,
-    width: int = 2,
-) -> None:
-    xi, yi = interpolate_curve(x, y, num_points)
-    points = list(zip(xi, yi))
-    pygame.draw.lines(surface, color, False, points, width)
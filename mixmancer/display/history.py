@@ -0,0 +1,131 @@
+import os
+from array import array
+from typing import Iterator
+
+
+class MovementHistory:
+    """Player movement history held in memory and persisted through an append-only journal.
+
+    Grid locations are stored as interleaved x/y values in a compact integer array, so appending and undoing a
+    movement are O(1). Every change is appended to the journal file as a single line: `x,y` for a movement and
+    `undo` for an undo. Journals holding only `x,y` lines are plain history files, so existing history files load
+    unchanged. Once enough undo records pile up, the journal is compacted into a plain history file through an
+    atomic replace.
+
+    Attributes:
+        path (str): The file path of the journal.
+        coordinates (array): Interleaved x/y grid locations, oldest first.
+        undo_records (int): Number of undo records in the journal since it was last compacted.
+        compact_threshold (int): Number of undo records that triggers a compaction.
+    """
+
+    def __init__(self, path: str, compact_threshold: int = 256):
+        """
+        Loads the movement history from its journal, creating an empty journal if needed.
+
+        Args:
+            path (str): The file path of the journal.
+            compact_threshold (int): Number of undo records that triggers a compaction.
+        """
+        self.path = path
+        self.coordinates: array[int] = array("i")
+        self.undo_records: int = 0
+        self.compact_threshold = compact_threshold
+        if os.path.exists(self.path):
+            self.load()
+        else:
+            self.compact()
+
+    def __len__(self) -> int:
+        return len(self.coordinates) // 2
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        c = self.coordinates
+        return ((c[i], c[i + 1]) for i in range(0, len(c), 2))
+
+    def load(self):
+        """Replay the journal into memory. A malformed final line, left by a write cut short, is dropped."""
+        with open(self.path, "r") as file:
+            text = file.read()
+        lines = [line.strip() for line in text.split("\n")]
+        torn = bool(text) and not text.endswith("\n")
+        for i, line in enumerate(lines):
+            if not line:
+                continue
+            try:
+                self.replay(line)
+            except ValueError as e:
+                if i < len(lines) - 1:
+                    raise ValueError(f"Error converting line '{line}' to int: {e}")
+                torn = True
+        if torn or self.undo_records >= self.compact_threshold:
+            self.compact()
+
+    def replay(self, record: str):
+        """Apply a single journal record to the in-memory history"""
+        if record == "undo":
+            self.pop()
+            self.undo_records += 1
+        else:
+            x, y = map(int, record.split(","))
+            self.coordinates.extend((x, y))
+
+    def last(self) -> tuple[int, int]:
+        """Get the most recent grid location"""
+        return self.coordinates[-2], self.coordinates[-1]
+
+    def append(self, x: int, y: int):
+        """Record a movement to a grid location"""
+        self.coordinates.extend((x, y))
+        self.write(f"{x},{y}\n")
+
+    def extend(self, locations: list[tuple[int, int]]):
+        """Record several movements at once, with a single write to the journal"""
+        for x, y in locations:
+            self.coordinates.extend((x, y))
+        self.write("".join(f"{x},{y}\n" for x, y in locations))
+
+    def pop(self):
+        """Remove the most recent grid location from memory"""
+        del self.coordinates[-2:]
+
+    def undo(self) -> bool:
+        """Undo the most recent movement. The first location is kept, so the player always has a location.
+
+        Returns:
+            bool: True if a movement was undone, False if there was nothing to undo.
+        """
+        if len(self) < 2:
+            return False
+        self.pop()
+        self.undo_records += 1
+        if self.undo_records >= self.compact_threshold:
+            self.compact()
+        else:
+            self.write("undo\n")
+        return True
+
+    def reset(self):
+        """Clear the movement history"""
+        del self.coordinates[:]
+        self.compact()
+
+    def write(self, record: str):
+        """Append a record to the journal and flush it to disk"""
+        with open(self.path, "a") as file:
+            file.write(record)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def compact(self):
+        """Rewrite the journal as a plain history file. The new file replaces the old one atomically, so a crash
+        leaves either the old journal or the new one."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            file.writelines(f"{x},{y}\n" for x, y in self)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self.undo_records = 0
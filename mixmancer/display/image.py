@@ -1,11 +1,21 @@
 import pygame
-from PIL import Image
 import os
-from typing import Any
-from mixmancer.display.dice import generate_dice, Dice
+from typing import Any, Hashable, Optional
+from mixmancer.display.dice import DICE_SIZE, generate_dice, Dice
 from mixmancer.display.effects import TextSprite  # , ResultWisp
+from mixmancer.display.cache import SurfaceCache
+from mixmancer.display.spatial import SpatialHash
+from mixmancer.display.loader import DecodedImage
 from mixmancer.config.data_models import DataModel, Coordinate
-from mixmancer.config.parameters import FRAME_RATE
+from mixmancer.config.parameters import FRAME_RATE, IMAGE_CACHE_BUDGET
+from mixmancer.profiler import profiler
+
+
+def display_format(surface: pygame.Surface) -> pygame.Surface:
+    """Convert a surface to the display pixel format, keeping per-pixel alpha if the surface has it"""
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
 
 
 class ImageProjector:
@@ -16,27 +26,46 @@ class ImageProjector:
         display (int): An integer representing the display number.
         screen (pygame.Surface): A Pygame Surface object representing the screen.
         status (bool): A boolean indicating the status of the projector.
-        image (pygame.Surface): A Pygame Surface object representing the loaded image.
+        source_image (pygame.Surface): A Pygame Surface object representing the loaded image at its original size.
+        source_key (Hashable): Key identifying the loaded image by its file path, or None if it is not cached.
+        image (pygame.Surface): A Pygame Surface object representing the loaded image fit to the screen.
+        image_position (tuple): Top-left position of the fitted image on the screen.
+        image_cache (SurfaceCache): Cache of fitted images keyed by (source key, resolution).
+        background (pygame.Surface): The fitted image composed onto a black screen-sized surface.
+        redraw (bool): Flag indicating whether the whole screen must be redrawn on the next update.
+        generation (int): Counter bumped whenever the projected image changes.
+        overlay_rect (Optional[pygame.Rect]): Area of the screen covered by the profiler overlay, if drawn.
+        collision_grid (SpatialHash[Dice]): Broadphase grid the dice are filed in for collision checks.
     """
 
-    def __init__(self, resolution: Coordinate, display: int):
+    def __init__(self, resolution: Coordinate, display: int, image_cache_budget: int = IMAGE_CACHE_BUDGET):
         """
         Initializes the ImageProjector object with the given resolution and display.
 
         Args:
             resolution (tuple): A tuple representing the resolution of the display.
             display (int): An integer representing the display number.
+            image_cache_budget (int): Maximum number of bytes held by the fitted image cache.
         """
         self.resolution = resolution
         self.display = display
         self.screen = pygame.display.set_mode(self.resolution(), flags=pygame.NOFRAME, display=self.display)
         self.status: bool = False
-        self.image: pygame.Surface = pygame.Surface(self.resolution())
+        self.source_image: pygame.Surface = pygame.Surface(self.resolution())
+        self.source_key: Hashable = None
+        self.image: pygame.Surface = self.source_image
+        self.image_position: tuple[float, float] = (0, 0)
+        self.image_cache = SurfaceCache(image_cache_budget)
+        self.background: pygame.Surface = pygame.Surface(self.resolution())
+        self.redraw: bool = True
+        self.generation: int = 0
+        self.overlay_rect: Optional[pygame.Rect] = None
         self.current_image: str = ""
-        self.dice_group: pygame.sprite.Group[Any] = pygame.sprite.Group()
-        self.wisp_group: pygame.sprite.Group[Any] = pygame.sprite.Group()
-        self.text_group: pygame.sprite.Group[Any] = pygame.sprite.Group()
+        self.dice_group: pygame.sprite.RenderUpdates[Any] = pygame.sprite.RenderUpdates()
+        self.wisp_group: pygame.sprite.RenderUpdates[Any] = pygame.sprite.RenderUpdates()
+        self.text_group: pygame.sprite.RenderUpdates[Any] = pygame.sprite.RenderUpdates()
         self.sprite_groups = [self.dice_group, self.wisp_group, self.text_group]
+        self.collision_grid: SpatialHash[Dice] = SpatialHash(max(DICE_SIZE))
         self.dice_timer: int = 0
         self.dice_result: int = 0
         self.dice_expiration: int = 10 * FRAME_RATE
@@ -91,22 +120,52 @@ class ImageProjector:
                 for group in self.sprite_groups:
                     group.update()
 
-    def draw_dice(self):
+    def is_animating(self) -> bool:
+        """Check if dice are animating or the screen still needs to be redrawn"""
+        return self.dice_timer != 0 or self.redraw
+
+    def draw_dice(self) -> list[pygame.Rect]:
+        """
+        Restores the background under the previous sprite positions and draws all sprite groups.
+
+        Returns:
+            list[pygame.Rect]: The areas of the screen that changed.
+        """
+        for group in self.sprite_groups:
+            group.clear(self.screen, self.background)
+        dirty_rects = self.clear_overlay()
         for group in self.sprite_groups:
-            group.draw(self.screen)
+            dirty_rects.extend(group.draw(self.screen))
+        dirty_rects.extend(self.draw_overlay())
+        return dirty_rects
+
+    def clear_overlay(self) -> list[pygame.Rect]:
+        """Restores the background under the profiler overlay, if drawn"""
+        if self.overlay_rect is None:
+            return []
+        rect = self.overlay_rect
+        self.screen.blit(self.background, rect, rect)
+        self.overlay_rect = None
+        return [rect]
+
+    def draw_overlay(self) -> list[pygame.Rect]:
+        """Draws the profiler stage table over the top-left corner of the screen when enabled"""
+        if not profiler.overlay:
+            return []
+        self.overlay_rect = self.screen.blit(profiler.render(), (10, 10))
+        return [self.overlay_rect]
 
     def check_collisions(self):
-        collisions = pygame.sprite.groupcollide(self.dice_group, self.dice_group, False, False)
-        collision_tracking: list[Any] = []
-        for dice1, dice2_list in collisions.items():
-            collision_tracking.append(dice1)
-            self.spawn_wisp(dice1)
-            for dice2 in dice2_list:
-                if dice2 not in collision_tracking:
-                    if abs(dice1.rect.centerx - dice2.rect.centerx) > abs(dice1.rect.centery - dice2.rect.centery):
-                        dice1.velocity.x, dice2.velocity.x = -dice1.velocity.x, -dice2.velocity.x
-                    else:
-                        dice1.velocity.y, dice2.velocity.y = -dice1.velocity.y, -dice2.velocity.y
+        """Bounces colliding dice off each other. Dice are filed in a spatial hash each step, so only dice sharing a
+        grid cell are tested and each colliding pair bounces once."""
+        self.collision_grid.rebuild(self.dice_group)
+        for dice in self.collision_grid.sprites:
+            self.spawn_wisp(dice)
+        for dice1, dice2 in self.collision_grid.pairs():
+            if abs(dice1.rect.centerx - dice2.rect.centerx) > abs(dice1.rect.centery - dice2.rect.centery):
+                dice1.velocity.x, dice2.velocity.x = -dice1.velocity.x, -dice2.velocity.x
+            else:
+                dice1.velocity.y, dice2.velocity.y = -dice1.velocity.y, -dice2.velocity.y
 
     def clear_dice(self):
         """Removes all dice objects from the dice group, effectively clearing the screen of dice"""
@@ -135,27 +194,40 @@ class ImageProjector:
             bool: True if successful, False if unsuccessful
         """
         try:
-            self.image = pygame.image.load(image_file)
+            self.set_source_image(pygame.image.load(image_file), image_file)
             self.blit()
             self.set_current_image(os.path.basename(image_file))
             return True
         except:
             return False
 
-    def load_image_pil(self, image_pil: Image.Image) -> bool:
-        """Loads a PIL Image object into the projector.
+    def load_decoded_image(self, decoded: DecodedImage):
+        """Swaps an image decoded by the ImageLoader into the projector.
+
+        Args:
+            decoded (DecodedImage): The decoded image and its fitted surface.
+        """
+        self.image_cache.put((decoded.path, decoded.resolution), display_format(decoded.fitted))
+        self.set_source_image(decoded.source, decoded.path)
+        self.blit()
+        self.set_current_image(os.path.basename(decoded.path))
+
+    def load_image_surface(self, image: pygame.Surface, image_name: str) -> bool:
+        """Loads a pygame surface into the projector without copying its pixels.
+
+        The surface is not cached by its fitted size, since its content is not identified by a file path.
 
         Args:
-            image_pil (Image.Image): The object being loaded
+            image (pygame.Surface): The surface being loaded
+            image_name (str): The name shown for the current image
 
         Returns:
             bool: True if successful, False if unsuccessful
         """
         try:
-            image_data = image_pil.tobytes()  # type: ignore[reportUnknownMemberType]
-            self.image = pygame.image.frombuffer(image_data, image_pil.size, image_pil.mode)  # type: ignore[reportArgumentType]
+            self.set_source_image(image, None)
             self.blit()
-            self.set_current_image("hexmap")
+            self.set_current_image(image_name)
             return True
         except:
             return False
@@ -171,33 +243,75 @@ class ImageProjector:
             return file_name[:max_length] + "..."
         return file_name
 
-    def get_image_pil(self) -> Image.Image:
-        """Get PIL image object from pygame display"""
-        bytes_data = pygame.image.tostring(self.image, "RGBA")
-        image_pil = Image.frombytes("RGBA", self.image.get_size(), bytes_data)  # type: ignore[reportUnknownMemberType]
-        return image_pil
-
     def update_resolution(self, resolution: Coordinate):
         """Updates the screen resolution."""
         self.resolution = resolution
         os.environ["SDL_VIDEO_CENTERED"] = "1"
         self.screen = pygame.display.set_mode(self.resolution(), flags=pygame.NOFRAME, display=self.display)
+        self.prepare_image()
+        self.blit()
 
-    def blit(self):
-        """Blits the loaded image onto the screen. Auto-sizes image depending on screen resolution."""
-        self.screen.fill((0, 0, 0))
+    def set_source_image(self, image: pygame.Surface, key: Hashable):
+        """Set the image to be projected and prepare it for the current resolution.
+
+        Args:
+            image (pygame.Surface): The image at its original size.
+            key (Hashable): Key identifying the image by its file path, or None to skip the fitted image cache.
+        """
+        self.source_image = image
+        self.source_key = key
+        self.prepare_image()
+
+    def prepare_image(self):
+        """Fit the source image to the screen resolution, reusing a cached fitted image when available."""
         sw, sh = self.resolution()
-        iw, ih = self.image.get_width(), self.image.get_height()
+        iw, ih = self.source_image.get_width(), self.source_image.get_height()
         if iw / ih > sw / sh:
             t = sw / iw
         else:
             t = sh / ih
-        self.image = pygame.transform.scale(self.image, (t * iw, t * ih))
-        self.screen.blit(self.image, ((sw - t * iw) / 2, (sh - t * ih) / 2))
-        self.draw_dice()
+        self.image_position = ((sw - t * iw) / 2, (sh - t * ih) / 2)
+
+        if (iw, ih) == (sw, sh):
+            self.image = self.source_image
+            return
+
+        if self.source_key is None:
+            self.image = display_format(pygame.transform.scale(self.source_image, (t * iw, t * ih)))
+            return
+
+        key = (self.source_key, (sw, sh))
+        image = self.image_cache.get(key)
+        if image is None:
+            image = display_format(pygame.transform.scale(self.source_image, (t * iw, t * ih)))
+            self.image_cache.put(key, image)
+        self.image = image
+
+    def blit(self):
+        """Blits the prepared image onto the background and schedules a full redraw of the screen."""
+        if self.background.get_size() != self.resolution():
+            self.background = pygame.Surface(self.resolution())
+        self.background.fill((0, 0, 0))
+        self.background.blit(self.image, self.image_position)
+        self.redraw = True
+        self.generation += 1
 
     def update(self):
-        """Update pygame display"""
-        self.update_dice()
-        self.blit()
-        pygame.display.update()
+        """Update pygame display. Only the areas changed by sprites are pushed unless a full redraw is pending."""
+        with profiler.stage("update_dice"):
+            self.update_dice()
+        if self.redraw:
+            with profiler.stage("blit"):
+                self.screen.blit(self.background, (0, 0))
+                for group in self.sprite_groups:
+                    group.draw(self.screen)
+                self.draw_overlay()
+            with profiler.stage("display"):
+                pygame.display.update()
+            self.redraw = False
+        else:
+            with profiler.stage("blit"):
+                dirty_rects = self.draw_dice()
+            if dirty_rects:
+                with profiler.stage("display"):
+                    pygame.display.update(dirty_rects)
@@ -0,0 +1,177 @@
+import pygame
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from PIL import Image
+from typing import Optional, Union
+
+
+class ImageLoadError(Exception):
+    """Raised on the main thread when the most recently requested image could not be decoded.
+
+    Attributes:
+        path (str): The file path of the image.
+        ticket (int): The request ticket the image was decoded for.
+    """
+
+    def __init__(self, path: str, ticket: int, error: Exception):
+        super().__init__(f"Cannot load image '{path}': {error}")
+        self.path = path
+        self.ticket = ticket
+
+
+class DecodedImage:
+    """An image decoded off the main thread, ready to be swapped into the projector.
+
+    Attributes:
+        path (str): The file path of the decoded image.
+        ticket (int): The request ticket the image was decoded for.
+        resolution (tuple[int, int]): The projector resolution the fitted surface was made for.
+        source (pygame.Surface): The image at its original size.
+        fitted (pygame.Surface): The image fit to the requested resolution.
+        thumbnail (Image.Image): A PIL thumbnail of the image for the app window preview.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ticket: int,
+        resolution: tuple[int, int],
+        source: pygame.Surface,
+        fitted: pygame.Surface,
+        thumbnail: Image.Image,
+    ):
+        self.path = path
+        self.ticket = ticket
+        self.resolution = resolution
+        self.source = source
+        self.fitted = fitted
+        self.thumbnail = thumbnail
+
+
+class ImageLoader:
+    """Decodes image files on a background thread and hands the results back through a completion queue.
+
+    Only the most recent request is delivered. Requesting a new image cancels any request still pending,
+    so clicking through images quickly never swaps a stale image onto the projector.
+
+    Attributes:
+        executor (ThreadPoolExecutor): Worker pool running the decode jobs.
+        completed (queue.Queue): Completion queue of decoded images, drained on the main thread by poll().
+        ticket (int): Ticket of the most recent request. Results carrying an older ticket are discarded.
+        pending (Optional[Future]): Future of the most recent request.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """
+        Initializes the ImageLoader with an idle worker pool.
+
+        Args:
+            max_workers (int): Number of decode worker threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self.completed: queue.Queue[Union[DecodedImage, ImageLoadError]] = queue.Queue()
+        self.lock = threading.Lock()
+        self.ticket: int = 0
+        self.pending: Optional[Future[None]] = None
+
+    def request(self, image_path: str, resolution: tuple[int, int], thumbnail_dimensions: tuple[int, int]) -> int:
+        """Queue an image file for decoding, cancelling any request still pending.
+
+        Args:
+            image_path (str): The file path of the image.
+            resolution (tuple[int, int]): The projector resolution the image is fit to.
+            thumbnail_dimensions (tuple[int, int]): Maximum dimensions of the preview thumbnail.
+
+        Returns:
+            int: The ticket identifying this request.
+        """
+        ticket = self.cancel()
+        self.pending = self.executor.submit(self.decode, image_path, ticket, resolution, thumbnail_dimensions)
+        return ticket
+
+    def cancel(self) -> int:
+        """Cancel the pending request, if any. A request already decoding finishes but is never delivered.
+
+        Returns:
+            int: The new current ticket.
+        """
+        with self.lock:
+            self.ticket += 1
+            ticket = self.ticket
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        return ticket
+
+    def is_current(self, ticket: int) -> bool:
+        """Check if a ticket belongs to the most recent request"""
+        with self.lock:
+            return ticket == self.ticket
+
+    def busy(self) -> bool:
+        """Check if a request is still decoding"""
+        return self.pending is not None and not self.pending.done()
+
+    def decode(
+        self, image_path: str, ticket: int, resolution: tuple[int, int], thumbnail_dimensions: tuple[int, int]
+    ):
+        """Decode an image file once and derive the fitted surface and thumbnail from it. Runs on the worker thread.
+
+        Images with transparency keep their alpha channel. A failed decode is queued as an ImageLoadError.
+
+        Args:
+            image_path (str): The file path of the image.
+            ticket (int): The request ticket.
+            resolution (tuple[int, int]): The projector resolution the image is fit to.
+            thumbnail_dimensions (tuple[int, int]): Maximum dimensions of the preview thumbnail.
+        """
+        if not self.is_current(ticket):
+            return
+        try:
+            with Image.open(image_path) as img:
+                mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+                source_pil = img.convert(mode)
+        except Exception as e:
+            if self.is_current(ticket):
+                self.completed.put(ImageLoadError(image_path, ticket, e))
+            return
+        if not self.is_current(ticket):
+            return
+
+        sw, sh = resolution
+        iw, ih = source_pil.size
+        t = min(sw / iw, sh / ih)
+        fitted_pil = source_pil.resize((max(1, int(t * iw)), max(1, int(t * ih))), Image.Resampling.BILINEAR)
+        thumbnail = fitted_pil.copy()
+        thumbnail.thumbnail(thumbnail_dimensions)
+
+        source = pygame.image.frombuffer(source_pil.tobytes(), source_pil.size, mode)  # type: ignore[reportUnknownMemberType]
+        fitted = pygame.image.frombuffer(fitted_pil.tobytes(), fitted_pil.size, mode)  # type: ignore[reportUnknownMemberType]
+        if self.is_current(ticket):
+            self.completed.put(DecodedImage(image_path, ticket, resolution, source, fitted, thumbnail))
+
+    def poll(self) -> Optional[DecodedImage]:
+        """Drain the completion queue. Runs on the main thread.
+
+        Returns:
+            Optional[DecodedImage]: The decoded image of the most recent request, or None if it is not ready.
+
+        Raises:
+            ImageLoadError: If the most recent request could not be decoded.
+        """
+        result: Optional[Union[DecodedImage, ImageLoadError]] = None
+        while not self.completed.empty():
+            decoded = self.completed.get()
+            if self.is_current(decoded.ticket):
+                result = decoded
+        if result is not None:
+            self.pending = None
+        if isinstance(result, ImageLoadError):
+            raise result
+        return result
+
+    def shutdown(self):
+        """Cancel pending requests and stop the worker pool"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
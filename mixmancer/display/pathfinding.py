@@ -0,0 +1,174 @@
+import numpy as np
+from collections import OrderedDict
+from numpy.typing import NDArray
+from typing import Optional
+
+from scipy.sparse import csr_matrix  # type: ignore[reportMissingTypeStubs]
+from scipy.sparse.csgraph import dijkstra  # type: ignore[reportMissingTypeStubs]
+
+from mixmancer.display.hexgrid import axial_to_offset, neighbours, offset_to_axial
+
+DistanceField = tuple[NDArray[np.float64], NDArray[np.int32]]
+
+
+class Pathfinder:
+    """Shortest routes over the staggered hex grid, weighted by a per-hex movement cost layer.
+
+    The grid is held as a sparse graph whose edges lead from each hex to its passable neighbours, weighted by the
+    cost of entering the neighbour. An impassable hex cannot be entered but can be left, so a player standing on a
+    hex that gets blocked is not stranded. Distance fields from a hex to every hex within a cost limit are computed
+    with scipy's compiled Dijkstra and cached, and routes are read back from their predecessors, so repeated
+    queries from the same hex cost no search at all. Changing the cost of a hex drops only the cached fields that
+    reached it.
+
+    Attributes:
+        costs (NDArray): Cost of entering each hex, indexed by grid row then column. Impassable hexes are inf.
+        graph (Optional[csr_matrix]): Neighbour graph, built on first use.
+        fields (OrderedDict): Cached distances and predecessors keyed by (source, limit), least recently used first.
+        field_cache_size (int): Maximum number of cached distance fields.
+    """
+
+    def __init__(self, costs: NDArray[np.float64], field_cache_size: int = 8):
+        """
+        Args:
+            costs (NDArray): Cost of entering each hex, indexed by grid row then column. Use inf for impassable
+                hexes. Costs must be positive.
+            field_cache_size (int): Maximum number of cached distance fields.
+        """
+        self.costs: NDArray[np.float64] = np.empty((0, 0))
+        self.graph: Optional[csr_matrix] = None
+        self.fields: OrderedDict[tuple[tuple[int, int], float], DistanceField] = OrderedDict()
+        self.field_cache_size = field_cache_size
+        self.set_costs(costs)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.costs.shape  # type: ignore[return-value]
+
+    def set_costs(self, costs: NDArray[np.float64]):
+        """Replace the whole cost layer, dropping the graph and every cached distance field"""
+        costs = np.asarray(costs, dtype=np.float64)
+        if np.any(costs <= 0):
+            raise ValueError("Movement costs must be positive")
+        self.costs = costs.copy()
+        self.graph = None
+        self.fields.clear()
+
+    def set_cost(self, x: int, y: int, cost: float):
+        """Change the cost of entering one hex, dropping only the cached distance fields that reached it or one of
+        its neighbours.
+
+        Args:
+            x (int): Grid column of the hex.
+            y (int): Grid row of the hex.
+            cost (float): New cost of entering the hex. Use inf to make it impassable.
+        """
+        if cost <= 0:
+            raise ValueError("Movement costs must be positive")
+        passable_changed = np.isinf(cost) != np.isinf(self.costs[y, x])
+        self.costs[y, x] = cost
+        if self.graph is not None:
+            if passable_changed:
+                self.graph = None
+            else:
+                self.graph.data = self.costs.ravel()[self.graph.indices]
+
+        around = np.vstack([[x, y], self.neighbours(x, y)])
+        for key, (distances, _) in list(self.fields.items()):
+            if np.isfinite(distances[around[:, 1], around[:, 0]]).any():
+                del self.fields[key]
+
+    def inside(self, x: int, y: int) -> bool:
+        """Check if a grid location lies on the grid"""
+        return 0 <= y < self.shape[0] and 0 <= x < self.shape[1]
+
+    def neighbours(self, x: int, y: int) -> NDArray[np.int64]:
+        """Grid locations of the neighbours of a hex that lie on the grid, one (x, y) row per neighbour"""
+        around = axial_to_offset(neighbours(offset_to_axial((x, y))))
+        rows, columns = self.shape
+        inside = (around[:, 0] >= 0) & (around[:, 0] < columns) & (around[:, 1] >= 0) & (around[:, 1] < rows)
+        return around[inside]
+
+    def build_graph(self) -> csr_matrix:
+        """Build the neighbour graph, with an edge into every passable hex from each of its neighbours"""
+        rows, columns = self.shape
+        ys, xs = np.divmod(np.arange(rows * columns), columns)
+        around = axial_to_offset(neighbours(offset_to_axial(np.stack([xs, ys], axis=-1))))
+        nx, ny = around[..., 0], around[..., 1]
+        valid = (nx >= 0) & (nx < columns) & (ny >= 0) & (ny < rows)
+        target = np.where(valid, ny * columns + nx, 0)
+        flat = self.costs.ravel()
+        valid &= np.isfinite(flat[target])
+
+        # Edges are generated source by source, so they are already in CSR order
+        indices = target[valid]
+        indptr = np.concatenate([[0], np.cumsum(valid.sum(axis=1))])
+        self.graph = csr_matrix((flat[indices], indices, indptr), shape=(rows * columns, rows * columns))
+        return self.graph
+
+    def distance_field(self, source: tuple[int, int], limit: float = np.inf) -> DistanceField:
+        """Travel cost from a hex to every hex within a cost limit, with the predecessor of each hex on its route.
+
+        Args:
+            source (tuple[int, int]): Grid location (x, y) to measure from.
+            limit (float): Hexes that cost more than this to reach are left unreached.
+
+        Returns:
+            tuple[NDArray, NDArray]: Distances indexed by grid row then column, inf where unreached, and the flat
+                index of the previous hex on the route to each hex, negative where there is none.
+        """
+        key = (source, limit)
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            return field
+        graph = self.graph if self.graph is not None else self.build_graph()
+        x, y = source
+        distances, predecessors = dijkstra(graph, indices=y * self.shape[1] + x, return_predecessors=True, limit=limit)
+        field = (distances.reshape(self.shape), predecessors)
+        self.fields[key] = field
+        if len(self.fields) > self.field_cache_size:
+            self.fields.popitem(last=False)
+        return field
+
+    def path(
+        self, start: tuple[int, int], goal: tuple[int, int], limit: float = np.inf
+    ) -> Optional[list[tuple[int, int]]]:
+        """Find the cheapest route between two hexes, read from the distance field of the start. A cached field
+        from the start that reaches the goal within the limit is reused, whatever limit it was built with.
+
+        Args:
+            start (tuple[int, int]): Grid location (x, y) to start from.
+            goal (tuple[int, int]): Grid location (x, y) to travel to.
+            limit (float): Routes that cost more than this are not searched.
+
+        Returns:
+            Optional[list[tuple[int, int]]]: Grid locations from start to goal inclusive, or None if the goal
+                cannot be reached within the limit.
+        """
+        if not self.inside(*start) or not self.inside(*goal) or np.isinf(self.costs[goal[1], goal[0]]):
+            return None
+        if start == goal:
+            return [start]
+        for key, (distances, predecessors) in self.fields.items():
+            if key[0] == start and distances[goal[1], goal[0]] <= limit:
+                self.fields.move_to_end(key)
+                return self.route(predecessors, start, goal)
+
+        distances, predecessors = self.distance_field(start, limit)
+        if not distances[goal[1], goal[0]] <= limit:
+            return None
+        return self.route(predecessors, start, goal)
+
+    def route(
+        self, predecessors: NDArray[np.int32], start: tuple[int, int], goal: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        """Follow the predecessors of a distance field back from the goal to the start"""
+        columns = self.shape[1]
+        route = [goal]
+        index = goal[1] * columns + goal[0]
+        start_index = start[1] * columns + start[0]
+        while index != start_index:
+            index = int(predecessors[index])
+            route.append((index % columns, index // columns))
+        return route[::-1]
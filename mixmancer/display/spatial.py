@@ -0,0 +1,66 @@
+import pygame
+from typing import Generic, Iterable, TypeVar
+
+SpriteT = TypeVar("SpriteT", bound=pygame.sprite.Sprite)
+
+
+class SpatialHash(Generic[SpriteT]):
+    """Uniform grid broadphase for sprite collisions.
+
+    Each sprite is filed under every grid cell its rect overlaps, so only sprites sharing a cell are tested against
+    each other. With cells about the size of a sprite, each sprite lands in a handful of cells and finding the
+    colliding pairs takes time proportional to the number of sprites rather than its square.
+
+    Attributes:
+        cell_size (int): Width and height of each grid cell in pixels.
+        sprites (list[SpriteT]): The sprites filed by the last rebuild, in group order.
+        cells (dict[tuple[int, int], list[int]]): Indices into sprites of the sprites overlapping each cell, in
+            ascending order, keyed by (column, row).
+    """
+
+    def __init__(self, cell_size: int):
+        """
+        Initializes an empty grid.
+
+        Args:
+            cell_size (int): Width and height of each grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.sprites: list[SpriteT] = []
+        self.cells: dict[tuple[int, int], list[int]] = {}
+
+    def rebuild(self, sprites: Iterable[SpriteT]):
+        """File sprites under the cells their rects currently overlap, replacing the previous contents"""
+        self.sprites = list(sprites)
+        self.cells.clear()
+        size = self.cell_size
+        for index, sprite in enumerate(self.sprites):
+            rect = sprite.rect
+            for column in range(rect.left // size, (rect.right - 1) // size + 1):
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    cell = self.cells.get((column, row))
+                    if cell is None:
+                        self.cells[(column, row)] = [index]
+                    else:
+                        cell.append(index)
+
+    def pairs(self) -> list[tuple[SpriteT, SpriteT]]:
+        """Find the pairs of distinct sprites whose rects overlap.
+
+        Returns:
+            list[tuple[SpriteT, SpriteT]]: Each colliding pair once, earlier sprite first.
+        """
+        tested: set[tuple[int, int]] = set()
+        colliding: list[tuple[SpriteT, SpriteT]] = []
+        for cell in self.cells.values():
+            for i, first in enumerate(cell[:-1]):
+                rect = self.sprites[first].rect
+                for second in cell[i + 1 :]:
+                    # Sprites sharing several cells are tested once
+                    pair = (first, second)
+                    if pair in tested:
+                        continue
+                    tested.add(pair)
+                    if rect.colliderect(self.sprites[second].rect):
+                        colliding.append((self.sprites[first], self.sprites[second]))
+        return colliding
@@ -1,19 +1,35 @@
 import pygame
 import json
-from typing import Any
+import logging
+import math
+import threading
+from typing import Any, Iterable, Optional
 
+from mixmancer.config.parameters import ROTATION_CACHE_BUDGET, ROTATION_STEP
+from mixmancer.display.cache import SurfaceCache
+
+logger = logging.getLogger(__name__)
 
 class Spritesheet:
     """
     A class to handle loading and extracting sprites from a spritesheet image.
 
+    Spritesheets are shared through the process-wide `spritesheets` cache, so a sheet must not be modified once
+    loaded. Get sheets from the cache rather than constructing them directly. The sheet image is only read when a
+    frame is first sliced and is released once `get_frames` has built the frames, so a cached sheet holds just its
+    scaled frames.
+
     Attributes:
         filename (str): The filename of the spritesheet image.
         metadata (str): The filename of the associated metadata file.
-        sprite_sheet (pygame.Surface): The spritesheet image loaded into Pygame surface.
+        sprite_sheet (Optional[pygame.Surface]): The spritesheet image loaded into a Pygame surface, or None while
+            it is not loaded.
         data (dict): The metadata loaded from the associated JSON file.
         height (int): The height of each sprite frame.
         width (int): The width of each sprite frame.
+        frame_bank (dict[tuple[int, int], list[pygame.Surface]]): Every frame pre-sliced and scaled, keyed by size.
+        lock (threading.Lock): Serializes building the frames, so a size requested during a preload is not built
+            twice.
     """
 
     def __init__(self, filename: str):
@@ -25,10 +41,25 @@ class Spritesheet:
         """
         self.filename = filename
         self.metadata = self.filename.replace("png", "json")
-        self.sprite_sheet = pygame.image.load(filename).convert()
+        self.sprite_sheet: Optional[pygame.Surface] = None
         self.data = self.load_metadata()
         self.height, self.width = self.data["dimensions"]["height"], self.data["dimensions"]["width"]
         self.total_frames = len(self.data["frames"]) - 1
+        self.frame_bank: dict[tuple[int, int], list[pygame.Surface]] = {}
+        self.lock = threading.Lock()
+
+    def load_image(self) -> pygame.Surface:
+        """
+        Loads the spritesheet image if it is not loaded yet.
+
+        Returns:
+            pygame.Surface: The spritesheet image.
+        """
+        sheet = self.sprite_sheet
+        if sheet is None:
+            sheet = pygame.image.load(self.filename).convert()
+            self.sprite_sheet = sheet
+        return sheet
 
     def load_metadata(self) -> dict[str, Any]:
         """
@@ -56,9 +87,39 @@ class Spritesheet:
         """
         sprite = pygame.Surface((w, h))
         sprite.set_colorkey((0, 0, 0))
-        sprite.blit(self.sprite_sheet, (0, 0), (x, y, w, h))
+        sprite.blit(self.load_image(), (0, 0), (x, y, w, h))
         return sprite
 
+    def get_frames(self, size: tuple[int, int]) -> list[pygame.Surface]:
+        """
+        Gets every sprite frame in order, sliced from the spritesheet and scaled once per size.
+
+        Frames are converted to the display format when a display is set, and their black colorkey is RLE
+        accelerated, so drawing a frame is a single fast blit. The frames are shared and must not be modified. The
+        sheet image is released once the frames are built.
+
+        Parameters:
+            size (tuple[int, int]): The width and height of the frames.
+
+        Returns:
+            list[pygame.Surface]: The frames, indexed by frame number.
+        """
+        frames = self.frame_bank.get(size)
+        if frames is None:
+            with self.lock:
+                frames = self.frame_bank.get(size)
+                if frames is None:
+                    frames = []
+                    for i in range(self.total_frames + 1):
+                        frame = pygame.transform.scale(self.get_sprite(str(i))[0], size)
+                        if pygame.display.get_surface() is not None:
+                            frame = frame.convert()
+                        frame.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+                        frames.append(frame)
+                    self.frame_bank[size] = frames
+                    self.sprite_sheet = None
+        return frames
+
     def get_frame_count(self) -> int:
         return self.total_frames
 
@@ -76,3 +137,146 @@ class Spritesheet:
         x, y = self.data["frames"][frame]["x"], self.data["frames"][frame]["y"]
         image = self.get_frame(x, y, self.width, self.height)
         return image, str(self.total_frames) == frame
+
+
+class SpritesheetCache:
+    """Process-wide cache of loaded spritesheets. Each sheet and its metadata are read from disk once and the same
+    read-only Spritesheet is handed to every caller.
+
+    Attributes:
+        sheets (dict[str, Spritesheet]): Loaded spritesheets keyed by filename.
+        lock (threading.Lock): Serializes loading, so a sheet requested during a preload is not loaded twice.
+    """
+
+    def __init__(self):
+        self.sheets: dict[str, Spritesheet] = {}
+        self.lock = threading.Lock()
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.sheets
+
+    def get(self, filename: str) -> Spritesheet:
+        """Get a spritesheet, loading it on first use.
+
+        Parameters:
+            filename (str): The filename of the spritesheet image.
+
+        Returns:
+            Spritesheet: The shared spritesheet. It must not be modified.
+        """
+        sheet = self.sheets.get(filename)
+        if sheet is None:
+            with self.lock:
+                sheet = self.sheets.get(filename)
+                if sheet is None:
+                    sheet = Spritesheet(filename)
+                    self.sheets[filename] = sheet
+        return sheet
+
+    def preload(self, filenames: Iterable[str], frame_size: Optional[tuple[int, int]] = None) -> threading.Thread:
+        """Load spritesheets on a background thread. The display mode must be set first, since sheets are
+        converted to the display format. A sheet that fails to load is logged and skipped, and is loaded again on
+        first use.
+
+        Parameters:
+            filenames (Iterable[str]): The filenames of the spritesheet images.
+            frame_size (Optional[tuple[int, int]]): If given, the frames of each sheet are also sliced and scaled to
+                this size.
+
+        Returns:
+            threading.Thread: The started loading thread.
+        """
+
+        def load():
+            for filename in filenames:
+                try:
+                    sheet = self.get(filename)
+                    if frame_size is not None:
+                        sheet.get_frames(frame_size)
+                except (OSError, pygame.error, KeyError, ValueError) as e:
+                    logger.warning("Cannot preload spritesheet '%s': %s", filename, e)
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        return thread
+
+    def clear(self):
+        """Drop all loaded spritesheets"""
+        with self.lock:
+            self.sheets.clear()
+
+
+spritesheets = SpritesheetCache()
+
+
+class RotationCache:
+    """Rotated sprite frames, memoized per frame and angle.
+
+    Angles are quantized to a fixed step so a small set of rotated variants serves every rotation. Frames are
+    identified by the surface itself, since frame banks share one surface per sheet, size and frame. The bounds
+    that rotation gives each frame size are kept separately, as they do not depend on the frame content.
+
+    Attributes:
+        step (int): Angle quantization step in degrees.
+        surfaces (SurfaceCache): Rotated frames keyed by (frame, angle), evicting the least recently used.
+        rects (dict[tuple[tuple[int, int], int], pygame.Rect]): Bounds of a rotated frame relative to the top-left
+            corner of the unrotated frame, keyed by (frame size, angle).
+    """
+
+    def __init__(self, budget: int = ROTATION_CACHE_BUDGET, step: int = ROTATION_STEP):
+        """
+        Initializes an empty cache.
+
+        Args:
+            budget (int): Maximum number of bytes held by rotated frames.
+            step (int): Angle quantization step in degrees.
+        """
+        self.step = step
+        self.surfaces = SurfaceCache(budget)
+        self.rects: dict[tuple[tuple[int, int], int], pygame.Rect] = {}
+
+    def quantize(self, angle: float) -> int:
+        """Round an angle to the nearest step, in the range [0, 360)"""
+        return round(angle / self.step) * self.step % 360
+
+    def rotate(self, frame: pygame.Surface, angle: float) -> pygame.Surface:
+        """Get a frame rotated counterclockwise by an angle, rotating it on first use.
+
+        Parameters:
+            frame (pygame.Surface): The shared frame to rotate. It must not be modified.
+            angle (float): The rotation in degrees, rounded to the cache step.
+
+        Returns:
+            pygame.Surface: The shared rotated frame. It must not be modified.
+        """
+        key = (frame, self.quantize(angle))
+        rotated = self.surfaces.get(key)
+        if rotated is None:
+            rotated = pygame.transform.rotate(frame, key[1])
+            self.surfaces.put(key, rotated)
+        return rotated
+
+    def bounds(self, size: tuple[int, int], angle: float) -> pygame.Rect:
+        """Get the bounds of a frame of the given size rotated by an angle, centred on the unrotated frame.
+
+        Parameters:
+            size (tuple[int, int]): The width and height of the unrotated frame.
+            angle (float): The rotation in degrees, rounded to the cache step.
+
+        Returns:
+            pygame.Rect: The bounds relative to the top-left corner of the unrotated frame.
+        """
+        key = (size, self.quantize(angle))
+        rect = self.rects.get(key)
+        if rect is None:
+            # Bounds of the rotated corners, which is how pygame sizes a rotated surface
+            radians = math.radians(key[1])
+            cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+            w, h = size
+            rect = pygame.Rect(0, 0, math.ceil(w * cos + h * sin), math.ceil(w * sin + h * cos))
+            rect.center = (w // 2, h // 2)
+            self.rects[key] = rect
+        return rect.copy()
+
+
+rotations = RotationCache()
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+from typing import Any, Optional
+
+from mixmancer.config.parameters import TERRAIN_COLORS
+from mixmancer.display.hexgrid import HexLayout
+from mixmancer.display.tiles import source_signature
+
+TERRAIN_UNKNOWN = 255
+
+
+class TerrainIndex:
+    """Terrain type of every hex of the map, looked up in constant time.
+
+    Attributes:
+        names (list[str]): Terrain type names. Hexes store an index into this list.
+        terrain (NDArray): Terrain index of each hex, indexed by grid row then column. Hexes whose centre lies off the
+            map are TERRAIN_UNKNOWN.
+    """
+
+    def __init__(self, terrain: NDArray[np.uint8], names: list[str]):
+        self.terrain = terrain
+        self.names = names
+
+    def at(self, x: int, y: int) -> Optional[str]:
+        """Get the terrain type of a hex, or None if the hex is off the map"""
+        if not (0 <= y < self.terrain.shape[0] and 0 <= x < self.terrain.shape[1]):
+            return None
+        value = self.terrain[y, x]
+        return None if value == TERRAIN_UNKNOWN else self.names[value]
+
+    def costs(self, terrain_costs: dict[str, float], default: float = 1.0) -> NDArray[np.float64]:
+        """Build a movement cost layer from a cost per terrain type. Hexes off the map are impassable.
+
+        Args:
+            terrain_costs (dict[str, float]): Cost of entering a hex of each terrain type.
+            default (float): Cost of terrain types missing from terrain_costs.
+
+        Returns:
+            NDArray: Cost of entering each hex, indexed by grid row then column.
+        """
+        table = np.full(256, np.inf)
+        table[: len(self.names)] = [terrain_costs.get(name, default) for name in self.names]
+        return table[self.terrain]
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 checksum of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def footprint_offsets(layout: HexLayout, steps: int = 7) -> NDArray[np.float64]:
+    """Sample points covering the inner part of a hex, relative to its centre, one (x, y) row per point.
+
+    Points lie on a square lattice clipped to a circle slightly inside the hex, so samples stay clear of the
+    borders and grid lines drawn on the map.
+    """
+    radius = 0.4 * layout.hex_size
+    ticks = np.linspace(-radius, radius, steps)
+    points = np.stack(np.meshgrid(ticks, ticks), axis=-1).reshape(-1, 2)
+    return points[np.hypot(points[:, 0], points[:, 1]) <= radius]
+
+
+def build_terrain_index(
+    image_path: str, layout: HexLayout, colors: dict[str, tuple[int, int, int]] = TERRAIN_COLORS, chunk: int = 8192
+) -> NDArray[np.uint8]:
+    """Classify every hex of a map image by the dominant terrain colour under its footprint.
+
+    Each sample pixel is assigned the nearest terrain colour and each hex takes the terrain most of its samples
+    agree on. Hexes are processed in chunks to bound memory use on large maps.
+
+    Args:
+        image_path (str): The file path of the map image.
+        layout (HexLayout): The hex grid placement on the map.
+        colors (dict[str, tuple[int, int, int]]): Reference colour of each terrain type.
+        chunk (int): Number of hexes classified at once.
+
+    Returns:
+        NDArray: Index into the terrain type names of each hex, indexed by grid row then column.
+    """
+    Image.MAX_IMAGE_PIXELS = None
+    with Image.open(image_path) as img:
+        image = np.asarray(img.convert("RGB"))
+    height, width = image.shape[:2]
+    rows, columns = layout.grid_shape((width, height))
+    palette = np.array(list(colors.values()), dtype=np.int32)
+
+    ys, xs = np.divmod(np.arange(rows * columns), columns)
+    centers = layout.offset_to_pixel(np.stack([xs, ys], axis=-1))
+    on_map = np.flatnonzero(
+        (centers[:, 0] >= 0) & (centers[:, 0] < width) & (centers[:, 1] >= 0) & (centers[:, 1] < height)
+    )
+    offsets = footprint_offsets(layout)
+
+    terrain = np.full(rows * columns, TERRAIN_UNKNOWN, dtype=np.uint8)
+    for start in range(0, len(on_map), chunk):
+        hexes = on_map[start : start + chunk]
+        points = centers[hexes, None, :] + offsets
+        px = np.clip(points[..., 0], 0, width - 1).astype(np.intp)
+        py = np.clip(points[..., 1], 0, height - 1).astype(np.intp)
+        samples = image[py, px].astype(np.int32)
+        nearest = ((samples[..., None, :] - palette) ** 2).sum(axis=-1).argmin(axis=-1)
+        votes = (nearest[..., None] == np.arange(len(palette))).sum(axis=1)
+        terrain[hexes] = votes.argmax(axis=1)
+    return terrain.reshape(rows, columns)
+
+
+def read_terrain_index(index_path: str) -> Optional[dict[str, Any]]:
+    """Read a cached terrain index, or None if it is missing or unreadable"""
+    try:
+        with np.load(index_path) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError):
+        return None
+
+
+def write_terrain_index(index_path: str, **arrays: Any):
+    """Write a terrain index. The file is replaced atomically."""
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, index_path)
+
+
+def open_terrain_index(
+    image_path: str, index_path: str, layout: HexLayout, colors: dict[str, tuple[int, int, int]] = TERRAIN_COLORS
+) -> TerrainIndex:
+    """Open the terrain index of a map image, building it first if it is missing or was built from a different
+    map, hex layout or set of terrain colours.
+
+    The index stores the checksum of the map image with its modification time and size, like the tile pyramid.
+    The image is only hashed again when those change, so opening the index of a large map does not read the map.
+
+    Args:
+        image_path (str): The file path of the map image.
+        index_path (str): The file path of the cached index.
+        layout (HexLayout): The hex grid placement on the map.
+        colors (dict[str, tuple[int, int, int]]): Reference colour of each terrain type.
+
+    Returns:
+        TerrainIndex: The opened index.
+    """
+    names = list(colors)
+    index: dict[str, Any] = {
+        "source": np.array(source_signature(image_path)),
+        "names": np.array(names),
+        "layout": np.array([layout.hex_size, *layout.origin, layout.side_length]),
+        "palette": np.array(list(colors.values())),
+    }
+    stored = read_terrain_index(index_path) or {}
+    same_source = "source" in stored and np.array_equal(stored["source"], index["source"])
+    index["checksum"] = str(stored["checksum"]) if same_source and "checksum" in stored else file_checksum(image_path)
+
+    if "terrain" in stored and all(
+        name in stored and np.array_equal(stored[name], value) for name, value in index.items() if name != "source"
+    ):
+        if not same_source:
+            # The image was touched but not changed, so record its new signature to skip hashing it next time
+            write_terrain_index(index_path, **index, terrain=stored["terrain"])
+        return TerrainIndex(stored["terrain"], names)
+
+    terrain = build_terrain_index(image_path, layout, colors)
+    write_terrain_index(index_path, **index, terrain=terrain)
+    return TerrainIndex(terrain, names)
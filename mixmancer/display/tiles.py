@@ -0,0 +1,150 @@
+import json
+import math
+import os
+import pygame
+from PIL import Image
+from typing import Any
+
+from mixmancer.display.cache import SurfaceCache
+from mixmancer.config.parameters import TILE_CACHE_BUDGET
+
+
+class TilePyramid:
+    """A map image cut into square tiles at several zoom levels, loaded lazily through an LRU tile cache.
+
+    Level 0 is the map at full resolution and each following level halves the width and height. Tiles are stored
+    as PNG files in `<tile_dir>/<level>/<column>_<row>.png` next to an `index.json` describing the pyramid.
+
+    Attributes:
+        tile_dir (str): Directory holding the tiles and index.
+        size (tuple[int, int]): Width and height of the map at level 0.
+        tile_size (int): Width and height of a full tile in pixels.
+        levels (int): Number of zoom levels.
+        cache (SurfaceCache): Loaded tiles keyed by (level, column, row).
+    """
+
+    def __init__(self, tile_dir: str, cache_budget: int = TILE_CACHE_BUDGET):
+        """
+        Opens an existing tile pyramid.
+
+        Args:
+            tile_dir (str): Directory holding the tiles and index.
+            cache_budget (int): Maximum number of bytes held by loaded tiles.
+        """
+        self.tile_dir = tile_dir
+        index = read_index(tile_dir)
+        self.size: tuple[int, int] = tuple(index["size"])  # type: ignore[reportAttributeAccessIssue]
+        self.tile_size: int = index["tile_size"]
+        self.levels: int = index["levels"]
+        self.cache = SurfaceCache(cache_budget)
+
+    def level_size(self, level: int) -> tuple[int, int]:
+        """Get the width and height of the map at a zoom level"""
+        return math.ceil(self.size[0] / 2**level), math.ceil(self.size[1] / 2**level)
+
+    def get_tile(self, level: int, column: int, row: int) -> pygame.Surface:
+        """Get a tile, loading it from disk if it is not cached.
+
+        Args:
+            level (int): Zoom level of the tile.
+            column (int): Column of the tile.
+            row (int): Row of the tile.
+
+        Returns:
+            pygame.Surface: The tile in display pixel format when a display is set.
+        """
+        key = (level, column, row)
+        tile = self.cache.get(key)
+        if tile is None:
+            tile = pygame.image.load(os.path.join(self.tile_dir, str(level), f"{column}_{row}.png"))
+            if pygame.display.get_surface() is not None:
+                tile = tile.convert()
+            self.cache.put(key, tile)
+        return tile
+
+    def blit_region(self, surface: pygame.Surface, level: int, area: pygame.Rect, destination: tuple[int, int]):
+        """Blit a region of the map onto a surface, touching only the tiles that overlap the region.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+            level (int): Zoom level to draw from.
+            area (pygame.Rect): Region of the map in level pixel coordinates. Must lie within the map.
+            destination (tuple[int, int]): Position on the surface of the top-left corner of the region.
+        """
+        ts = self.tile_size
+        for row in range(area.top // ts, (area.bottom - 1) // ts + 1):
+            for column in range(area.left // ts, (area.right - 1) // ts + 1):
+                tile = self.get_tile(level, column, row)
+                tile_rect = tile.get_rect(topleft=(column * ts, row * ts))
+                part = tile_rect.clip(area)
+                position = (destination[0] + part.x - area.x, destination[1] + part.y - area.y)
+                surface.blit(tile, position, part.move(-tile_rect.x, -tile_rect.y))
+
+
+def read_index(tile_dir: str) -> dict[str, Any]:
+    """Read the index of a tile pyramid"""
+    with open(os.path.join(tile_dir, "index.json")) as f:
+        return json.load(f)
+
+
+def source_signature(image_path: str) -> list[int]:
+    """Modification time and size of the source image, used to detect a stale pyramid"""
+    st = os.stat(image_path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def is_current(image_path: str, tile_dir: str) -> bool:
+    """Check if a tile pyramid exists and was built from the current version of the source image"""
+    try:
+        return read_index(tile_dir)["source"] == source_signature(image_path)
+    except (OSError, KeyError, ValueError):
+        return False
+
+
+def build_pyramid(image_path: str, tile_dir: str, tile_size: int = 512):
+    """Cut a map image into a tile pyramid. The source is decoded once; every level is halved from the previous.
+
+    Args:
+        image_path (str): The file path of the source map image.
+        tile_dir (str): Directory the tiles and index are written to.
+        tile_size (int): Width and height of a full tile in pixels.
+    """
+    Image.MAX_IMAGE_PIXELS = None
+    with Image.open(image_path) as img:
+        level_image = img.convert("RGB")
+    size = level_image.size
+
+    level = 0
+    while True:
+        level_dir = os.path.join(tile_dir, str(level))
+        os.makedirs(level_dir, exist_ok=True)
+        w, h = level_image.size
+        for row in range(math.ceil(h / tile_size)):
+            for column in range(math.ceil(w / tile_size)):
+                left, top = column * tile_size, row * tile_size
+                tile = level_image.crop((left, top, min(w, left + tile_size), min(h, top + tile_size)))
+                tile.save(os.path.join(level_dir, f"{column}_{row}.png"))
+        if max(w, h) <= tile_size:
+            break
+        level_image = level_image.reduce(2)
+        level += 1
+
+    with open(os.path.join(tile_dir, "index.json"), "w") as f:
+        json.dump(
+            {"source": source_signature(image_path), "size": size, "tile_size": tile_size, "levels": level + 1}, f
+        )
+
+
+def open_pyramid(image_path: str, tile_dir: str) -> TilePyramid:
+    """Open the tile pyramid of a map image, building it first if it is missing or stale.
+
+    Args:
+        image_path (str): The file path of the source map image.
+        tile_dir (str): Directory holding the tiles and index.
+
+    Returns:
+        TilePyramid: The opened pyramid.
+    """
+    if not is_current(image_path, tile_dir):
+        build_pyramid(image_path, tile_dir)
+    return TilePyramid(tile_dir)
@@ -0,0 +1,154 @@
+import pygame
+import numpy as np
+from numpy.typing import NDArray
+from typing import Callable, Hashable
+
+
+class TrailRenderer:
+    """Draws the player movement history as a smooth curve, caching the fitted curve between frames.
+
+    The curve is a Catmull-Rom spline through the history points in map pixel coordinates. Each segment between
+    two points depends only on its four neighbouring points, so appending or undoing a movement refits only the
+    last segments; the rest of the cached curve is reused. At draw time, segments outside the screen are culled
+    and each visible segment is sampled in proportion to its length on screen.
+
+    Attributes:
+        grid (NDArray): Grid locations the cached curve was fitted to, one (x, y) row per point.
+        points (NDArray): Map pixel locations of the grid locations, one (x, y) row per point.
+        coefficients (NDArray): Cubic coefficients of every segment, shaped (segments, 4, 2).
+        bounds (NDArray): Bounding box of every segment in map pixels as (min x, min y, max x, max y) rows.
+        geometry (Hashable): Map geometry the points were converted with. A change refits the whole curve.
+        pixels_per_sample (float): Target on-screen length in pixels of one straight piece of the drawn curve.
+        max_samples (int): Upper bound on the number of samples per segment.
+    """
+
+    def __init__(self, pixels_per_sample: float = 4.0, max_samples: int = 32):
+        self.grid: NDArray[np.int32] = np.empty((0, 2), dtype=np.int32)
+        self.points: NDArray[np.float64] = np.empty((0, 2))
+        self.coefficients: NDArray[np.float64] = np.empty((0, 4, 2))
+        self.bounds: NDArray[np.float64] = np.empty((0, 4))
+        self.geometry: Hashable = None
+        self.pixels_per_sample = pixels_per_sample
+        self.max_samples = max_samples
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def sync(
+        self, grid: NDArray[np.int32], to_pixel: Callable[[NDArray[np.int32]], NDArray[np.float64]], geometry: Hashable
+    ):
+        """Bring the cached curve up to date with the movement history, refitting only segments that changed.
+
+        Args:
+            grid (NDArray): Grid locations of the history, one (x, y) row per point, oldest first.
+            to_pixel (Callable): Converts an array of grid locations to map pixel locations.
+            geometry (Hashable): Identifies the map geometry used by to_pixel.
+        """
+        if geometry != self.geometry:
+            self.geometry = geometry
+            self.grid = np.empty((0, 2), dtype=np.int32)
+            self.points = np.empty((0, 2))
+
+        # Index of the first point that differs from the cached curve
+        common = min(len(grid), len(self.grid))
+        changed = np.flatnonzero(np.any(grid[:common] != self.grid[:common], axis=1))
+        first = int(changed[0]) if len(changed) else common
+        if first == len(grid) == len(self.grid):
+            return
+
+        self.grid = grid.copy()
+        self.points = np.concatenate([self.points[:first], to_pixel(grid[first:]).astype(np.float64)])
+
+        # A segment reaches one point back and two points forward, so the two segments before the first changed
+        # point are refitted as well
+        start = max(0, first - 2)
+        count = max(0, len(self.points) - 1)
+        coefficients, bounds = self.fit(start, count)
+        self.coefficients = np.concatenate([self.coefficients[: min(start, count)], coefficients])
+        self.bounds = np.concatenate([self.bounds[: min(start, count)], bounds])
+
+    def fit(self, start: int, stop: int) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Fit the segments from start up to stop. Segment i runs from point i to point i + 1.
+
+        Returns:
+            tuple[NDArray, NDArray]: The cubic coefficients and bounding boxes of the segments.
+        """
+        if start >= stop:
+            return np.empty((0, 4, 2)), np.empty((0, 4))
+        last = len(self.points) - 1
+        i = np.arange(start, stop)
+        p0 = self.points[np.maximum(i - 1, 0)]
+        p1 = self.points[i]
+        p2 = self.points[i + 1]
+        p3 = self.points[np.minimum(i + 2, last)]
+        coefficients = 0.5 * np.stack(
+            [2 * p1, p2 - p0, 2 * p0 - 5 * p1 + 4 * p2 - p3, -p0 + 3 * p1 - 3 * p2 + p3], axis=1
+        )
+        # The curve can overshoot its end points slightly, so the box spans all four control points
+        hull = np.stack([p0, p1, p2, p3], axis=1)
+        bounds = np.concatenate([hull.min(axis=1), hull.max(axis=1)], axis=1)
+        return coefficients, bounds
+
+    def sample(self, scale: float, origin: tuple[float, float], screen: tuple[int, int]) -> list[NDArray[np.float64]]:
+        """Sample the visible part of the curve in screen coordinates.
+
+        Args:
+            scale (float): Screen pixels per map pixel.
+            origin (tuple[float, float]): Screen position of the map pixel origin.
+            screen (tuple[int, int]): Width and height of the screen.
+
+        Returns:
+            list[NDArray]: One array of (x, y) screen points per unbroken run of visible segments.
+        """
+        if not len(self.coefficients):
+            return []
+        offset = np.array(origin)
+        lower = self.bounds[:, :2] * scale + offset
+        upper = self.bounds[:, 2:] * scale + offset
+        visible = np.flatnonzero(
+            (upper[:, 0] >= 0) & (upper[:, 1] >= 0) & (lower[:, 0] <= screen[0]) & (lower[:, 1] <= screen[1])
+        )
+        if not len(visible):
+            return []
+
+        # Samples per segment from the on-screen chord length
+        coefficients = self.coefficients[visible]
+        length = np.hypot(*(self.points[visible + 1] - self.points[visible]).T) * scale
+        counts = np.clip(np.ceil(length / self.pixels_per_sample), 1, self.max_samples).astype(np.int64)
+
+        # Evaluate every sample of every visible segment in one pass
+        segment = np.repeat(np.arange(len(visible)), counts)
+        t = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)) / np.repeat(counts, counts)
+        t = t[:, None]
+        c = coefficients[segment]
+        points = ((c[:, 3] * t + c[:, 2]) * t + c[:, 1]) * t + c[:, 0]
+        points = points * scale + offset
+
+        # Split into runs where culled segments leave gaps, closing each run with the end point of its last segment
+        breaks = np.flatnonzero(np.diff(visible) > 1) + 1
+        runs: list[NDArray[np.float64]] = []
+        sample_starts = np.concatenate([[0], np.cumsum(counts)])
+        for first, last in zip(np.concatenate([[0], breaks]), np.concatenate([breaks, [len(visible)]])):
+            end = self.points[visible[last - 1] + 1] * scale + offset
+            runs.append(np.vstack([points[sample_starts[first] : sample_starts[last]], end]))
+        return runs
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        color: tuple[int, int, int],
+        scale: float,
+        origin: tuple[float, float],
+        width: int = 2,
+    ):
+        """Draw the visible part of the curve onto a surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw onto.
+            color (tuple[int, int, int]): RGB color of the curve.
+            scale (float): Screen pixels per map pixel.
+            origin (tuple[float, float]): Screen position of the map pixel origin.
+            width (int): Width of the curve in pixels.
+        """
+        for run in self.sample(scale, origin, surface.get_size()):
+            pygame.draw.lines(surface, color, False, run.tolist(), width)
@@ -1,13 +1,19 @@
+import atexit
 import tkinter as tk
-from tkinter import ttk
-from PIL import Image, ImageTk
+from tkinter import messagebox, ttk
+from PIL import ImageTk
 from typing import Any
 
 from mixmancer.display.image import ImageProjector
+from mixmancer.display.loader import ImageLoader, ImageLoadError
+from mixmancer.display.dice import preload_dice_sheets
+from mixmancer.display.buffer import thumbnail
 from mixmancer.display.hexmap import HexMap
 from mixmancer.sound.mixer import Mixer
 from mixmancer.gui.theme import CustomTheme
 from mixmancer.config.settings import Settings
+from mixmancer.config.data_models import Coordinate
+from mixmancer.profiler import profiler
 
 
 class Controller(tk.Tk):
@@ -18,6 +24,7 @@ class Controller(tk.Tk):
         self.configure_theme()
         self.settings_path = "mixmancer/config/settings.json"
         self.hexmap_path = "assets/map/map.png"
+        self.thumbnail_cache_path = "assets/cache/thumbnails.db"
 
         self.settings = Settings(self.settings_path)
         self.container = ttk.Frame(self, style="Custom.TFrame")
@@ -25,6 +32,8 @@ class Controller(tk.Tk):
         self.frames: dict[type[ttk.Frame], ttk.Frame] = {}
         self.active_frame: type[ttk.Frame]
         self.image_projector = ImageProjector(self.settings.get_projector_resolution(), 1)
+        self.sheet_preloader = preload_dice_sheets()
+        self.image_loader = ImageLoader()
         self.hexmap = HexMap(
             image_path=self.hexmap_path,
             resolution=self.settings.get_projector_resolution(),
@@ -32,7 +41,9 @@ class Controller(tk.Tk):
             offset=self.settings.get_hexmap_offset(),
             start_coordinates=self.settings.get_hexmap_start(),
         )
+        atexit.register(self.hexmap.close)
         self.image_preview: ImageTk.PhotoImage = None  # type: ignore[reportAttributeAccessIssue]
+        self.preview_state: tuple[int, tuple[int, int]] = (-1, (0, 0))
         self.sfx_volume: float = 0.5
         self.mixer = Mixer()
         self.hexmap_flag = False
@@ -53,10 +64,22 @@ class Controller(tk.Tk):
         style.configure("Custom.TFrame", background="lightblue", foreground="black")  # type: ignore[reportUnknownMemberType]
 
     def load_image_file(self, image_path: str):
-        """Displays image on second display and image preview"""
-        self.image_projector.load_image_file(image_path)
-        self.image_pil = Image.open(image_path)
-        self.update_thumnail_image()
+        """Queues image for decoding. The current image stays on screen until the decoded image is swapped in."""
+        self.image_loader.request(image_path, self.image_projector.resolution(), self.image_thumbnail_dimensions)
+
+    def swap_loaded_image(self):
+        """Displays a decoded image on second display and image preview once the loader has finished. A failed
+        decode is reported and the current image stays on screen."""
+        try:
+            decoded = self.image_loader.poll()
+        except ImageLoadError as e:
+            messagebox.showerror("Mixmancer", str(e))
+            return
+        if decoded is not None:
+            self.image_projector.load_decoded_image(decoded)
+            self.image_pil = decoded.thumbnail
+            self.image_preview = ImageTk.PhotoImage(self.image_pil)
+            self.preview_state = (self.image_projector.generation, self.image_thumbnail_dimensions)
 
     def display_image_file(self, image_path: str):
         """Displays image on second display and image preview"""
@@ -64,24 +87,49 @@ class Controller(tk.Tk):
         if self.hexmap_flag:
             self.hexmap_flag = False
 
-    def update_thumnail_image(self):
-        """Display image preview in main app window"""
-        self.image_pil = self.image_projector.get_image_pil()
-        self.image_pil.thumbnail(self.image_thumbnail_dimensions)
+    def update_thumnail_image(self) -> bool:
+        """Display image preview in main app window. The preview is only regenerated when the projected
+        image or the preview dimensions changed since it was last made, and not during a hexmap camera pan.
+
+        Returns:
+            bool: True if the preview was regenerated, False if it was already up to date
+        """
+        state = (self.image_projector.generation, self.image_thumbnail_dimensions)
+        if state == self.preview_state or self.hexmap_panning():
+            return False
+        self.image_pil = thumbnail(self.image_projector.image, self.image_thumbnail_dimensions)
         self.image_preview = ImageTk.PhotoImage(self.image_pil)
+        self.preview_state = state
+        return True
 
     def display_hexmap(self):
         """Display hexmap image"""
-        self.image_pil = self.hexmap.get_current_surface_PIL()
-        self.image_projector.load_image_pil(self.image_pil)
+        self.image_loader.cancel()
+        self.image_projector.load_image_surface(self.hexmap.get_current_surface(), "hexmap")
         self.update_thumnail_image()
         self.hexmap_flag = True
         self.update()
 
+    def hexmap_panning(self) -> bool:
+        """Check if the projected hexmap is in the middle of a camera pan"""
+        return self.hexmap_flag and self.hexmap.camera.moving()
+
+    def animate_hexmap(self):
+        """Render the next frame of a hexmap camera pan straight into the projector"""
+        if self.hexmap_panning():
+            self.hexmap.camera.step()
+            self.image_projector.load_image_surface(self.hexmap.get_current_surface(), "hexmap")
+
     def update(self):
         """Updates tkinter window"""
-        super().update()
-        self.frames[self.active_frame].update()
+        with profiler.stage("tk"):
+            super().update()
+        with profiler.stage("loader"):
+            self.swap_loaded_image()
+        with profiler.stage("frame"):
+            self.frames[self.active_frame].update()
+        with profiler.stage("camera"):
+            self.animate_hexmap()
         self.image_projector.update()
 
     def hexmap_controls(self, command: str):
@@ -89,6 +137,15 @@ class Controller(tk.Tk):
         self.hexmap.command(command)
         self.display_hexmap()
 
+    def hexmap_travel(self, target: tuple[int, int]):
+        """Travel the hexmap player along the cheapest route to a grid location"""
+        if self.hexmap.travel_to(Coordinate(*target)):
+            self.display_hexmap()
+
+    def hexmap_toggle_blocked(self, target: tuple[int, int]):
+        """Make a hexmap hex impassable, or passable again"""
+        self.hexmap.toggle_blocked(Coordinate(*target))
+
     def update_settings(self, settings: Settings):
         self.settings = settings
         settings.to_json(self.settings_path)
@@ -101,5 +158,10 @@ class Controller(tk.Tk):
         if self.hexmap_flag:
             self.display_hexmap()
 
+    def is_animating(self) -> bool:
+        """Check if the projector, a pending image load or a hexmap camera pan needs the main loop to keep running
+        at full rate"""
+        return self.image_projector.is_animating() or self.image_loader.busy() or self.hexmap_panning()
+
     def process_data(self, data: list[Any]):
         self.image_projector.process_data(data)
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
+import atexit
 import os
-from PIL import Image, ImageTk
+from collections import OrderedDict
+from PIL import ImageTk
 
 from typing import Literal, Union, Any, Callable
 
 from mixmancer.gui.controller import Controller
 from mixmancer.gui.theme import CustomButton, CustomImage, CustomSlider, CustomLabel, SquareButton
+from mixmancer.gui.thumbnails import ThumbnailCache
 from mixmancer.utils import check_file_exists
+from mixmancer.profiler import profiler
 
 
 class StartFrame(ttk.Frame):
@@ -76,6 +80,8 @@ class StartFrame(ttk.Frame):
         # Image preview
         self.label_image_preview = CustomImage(self.right_frame)
         self.label_image_preview.pack(anchor=tk.NW, pady=5)
+        self.preview_shown: Union[ImageTk.PhotoImage, None] = None
+        self.label_state: tuple[int, str] = (-1, "")
         self.bind("<Configure>", self.resize_preview_image)  # type: ignore
 
     def update(self):
@@ -88,11 +94,18 @@ class StartFrame(ttk.Frame):
     def update_preview_image(self):
         """Update preview image in app window"""
         if self.controller.image_preview is not None:  # type: ignore[reportUnnecessaryComparison]
-            self.controller.update_thumnail_image()
-            self.label_image_preview.configure(image=self.controller.image_preview)
+            with profiler.stage("preview"):
+                self.controller.update_thumnail_image()
+            if self.controller.image_preview is not self.preview_shown:
+                self.label_image_preview.configure(image=self.controller.image_preview)
+                self.preview_shown = self.controller.image_preview
 
     def update_labels(self):
-        """Update label text in app window"""
+        """Update label text in app window when the projected image or music track changed"""
+        state = (self.controller.image_projector.generation, self.controller.mixer.current_track)
+        if state == self.label_state:
+            return
+        self.label_state = state
         self.button_container["image_selection"].configure(text=self.controller.image_projector.get_current_image())  # type: ignore
         self.button_container["music_selection"].configure(text=self.controller.mixer.get_current_track())  # type: ignore
 
@@ -118,11 +131,23 @@ class StartFrame(ttk.Frame):
 
 
 class ImageFrame(ttk.Frame):
-    """Display .jpg/.jpeg/.png files in assets/img for selection"""
+    """Display .jpg/.jpeg/.png files in assets/img for selection
 
-    def __init__(self, parent: ttk.Frame, controller: Controller):
+    Thumbnails are laid out in a virtual grid. Buttons exist only for the rows in view and are recycled while
+    scrolling, and thumbnails are decoded on demand, so widget count and memory do not grow with the library.
+    """
+
+    def __init__(self, parent: ttk.Frame, controller: Controller, cell_size: int = 120, photo_limit: int = 256):
         ttk.Frame.__init__(self, parent, style="Custom.TFrame")
         self.controller = controller
+        self.cell_size = cell_size
+        self.photo_limit = photo_limit
+        self.image_paths: list[str] = []
+        self.filtered_paths: list[str] = []
+        self.photos: OrderedDict[str, ImageTk.PhotoImage] = OrderedDict()
+        self.button_pool: list[tuple[tk.Button, int]] = []
+        self.view: tuple[int, ...] = ()
+        self.refresh_pending = False
 
         # Create a search bar
         self.query: str = ""
@@ -137,14 +162,13 @@ class ImageFrame(ttk.Frame):
         self.canvas.pack(side="left", fill="both", expand=True)
 
         # Add a vertical scrollbar to the canvas
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)  # type: ignore
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)  # type: ignore
         self.scrollbar.pack(side="right", fill="y")
         self.canvas.configure(yscrollcommand=self.scrollbar.set)
         self.canvas.bind_all("<MouseWheel>", self.on_mouse_wheel)  # type: ignore
 
-        # Create a frame inside the canvas to hold the images
-        self.inner_frame = ttk.Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.inner_frame, anchor="nw")
+        self.thumbnail_cache = ThumbnailCache(self.controller.thumbnail_cache_path, (100, 100))
+        atexit.register(self.thumbnail_cache.close)
         self.display_image_thumbnails("assets/img")
         self.bind("<Configure>", self.on_configure)  # type: ignore
 
@@ -158,49 +182,93 @@ class ImageFrame(ttk.Frame):
         # List all files in the directory
         files = os.listdir(img_dir)
         image_files = [file for file in files if file.lower().endswith((".jpg", ".jpeg", ".png"))]
-
-        # Display thumbnails of each image in a grid pattern
-        self.thumbnail_buttons: list[tk.Button] = []
-        for image_file in image_files:
-            image_path = os.path.join(img_dir, image_file)
-            img = Image.open(image_path)
-            img.thumbnail((100, 100))
-            tk_img = ImageTk.PhotoImage(img)
-            btn = tk.Button(
-                self.inner_frame, image=tk_img, command=lambda name=image_path: self.thumbnail_selected(name)
-            )
-            btn.image = tk_img  # type: ignore[reportAttributeAccessIssue]
-            btn.configure(text=image_file)
-            self.thumbnail_buttons.append(btn)
+        self.image_paths = [os.path.join(img_dir, image_file) for image_file in image_files]
+        self.thumbnail_cache.prune()
         self.layout_thumbnails()
 
     def layout_thumbnails(self):
-        """Dynamically adjusts thumbnail layout based on window width"""
-        for widget in self.inner_frame.winfo_children():
-            widget.grid_forget()
-        width = self.winfo_width()
-        num_columns = max(1, width // 120)
-        counter = 0
-        for _, btn in enumerate(self.thumbnail_buttons):
-            if self.query in btn["text"].lower():
-                row = counter // num_columns
-                column = counter % num_columns
-                btn.grid(row=row, column=column, padx=5, pady=5)
-                counter += 1
+        """Filters the image list by the search query and resets the grid to the top"""
+        self.filtered_paths = [path for path in self.image_paths if self.query in os.path.basename(path).lower()]
+        self.view = ()
+        self.canvas.yview_moveto(0)
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        """Refresh the visible rows once the pending Tk events have been handled"""
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.after_idle(self.refresh_view)
+
+    def refresh_view(self):
+        """Assign pooled buttons to the thumbnails in the rows currently in view"""
+        self.refresh_pending = False
+        num_columns = max(1, self.canvas.winfo_width() // self.cell_size)
+        num_rows = -(-len(self.filtered_paths) // num_columns)
+        top = int(self.canvas.canvasy(0))
+        first_row = top // self.cell_size
+        last_row = (top + self.canvas.winfo_height()) // self.cell_size
+        view = (num_columns, num_rows, first_row, last_row)
+        if view == self.view:
+            return
+        self.view = view
+
+        self.canvas.configure(scrollregion=(0, 0, num_columns * self.cell_size, num_rows * self.cell_size))
+        start = first_row * num_columns
+        visible_paths = self.filtered_paths[start : (last_row + 1) * num_columns]
+        self.load_photos(visible_paths)
+
+        while len(self.button_pool) < len(visible_paths):
+            btn = tk.Button(self.canvas)
+            item = self.canvas.create_window(0, 0, window=btn, anchor="center")
+            self.button_pool.append((btn, item))
+
+        for slot, (btn, item) in enumerate(self.button_pool):
+            if slot >= len(visible_paths):
+                self.canvas.itemconfigure(item, state="hidden")
+                continue
+            image_path = visible_paths[slot]
+            row, column = divmod(start + slot, num_columns)
+            btn.configure(
+                image=self.photos.get(image_path, ""),
+                text=os.path.basename(image_path),
+                command=lambda name=image_path: self.thumbnail_selected(name),
+            )
+            self.canvas.coords(item, (column + 0.5) * self.cell_size, (row + 0.5) * self.cell_size)
+            self.canvas.itemconfigure(item, state="normal")
+
+    def load_photos(self, image_paths: list[str]):
+        """Decode the thumbnails of the given images, keeping a bounded number of recently shown thumbnails
+
+        Args:
+            image_paths (list[str]): The file paths of the images about to be shown.
+        """
+        missing = [path for path in image_paths if path not in self.photos]
+        for image_path, thumbnail in self.thumbnail_cache.get_many(missing).items():
+            self.photos[image_path] = ImageTk.PhotoImage(thumbnail)
+        for image_path in image_paths:
+            if image_path in self.photos:
+                self.photos.move_to_end(image_path)
+        while len(self.photos) > max(self.photo_limit, len(image_paths)):
+            self.photos.popitem(last=False)
 
     def thumbnail_selected(self, image_path: str):
         """Selection function when image is selected"""
         self.controller.display_image_file(image_path)
         self.controller.show_frame(StartFrame)
 
+    def on_scrollbar(self, *args: Any):
+        """Scrolls frame when the scrollbar is moved"""
+        self.canvas.yview(*args)
+        self.schedule_refresh()
+
     def on_mouse_wheel(self, event: Literal[tk.EventType.MouseWheel]):
         """Scrolls frame when called"""
         self.canvas.yview_scroll(-1 * int(event.delta / 120), "units")  # type: ignore[reportUnknownArgumentType]
+        self.schedule_refresh()
 
     def on_configure(self, event: tk.Event):  # type: ignore
         """Configures event functions"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        self.layout_thumbnails()
+        self.schedule_refresh()
 
     def filter_images(self, *args: Any):
         """Filter the list of sound effects based on the search query"""
@@ -307,21 +375,47 @@ class HexMapFrame(ttk.Frame):
             "history": (0, 120),
             "undo": (40, 120),
             "fog": (80, 120),
+            "zoom_in": (20, 160),
+            "zoom_out": (60, 160),
         }
+        self.button_text: dict[str, str] = {"zoom_in": "+", "zoom_out": "-"}
         for name, coordinates in self.button_config.items():
             image_path = f"assets/app/{name}.png"
             file_exists = check_file_exists(image_path)
             self.button_container[name] = SquareButton(
                 self,
                 image_path=image_path if file_exists else None,  # type: ignore[reportArgumentType]
-                text=None if file_exists else "?",
+                text=None if file_exists else self.button_text.get(name, "?"),
                 coordinates=coordinates,
                 command=lambda n=name: self.controller.hexmap_controls(n),  # type: ignore[reportUnknownArgumentType]
             )
 
+        # Travel to a grid location
+        self.travel_entries: dict[tuple[int, int], ttk.Entry] = {}
+        for coordinates in [(0, 200), (40, 200)]:
+            self.travel_entries[coordinates] = ttk.Entry(
+                self, width=4, validate="key", validatecommand=(self.register(self.validate_int), "%P")
+            )
+        self.button_container["travel"] = SquareButton(self, text="Go", coordinates=(80, 200), command=self.travel)
+        self.button_container["block"] = SquareButton(self, text="X", coordinates=(80, 240), command=self.block)
+
+    def validate_int(self, value_if_allowed: str) -> bool:
+        return value_if_allowed.isdigit() or value_if_allowed == ""
+
+    def travel(self):
+        """Travel to the grid location typed into the travel entries"""
+        values = [entry.get() for entry in self.travel_entries.values()]
+        if all(values):
+            self.controller.hexmap_travel(tuple(int(v) for v in values))  # type: ignore[reportArgumentType]
+
+    def block(self):
+        """Toggle whether the grid location typed into the travel entries is impassable"""
+        values = [entry.get() for entry in self.travel_entries.values()]
+        if all(values):
+            self.controller.hexmap_toggle_blocked(tuple(int(v) for v in values))  # type: ignore[reportArgumentType]
+
     def update(self):
         """Update hexmap frame to hide/show buttons"""
-        ttk.Frame().update()
         if self.visible and not self.controller.hexmap_flag:
             self.hide_buttons()
         elif not self.visible and self.controller.hexmap_flag:
@@ -332,6 +426,8 @@ class HexMapFrame(ttk.Frame):
         self.visible = False
         for _, btn in self.button_container.items():
             btn.place_forget()
+        for entry in self.travel_entries.values():
+            entry.place_forget()
 
     def show_buttons(self):
         """Show hexmap control buttons"""
@@ -339,6 +435,8 @@ class HexMapFrame(ttk.Frame):
         for _, btn in self.button_container.items():
             x, y = btn.coordinates
             btn.place(x=x, y=y)
+        for (x, y), entry in self.travel_entries.items():
+            entry.place(x=x, y=y + 8)
 
 
 class SettingsFrame(ttk.Frame):
@@ -0,0 +1,92 @@
+import queue
+import time
+import pygame
+from typing import Any
+
+from mixmancer.gui.controller import Controller
+from mixmancer.config.parameters import FRAME_RATE, IDLE_POLL_RATE, IDLE_GRACE_PERIOD
+from mixmancer.profiler import profiler
+
+
+class Scheduler:
+    """Drives the app main loop in one of two modes.
+
+    While dice are animating, an image is loading or the GM is interacting with the window, the loop runs at the
+    animation frame rate. Otherwise it sleeps on the API data queue, so a dice roll wakes it immediately, and only
+    wakes periodically to pump Tk and pygame events.
+
+    Attributes:
+        app (Controller): The app being driven.
+        data_queue (queue.Queue): Queue of dice rolls received by the API thread.
+        frame_rate (int): Frame rate while active.
+        idle_poll_rate (int): Number of wake-ups per second while idle.
+        grace_period (float): Seconds the loop stays active after the last user input.
+        last_frame (float): Time the previous frame started.
+        last_activity (float): Time of the last user input.
+    """
+
+    def __init__(
+        self,
+        app: Controller,
+        data_queue: "queue.Queue[Any]",
+        frame_rate: int = FRAME_RATE,
+        idle_poll_rate: int = IDLE_POLL_RATE,
+        grace_period: float = IDLE_GRACE_PERIOD,
+    ):
+        self.app = app
+        self.data_queue = data_queue
+        self.frame_rate = frame_rate
+        self.idle_poll_rate = idle_poll_rate
+        self.grace_period = grace_period
+        self.last_frame: float = time.monotonic()
+        self.last_activity: float = time.monotonic()
+        for sequence in ("<Motion>", "<ButtonPress>", "<KeyPress>", "<MouseWheel>", "<Configure>"):
+            self.app.bind_all(sequence, self.mark_activity, add="+")
+
+    def mark_activity(self, *args: Any):
+        """Keep the loop active while the GM is interacting with the window"""
+        self.last_activity = time.monotonic()
+
+    def is_active(self) -> bool:
+        """Check if the next frame should be paced at the animation frame rate"""
+        recent_input = time.monotonic() - self.last_activity < self.grace_period
+        return recent_input or self.app.is_animating()
+
+    def wait(self):
+        """Wait for the next frame. The wait ends early when new data arrives on the queue, so a dice roll is
+        drawn on the very next frame instead of after the full frame interval."""
+        interval = 1 / (self.frame_rate if self.is_active() else self.idle_poll_rate)
+        timeout = self.last_frame + interval - time.monotonic()
+        if timeout > 0:
+            try:
+                data = self.data_queue.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                self.app.process_data(data)
+        self.last_frame = time.monotonic()
+
+    def process_queue(self):
+        """Process all data waiting on the queue"""
+        while not self.data_queue.empty():
+            self.app.process_data(self.data_queue.get())
+
+    def process_events(self):
+        """Handle pygame events for the projector window"""
+        for event in pygame.event.get():
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.app.image_projector.redraw = True
+
+    def step(self):
+        """Run a single frame of the main loop"""
+        self.wait()
+        with profiler.stage("loop"):
+            self.process_queue()
+            self.process_events()
+            self.app.update()
+        profiler.end_frame()
+
+    def run(self):
+        """Run the main loop forever"""
+        while True:
+            self.step()
@@ -0,0 +1,167 @@
+import io
+import logging
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+def make_thumbnail(image_path: str, dimensions: tuple[int, int]) -> Optional[bytes]:
+    """Decode an image file at reduced size and encode its thumbnail.
+
+    JPEG files are decoded in draft mode, which lets the decoder skip straight to the nearest
+    power-of-two downscale instead of decoding every pixel. Runs in a worker process.
+
+    Args:
+        image_path (str): The file path of the image.
+        dimensions (tuple[int, int]): Maximum dimensions of the thumbnail.
+
+    Returns:
+        Optional[bytes]: The encoded thumbnail, or None if the file cannot be read.
+    """
+    try:
+        with Image.open(image_path) as img:
+            img.draft("RGB", dimensions)
+            img.thumbnail(dimensions)
+            alpha = "A" in img.getbands()
+            img = img.convert("RGBA" if alpha else "RGB")
+            buffer = io.BytesIO()
+            img.save(buffer, "PNG" if alpha else "JPEG", quality=90)
+            return buffer.getvalue()
+    except OSError as e:
+        logger.warning("Cannot create thumbnail for '%s': %s", image_path, e)
+        return None
+
+
+class ThumbnailCache:
+    """Persistent thumbnail cache stored in a single SQLite file.
+
+    Entries are keyed by (path, mtime, size, thumbnail dimensions). A file that was modified or resized on
+    disk no longer matches its entry, so it is rebuilt and replaced automatically on the next lookup.
+
+    Attributes:
+        path (str): The file path of the cache database.
+        dimensions (tuple[int, int]): Maximum dimensions of the thumbnails.
+        pool_threshold (int): Minimum number of missing thumbnails before they are built in a process pool.
+        executor (Optional[ProcessPoolExecutor]): Worker pool, started on first use and reused across lookups.
+    """
+
+    def __init__(self, path: str, dimensions: tuple[int, int] = (100, 100), pool_threshold: int = 8):
+        """
+        Initializes the ThumbnailCache, creating the database file if needed.
+
+        Args:
+            path (str): The file path of the cache database.
+            dimensions (tuple[int, int]): Maximum dimensions of the thumbnails.
+            pool_threshold (int): Minimum number of missing thumbnails before they are built in a process pool.
+        """
+        self.path = path
+        self.dimensions = dimensions
+        self.pool_threshold = pool_threshold
+        self.executor: Optional[ProcessPoolExecutor] = None
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS thumbnails ("
+            "path TEXT, width INTEGER, height INTEGER, mtime_ns INTEGER, size INTEGER, data BLOB, "
+            "PRIMARY KEY (path, width, height))"
+        )
+
+    def stat(self, image_path: str) -> Optional[tuple[int, int]]:
+        """Get the modification time and size of a file, used to validate its cache entry, or None if the file
+        was deleted or renamed"""
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def lookup(self, image_path: str) -> Optional[bytes]:
+        """Get the encoded thumbnail of an image if its cache entry is still valid.
+
+        Args:
+            image_path (str): The file path of the image.
+
+        Returns:
+            Optional[bytes]: The encoded thumbnail, or None if missing or stale.
+        """
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, data FROM thumbnails WHERE path = ? AND width = ? AND height = ?",
+            (image_path, *self.dimensions),
+        ).fetchone()
+        if row is None or (row[0], row[1]) != self.stat(image_path):
+            return None
+        return row[2]
+
+    def store(self, image_path: str, data: bytes):
+        """Store the encoded thumbnail of an image, replacing any stale entry. Nothing is stored if the file
+        is gone."""
+        stat = self.stat(image_path)
+        if stat is None:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?)",
+            (image_path, *self.dimensions, *stat, data),
+        )
+
+    def get(self, image_path: str) -> Optional[Image.Image]:
+        """Get the thumbnail of a single image, building and storing it if needed.
+
+        Args:
+            image_path (str): The file path of the image.
+
+        Returns:
+            Optional[Image.Image]: The thumbnail, or None if the file cannot be read.
+        """
+        return self.get_many([image_path]).get(image_path)
+
+    def get_many(self, image_paths: list[str]) -> dict[str, Image.Image]:
+        """Get the thumbnails of several images. Missing thumbnails are built in a process pool.
+
+        Args:
+            image_paths (list[str]): The file paths of the images.
+
+        Returns:
+            dict[str, Image.Image]: Thumbnails keyed by file path. Unreadable files are left out.
+        """
+        encoded: dict[str, Optional[bytes]] = {path: self.lookup(path) for path in image_paths}
+        missing = [path for path, data in encoded.items() if data is None]
+
+        if len(missing) >= self.pool_threshold:
+            if self.executor is None:
+                # Forking would copy the Tk, API and loader threads' state into the workers
+                self.executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+            built = self.executor.map(make_thumbnail, missing, [self.dimensions] * len(missing))
+            encoded.update(zip(missing, built))
+        else:
+            encoded.update((path, make_thumbnail(path, self.dimensions)) for path in missing)
+
+        for path in missing:
+            data = encoded[path]
+            if data is not None:
+                self.store(path, data)
+        if missing:
+            self.connection.commit()
+
+        thumbnails: dict[str, Image.Image] = {}
+        for path, data in encoded.items():
+            if data is not None:
+                thumbnails[path] = Image.open(io.BytesIO(data))
+        return thumbnails
+
+    def prune(self):
+        """Remove entries of files that no longer exist"""
+        paths = [row[0] for row in self.connection.execute("SELECT DISTINCT path FROM thumbnails")]
+        removed = [(path,) for path in paths if not os.path.exists(path)]
+        self.connection.executemany("DELETE FROM thumbnails WHERE path = ?", removed)
+        self.connection.commit()
+
+    def close(self):
+        """Close the cache database and stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        self.connection.close()
@@ -0,0 +1,159 @@
+import json
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import pygame
+
+
+class StageStats:
+    """Rolling timing and allocation samples of a single main-loop stage.
+
+    Attributes:
+        durations (deque[float]): Most recent stage durations in milliseconds.
+        allocations (deque[int]): Most recent net counts of memory blocks allocated during the stage.
+        calls (int): Total number of times the stage ran.
+    """
+
+    def __init__(self, window: int):
+        self.durations: deque[float] = deque(maxlen=window)
+        self.allocations: deque[int] = deque(maxlen=window)
+        self.calls: int = 0
+
+    def add(self, duration: float, allocations: int):
+        self.durations.append(duration)
+        self.allocations.append(allocations)
+        self.calls += 1
+
+    def percentile(self, q: float) -> float:
+        """Get a percentile of the recent durations in milliseconds"""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self) -> dict[str, float]:
+        """Summarize the recent samples"""
+        allocations = sum(self.allocations) / len(self.allocations) if self.allocations else 0.0
+        return {
+            "calls": self.calls,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(max(self.durations, default=0.0), 3),
+            "mean_allocations": round(allocations, 1),
+        }
+
+
+class FrameProfiler:
+    """Times the stages of the main loop and keeps rolling percentiles per stage.
+
+    Stages are timed with the stage() context manager, which costs nothing but a flag check while the profiler
+    is disabled. Allocation counts are the net change in allocated memory blocks reported by
+    sys.getallocatedblocks().
+
+    Attributes:
+        enabled (bool): Flag indicating whether stages are being timed.
+        overlay (bool): Flag indicating whether the stage table is drawn on the projector.
+        window (int): Number of recent samples kept per stage.
+        stages (dict[str, StageStats]): Samples keyed by stage name, in first-seen order.
+        frames (int): Number of frames completed since the profiler was enabled.
+        reports (list[Callable[[], str]]): Extra one-line status reports shown below the stage table.
+    """
+
+    def __init__(self, window: int = 600):
+        self.enabled: bool = False
+        self.overlay: bool = False
+        self.window = window
+        self.stages: dict[str, StageStats] = {}
+        self.frames: int = 0
+        self.reports: list[Callable[[], str]] = []
+        self.font: Optional[pygame.font.Font] = None
+
+    def enable(self, overlay: bool = True):
+        """Start timing stages"""
+        self.enabled = True
+        self.overlay = overlay
+
+    def disable(self):
+        """Stop timing stages"""
+        self.enabled = False
+        self.overlay = False
+
+    def add_report(self, report: Callable[[], str]):
+        """Show a one-line status report below the stage table and in the summary"""
+        self.reports.append(report)
+
+    def reset(self):
+        """Discard all samples"""
+        self.stages.clear()
+        self.frames = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the named stage"""
+        if not self.enabled:
+            yield
+            return
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.record(name, duration, sys.getallocatedblocks() - blocks)
+
+    def record(self, name: str, duration: float, allocations: int = 0):
+        """Record a single sample of the named stage"""
+        if name not in self.stages:
+            self.stages[name] = StageStats(self.window)
+        self.stages[name].add(duration, allocations)
+
+    def end_frame(self):
+        """Mark the end of a main-loop frame"""
+        if self.enabled:
+            self.frames += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize all stages"""
+        return {
+            "frames": self.frames,
+            "stages": {name: stats.summary() for name, stats in self.stages.items()},
+            "reports": [report() for report in self.reports],
+        }
+
+    def dump(self, path: str):
+        """Write the summary of all stages to a JSON file"""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=4)
+
+    def lines(self) -> list[str]:
+        """Format the stage table as text lines"""
+        lines = [f"{'stage':<14}{'p50':>8}{'p95':>8}{'p99':>8}{'alloc':>8}"]
+        for name, stats in self.stages.items():
+            s = stats.summary()
+            lines.append(
+                f"{name:<14}{s['p50_ms']:>8.2f}{s['p95_ms']:>8.2f}{s['p99_ms']:>8.2f}{s['mean_allocations']:>8.0f}"
+            )
+        lines.extend(report() for report in self.reports)
+        return lines
+
+    def render(self) -> pygame.Surface:
+        """Render the stage table onto a translucent surface for the projector overlay"""
+        if self.font is None:
+            self.font = pygame.font.SysFont("Courier New", 14)
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in self.lines()]
+        width = max(text.get_width() for text in rendered) + 10
+        height = sum(text.get_height() for text in rendered) + 10
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 180))
+        y = 5
+        for text in rendered:
+            surface.blit(text, (5, y))
+            y += text.get_height()
+        return surface
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,90 @@
+import pygame
+import pytest
+from PIL import Image
+
+from mixmancer.display.buffer import pil_to_surface, pil_view, stats, surface_rawmode, surface_to_pil, thumbnail
+
+RGBA_MASKS = (0xFF, 0xFF00, 0xFF0000, 0xFF000000)
+
+
+def painted(surface: pygame.Surface) -> pygame.Surface:
+    """Give every pixel a distinct color"""
+    w, h = surface.get_size()
+    for x in range(w):
+        for y in range(h):
+            surface.set_at((x, y), (x * 30 % 256, y * 40 % 256, (x + y) * 20 % 256, 255 - x * y))
+    return surface
+
+
+@pytest.fixture(
+    params=[
+        pytest.param((pygame.SRCALPHA, 32, None), id="default-alpha"),
+        pytest.param((pygame.SRCALPHA, 32, RGBA_MASKS), id="rgba"),
+        pytest.param((0, 32, None), id="rgbx"),
+        pytest.param((0, 24, None), id="packed"),
+    ]
+)
+def surface(request):
+    flags, depth, masks = request.param
+    # An odd width pads the rows of 24-bit surfaces
+    size = (7, 5)
+    if masks is None:
+        return painted(pygame.Surface(size, flags, depth))
+    return painted(pygame.Surface(size, flags, depth, masks))
+
+
+def test_round_trip(surface: pygame.Surface):
+    mode = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+    image = surface_to_pil(surface)
+    assert image.mode == mode
+    assert image.size == surface.get_size()
+    assert image.tobytes() == pygame.image.tostring(surface, mode)
+    back = pil_to_surface(image)
+    assert pygame.image.tostring(back, mode) == pygame.image.tostring(surface, mode)
+
+
+def test_view_matches_pixels(surface: pygame.Surface):
+    mode = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+    with pil_view(surface) as view:
+        assert view.convert(mode).tobytes() == pygame.image.tostring(surface, mode)
+
+
+def test_view_shares_matching_layout():
+    surface = painted(pygame.Surface((7, 5), pygame.SRCALPHA, 32, RGBA_MASKS))
+    if surface_rawmode(surface) != "RGBA":
+        pytest.skip("Masks give a different byte order on this platform")
+    stats.reset()
+    with pil_view(surface):
+        pass
+    assert stats.shared_bytes == surface.get_pitch() * 5
+    assert stats.copied_bytes == 0
+
+
+def test_palette_surface_round_trip():
+    surface = pygame.Surface((7, 5), 0, 8)
+    surface.set_palette([(i, 255 - i, i // 2) for i in range(256)])
+    surface.fill(200)
+    assert surface_rawmode(surface) is None
+    image = surface_to_pil(surface)
+    assert image.getpixel((3, 2))[:3] == (200, 55, 100)
+
+
+def test_pil_to_surface_converts_other_modes():
+    image = Image.new("L", (4, 3), 90)
+    surface = pil_to_surface(image)
+    assert surface.get_size() == (4, 3)
+    assert tuple(surface.get_at((1, 1)))[:3] == (90, 90, 90)
+
+
+def test_thumbnail_keeps_aspect_ratio():
+    surface = pygame.Surface((640, 360), 0, 32)
+    surface.fill((10, 120, 230))
+    image = thumbnail(surface, (160, 160))
+    assert image.mode == "RGB"
+    assert image.size == (160, 90)
+    assert image.getpixel((80, 45)) == (10, 120, 230)
+
+
+def test_thumbnail_does_not_enlarge():
+    surface = pygame.Surface((64, 48), 0, 32)
+    assert thumbnail(surface, (160, 160)).size == (64, 48)
@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+import mixmancer.display.camera as camera_module
+from mixmancer.display.camera import Camera
+
+
+class Clock:
+    """Stand-in for the time module whose perf_counter only moves when told to"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(camera_module, "time", clock)
+    return clock
+
+
+def test_first_pan_jumps(clock: Clock):
+    camera = Camera(duration=0.4)
+    assert camera.step() == (0, 0)
+    camera.pan_to((120, 80))
+    assert not camera.moving()
+    assert camera.step() == (120, 80)
+
+
+def test_pan_converges_to_target(clock: Clock):
+    camera = Camera(duration=0.4)
+    camera.jump((0, 0))
+    camera.pan_to((300, -200))
+    assert camera.moving()
+    assert camera.step() == (0, 0)
+
+    remaining = []
+    for _ in range(10):
+        clock.now += 0.05
+        x, y = camera.step()
+        remaining.append(math.hypot(300 - x, -200 - y))
+    assert remaining == sorted(remaining, reverse=True)
+    assert camera.pixel() == (300, -200)
+    assert not camera.moving()
+
+
+def test_pan_eases_out(clock: Clock):
+    camera = Camera(duration=1.0)
+    camera.jump((0, 0))
+    camera.pan_to((1000, 0))
+    clock.now += 0.25
+    first_quarter = camera.step()[0]
+    clock.now += 0.5
+    third_quarter = camera.step()[0]
+    # Most of the distance is covered early, and the end is approached slowly
+    assert first_quarter > 250
+    assert 1000 - third_quarter < 250 and third_quarter < 1000
+
+
+def test_pan_ends_after_its_duration(clock: Clock):
+    camera = Camera(duration=0.4)
+    camera.jump((0, 0))
+    camera.pan_to((64, 64))
+    clock.now += 0.3
+    assert camera.step() != (64, 64)
+    clock.now += 0.1
+    assert camera.step() == (64, 64)
+
+
+def test_retarget_continues_from_current_position(clock: Clock):
+    camera = Camera(duration=1.0)
+    camera.jump((0, 0))
+    camera.pan_to((100, 0))
+    clock.now += 0.5
+    middle = camera.step()
+    camera.pan_to((100, 100))
+    assert camera.step() == middle
+    clock.now += 1.0
+    assert camera.step() == (100, 100)
+
+
+def test_zero_duration_is_immediate(clock: Clock):
+    camera = Camera(duration=0)
+    camera.jump((0, 0))
+    camera.pan_to((5, 7))
+    assert camera.step() == (5, 7)
+    assert not camera.moving()
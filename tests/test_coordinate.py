@@ -0,0 +1,32 @@
+import pytest
+
+from mixmancer.config.data_models import Coordinate
+
+
+def test_arithmetic_is_element_wise():
+    a, b = Coordinate(6, -4), Coordinate(2, 3)
+    assert a + b == Coordinate(8, -1)
+    assert a - b == Coordinate(4, -7)
+    assert a * b == Coordinate(12, -12)
+    assert a.divide(4) == Coordinate(1, -1)
+    assert isinstance(a + b, Coordinate)
+    assert isinstance(a * b, Coordinate)
+
+
+def test_in_place_addition():
+    location = Coordinate(1, 1)
+    location += Coordinate(0, -1)
+    assert location == Coordinate(1, 0)
+
+
+def test_divide_by_zero():
+    with pytest.raises(ValueError):
+        Coordinate(1, 2).divide(0)
+
+
+def test_passes_as_tuple():
+    c = Coordinate(3, 4)
+    assert c == (3, 4)
+    assert c() == (3, 4)
+    assert c.half() == (1, 2)
+    assert hash(c) == hash((3, 4))
@@ -0,0 +1,109 @@
+import math
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+from mixmancer.display.fog import FogOfWar
+from mixmancer.display.hexgrid import HexLayout
+
+MAP_SIZE = (400, 300)
+SIDE_LENGTH = 40 / math.sqrt(3)
+LAYOUT = HexLayout(40, (20, 23), SIDE_LENGTH)
+# The same grid moved one hex to the right, so hex (x, y) lies where hex (x + 1, y) was
+SHIFTED = HexLayout(40, (60, 23), SIDE_LENGTH)
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "history_fog.npz")
+
+
+def explored_fog(path: str, save_interval: float = 3600.0) -> FogOfWar:
+    fog = FogOfWar(path, MAP_SIZE, radius=1, save_interval=save_interval)
+    fog.configure(LAYOUT)
+    fog.reveal(np.array([(3, 2), (7, 5)]))
+    return fog
+
+
+def mask_alpha(fog: FogOfWar, grid_location: tuple[int, int]) -> int:
+    x, y = fog.layout.offset_to_pixel(grid_location) * fog.mask_scale
+    return fog.mask.get_at((int(x), int(y))).a
+
+
+def test_reveal_marks_hexes_in_radius(path: str):
+    fog = explored_fog(path)
+    assert fog.explored.shape == LAYOUT.grid_shape(MAP_SIZE)
+    assert fog.explored.sum() == 2 * 7
+    assert fog.explored[2, 3] and fog.explored[2, 4] and not fog.explored[2, 5]
+    assert mask_alpha(fog, (3, 2)) == 0
+    assert mask_alpha(fog, (0, 0)) == 255
+    assert not fog.reveal(np.array([(3, 2)]))
+
+
+def test_saves_are_batched(path: str):
+    fog = explored_fog(path)
+    assert fog.dirty and not os.path.exists(path)
+    fog.flush()
+    assert not os.path.exists(path)
+    fog.flush(force=True)
+    assert os.path.exists(path) and not fog.dirty
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_saves_after_interval(path: str):
+    fog = explored_fog(path, save_interval=0.0)
+    assert os.path.exists(path) and not fog.dirty
+
+
+def test_reload(path: str):
+    fog = explored_fog(path)
+    fog.flush(force=True)
+    loaded = FogOfWar(path, MAP_SIZE, radius=1)
+    assert loaded.layout == LAYOUT
+    loaded.configure(LAYOUT)
+    assert np.array_equal(loaded.explored, fog.explored)
+    assert not loaded.dirty
+    assert mask_alpha(loaded, (7, 5)) == 0
+
+
+def test_reload_remaps_to_new_layout(path: str):
+    fog = explored_fog(path)
+    fog.flush(force=True)
+    loaded = FogOfWar(path, MAP_SIZE, radius=1)
+    loaded.configure(SHIFTED)
+    assert loaded.layout == SHIFTED
+    assert loaded.explored.shape == SHIFTED.grid_shape(MAP_SIZE)
+    assert np.array_equal(loaded.explored, fog.explored[:, 1:])
+    assert loaded.dirty
+
+
+def test_configure_remaps_in_place(path: str):
+    fog = explored_fog(path)
+    before = fog.explored.copy()
+    fog.configure(SHIFTED)
+    assert np.array_equal(fog.explored, before[:, 1:])
+    assert mask_alpha(fog, (2, 2)) == 0
+
+
+def test_unreadable_file_is_ignored(path: str):
+    with open(path, "wb") as f:
+        f.write(b"not a fog bitmap")
+    fog = FogOfWar(path, MAP_SIZE)
+    fog.configure(LAYOUT)
+    assert not fog.explored.any()
+
+
+def test_blit_reuses_scaled_mask(path: str):
+    fog = explored_fog(path)
+    surface = pygame.Surface((200, 150))
+    area = pygame.Rect(40, 30, 200, 150)
+    fog.blit(surface, 0, area, (0, 0))
+    scaled, key = fog.scaled, fog.scaled_key
+    assert key is not None
+    fog.blit(surface, 0, area, (0, 0))
+    assert fog.scaled is scaled and fog.scaled_key == key
+    fog.reveal(np.array([(1, 1)]))
+    fog.blit(surface, 0, area, (0, 0))
+    assert fog.scaled_key != key
@@ -0,0 +1,103 @@
+import math
+import numpy as np
+import pytest
+
+from mixmancer.display.hexgrid import (
+    HexLayout,
+    axial_round,
+    axial_to_cube,
+    axial_to_offset,
+    cube_to_axial,
+    distance,
+    hex_range,
+    neighbours,
+    offset_to_axial,
+    ring,
+)
+
+HEX_SIZE = 40
+LAYOUT = HexLayout(HEX_SIZE, (27, 19), HEX_SIZE / math.sqrt(3))
+
+
+@pytest.fixture
+def offsets():
+    xs, ys = np.meshgrid(np.arange(-7, 8), np.arange(-6, 7))
+    return np.stack([xs.ravel(), ys.ravel()], axis=-1)
+
+
+def test_offset_axial_round_trip(offsets):
+    assert np.array_equal(axial_to_offset(offset_to_axial(offsets)), offsets)
+
+
+def test_odd_rows_sit_half_a_hex_left():
+    assert offset_to_axial([0, 1]).tolist() == [-1, 1]
+    assert LAYOUT.offset_to_pixel([0, 1]).tolist() == [27 - HEX_SIZE / 2, 19 + 1.5 * LAYOUT.side_length]
+
+
+def test_axial_cube_round_trip(offsets):
+    axial = offset_to_axial(offsets)
+    cube = axial_to_cube(axial)
+    assert cube.shape == (len(offsets), 3)
+    assert not cube.sum(axis=-1).any()
+    assert np.array_equal(cube_to_axial(cube), axial)
+
+
+def test_conversions_keep_leading_axes(offsets):
+    grid = offsets.reshape(13, 15, 2)
+    assert offset_to_axial(grid).shape == (13, 15, 2)
+    assert LAYOUT.offset_to_pixel(grid).shape == (13, 15, 2)
+    assert neighbours(offset_to_axial(grid)).shape == (13, 15, 6, 2)
+
+
+def test_axial_round_keeps_whole_coordinates(offsets):
+    axial = offset_to_axial(offsets)
+    assert np.array_equal(axial_round(axial.astype(float)), axial)
+
+
+def test_neighbours_are_one_step_away():
+    center = np.array([2, -3])
+    adjacent = neighbours(center)
+    assert len({tuple(a) for a in adjacent.tolist()}) == 6
+    assert (distance(adjacent, center) == 1).all()
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 5])
+def test_hex_range(radius: int):
+    center = np.array([4, -1])
+    hexes = hex_range(center, radius)
+    assert len(hexes) == 3 * radius * (radius + 1) + 1
+    assert len({tuple(h) for h in hexes.tolist()}) == len(hexes)
+    assert (distance(hexes, center) <= radius).all()
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 5])
+def test_ring(radius: int):
+    center = np.array([4, -1])
+    hexes = ring(center, radius)
+    assert len(hexes) == max(1, 6 * radius)
+    assert len({tuple(h) for h in hexes.tolist()}) == len(hexes)
+    assert (distance(hexes, center) == radius).all()
+
+
+def test_pixel_round_trip(offsets):
+    assert np.array_equal(LAYOUT.pixel_to_offset(LAYOUT.offset_to_pixel(offsets)), offsets)
+    cube = axial_to_cube(offset_to_axial(offsets))
+    assert np.array_equal(LAYOUT.pixel_to_cube(LAYOUT.cube_to_pixel(cube)), cube)
+
+
+def test_pixels_inside_a_hex_map_to_it(offsets):
+    centers = LAYOUT.offset_to_pixel(offsets)
+    # Stay within the inscribed circle, which is half a hex wide
+    angles = np.linspace(0, 2 * math.pi, 12, endpoint=False)
+    jitter = 0.45 * HEX_SIZE * np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    pixels = centers[:, None, :] + jitter
+    assert (LAYOUT.pixel_to_offset(pixels) == offsets[:, None, :]).all()
+
+
+def test_grid_shape_covers_map():
+    map_size = (1000, 700)
+    rows, columns = LAYOUT.grid_shape(map_size)
+    xs, ys = np.meshgrid(np.arange(0, map_size[0], 7), np.arange(0, map_size[1], 7))
+    grid = LAYOUT.pixel_to_offset(np.stack([xs, ys], axis=-1))
+    assert (grid[..., 0] < columns).all()
+    assert (grid[..., 1] < rows).all()
@@ -0,0 +1,58 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from mixmancer.config.parameters import TERRAIN_COSTS
+from mixmancer.display.hexgrid import HexLayout
+from mixmancer.display.hexmap import HexMap
+from mixmancer.display.pathfinding import Pathfinder
+from mixmancer.display.terrain import TerrainIndex
+
+MAP_SIZE = (1000, 700)
+LAYOUT = HexLayout(56, (8, 85), 56 / math.sqrt(3))
+
+
+@pytest.fixture
+def hexmap(tmp_path) -> HexMap:
+    """A HexMap with just the parts the movement cost layer uses, so no map image or display is needed"""
+    hexmap = HexMap.__new__(HexMap)
+    hexmap.cost_file = str(tmp_path / "map_costs.npz")
+    hexmap.layout = LAYOUT
+    hexmap.tiles = SimpleNamespace(size=MAP_SIZE)
+    names = list(TERRAIN_COSTS)
+    hexmap.terrain = TerrainIndex(np.zeros(LAYOUT.grid_shape(MAP_SIZE), dtype=np.uint8), names)
+    hexmap.pathfinder = Pathfinder(hexmap.terrain.costs(TERRAIN_COSTS))
+    return hexmap
+
+
+def test_costs_follow_terrain_without_file(hexmap: HexMap):
+    assert np.array_equal(hexmap.load_costs(), hexmap.terrain.costs(TERRAIN_COSTS))
+
+
+def test_saved_costs_round_trip(hexmap: HexMap):
+    hexmap.pathfinder.set_cost(3, 4, np.inf)
+    hexmap.save_costs()
+    costs = hexmap.load_costs()
+    assert np.isinf(costs[4, 3])
+    assert np.array_equal(costs, hexmap.pathfinder.costs)
+
+
+def test_costs_saved_for_another_layout_are_ignored(hexmap: HexMap):
+    hexmap.pathfinder.set_cost(3, 4, np.inf)
+    hexmap.save_costs()
+    hexmap.layout = HexLayout(56, (0, 0), LAYOUT.side_length)
+    hexmap.terrain = TerrainIndex(np.zeros(hexmap.layout.grid_shape(MAP_SIZE), dtype=np.uint8), list(TERRAIN_COSTS))
+    assert np.array_equal(hexmap.load_costs(), hexmap.terrain.costs(TERRAIN_COSTS))
+
+
+def test_costs_for_another_map_size_are_a_cache_miss(hexmap: HexMap):
+    np.savez(hexmap.cost_file, layout=hexmap.layout_key(), costs=np.full((3, 3), 2.0))
+    assert np.array_equal(hexmap.load_costs(), hexmap.terrain.costs(TERRAIN_COSTS))
+
+
+def test_unreadable_costs_are_a_cache_miss(hexmap: HexMap):
+    with open(hexmap.cost_file, "wb") as f:
+        f.write(b"not a cost layer")
+    assert np.array_equal(hexmap.load_costs(), hexmap.terrain.costs(TERRAIN_COSTS))
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from mixmancer.display.history import MovementHistory
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.txt")
+
+
+def read(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def test_creates_empty_journal(path):
+    history = MovementHistory(path)
+    assert len(history) == 0
+    assert read(path) == ""
+
+
+def test_loads_plain_history_file(path):
+    with open(path, "w") as file:
+        file.write("1,2\n3,4\n")
+    assert list(MovementHistory(path)) == [(1, 2), (3, 4)]
+
+
+def test_journal_replays_movements_and_undos(path):
+    history = MovementHistory(path)
+    history.append(1, 2)
+    history.extend([(3, 4), (5, 6)])
+    assert history.undo()
+    history.append(7, 8)
+    assert read(path) == "1,2\n3,4\n5,6\nundo\n7,8\n"
+    assert list(MovementHistory(path)) == [(1, 2), (3, 4), (7, 8)]
+
+
+def test_undo_keeps_first_location(path):
+    history = MovementHistory(path)
+    history.append(1, 2)
+    assert not history.undo()
+    assert history.last() == (1, 2)
+
+
+def test_undo_compacts_at_threshold(path):
+    history = MovementHistory(path, compact_threshold=3)
+    history.extend([(i, -i) for i in range(5)])
+    history.undo()
+    history.undo()
+    assert read(path).endswith("undo\nundo\n")
+    history.undo()
+    assert history.undo_records == 0
+    assert read(path) == "0,0\n1,-1\n"
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_load_compacts_at_threshold(path):
+    with open(path, "w") as file:
+        file.write("1,2\n3,4\n5,6\nundo\nundo\n")
+    history = MovementHistory(path, compact_threshold=2)
+    assert list(history) == [(1, 2)]
+    assert history.undo_records == 0
+    assert read(path) == "1,2\n"
+
+
+def test_torn_final_line_is_dropped(path):
+    with open(path, "w") as file:
+        file.write("1,2\n3,4\n5,")
+    history = MovementHistory(path)
+    assert list(history) == [(1, 2), (3, 4)]
+    assert read(path) == "1,2\n3,4\n"
+
+
+def test_malformed_line_raises(path):
+    with open(path, "w") as file:
+        file.write("1,2\nfoo\n3,4\n")
+    with pytest.raises(ValueError):
+        MovementHistory(path)
+
+
+def test_reset_clears_journal(path):
+    history = MovementHistory(path)
+    history.extend([(1, 2), (3, 4)])
+    history.reset()
+    assert len(history) == 0
+    assert read(path) == ""
+    assert len(MovementHistory(path)) == 0
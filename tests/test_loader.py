@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import wait
+
+import pygame
+import pytest
+from PIL import Image
+
+from mixmancer.display.loader import DecodedImage, ImageLoader, ImageLoadError
+
+RESOLUTION = (160, 90)
+THUMBNAIL = (40, 40)
+
+
+@pytest.fixture
+def loader():
+    loader = ImageLoader()
+    yield loader
+    loader.shutdown()
+
+
+@pytest.fixture
+def images(tmp_path) -> dict[str, str]:
+    paths = {
+        "red": str(tmp_path / "red.png"),
+        "blue": str(tmp_path / "blue.jpg"),
+        "clear": str(tmp_path / "clear.png"),
+    }
+    Image.new("RGB", (320, 240), (255, 0, 0)).save(paths["red"])
+    Image.new("RGB", (64, 32), (0, 0, 255)).save(paths["blue"])
+    Image.new("RGBA", (50, 50), (0, 255, 0, 0)).save(paths["clear"])
+    return paths
+
+
+def finish(loader: ImageLoader) -> DecodedImage:
+    """Wait for the pending request and collect its result"""
+    assert loader.pending is not None
+    loader.pending.result(timeout=10)
+    decoded = loader.poll()
+    assert decoded is not None
+    return decoded
+
+
+def test_decodes_and_fits(loader: ImageLoader, images: dict[str, str]):
+    ticket = loader.request(images["red"], RESOLUTION, THUMBNAIL)
+    decoded = finish(loader)
+    assert decoded.path == images["red"] and decoded.ticket == ticket
+    assert decoded.source.get_size() == (320, 240)
+    assert decoded.fitted.get_size() == (120, 90)
+    assert max(decoded.thumbnail.size) <= 40
+    assert tuple(decoded.fitted.get_at((60, 45)))[:3] == (255, 0, 0)
+    assert not loader.busy() and loader.pending is None
+
+
+def test_keeps_alpha(loader: ImageLoader, images: dict[str, str]):
+    loader.request(images["clear"], RESOLUTION, THUMBNAIL)
+    decoded = finish(loader)
+    assert decoded.source.get_flags() & pygame.SRCALPHA
+    assert decoded.source.get_at((10, 10)).a == 0
+
+
+def test_new_request_cancels_pending(loader: ImageLoader, images: dict[str, str]):
+    # Hold the single worker so the first request is still queued when the second arrives
+    release = threading.Event()
+    blocker = loader.executor.submit(release.wait)
+    loader.request(images["red"], RESOLUTION, THUMBNAIL)
+    first = loader.pending
+    ticket = loader.request(images["blue"], RESOLUTION, THUMBNAIL)
+    assert first is not None and first.cancelled()
+    release.set()
+    blocker.result(timeout=10)
+    decoded = finish(loader)
+    assert decoded.path == images["blue"] and decoded.ticket == ticket
+
+
+def test_stale_decode_is_not_delivered(loader: ImageLoader, images: dict[str, str]):
+    ticket = loader.cancel()
+    loader.decode(images["red"], ticket, RESOLUTION, THUMBNAIL)
+    loader.cancel()
+    assert loader.poll() is None
+    loader.decode(images["red"], ticket, RESOLUTION, THUMBNAIL)
+    assert loader.completed.empty()
+
+
+def test_cancel_drops_result_in_flight(loader: ImageLoader, images: dict[str, str]):
+    loader.request(images["red"], RESOLUTION, THUMBNAIL)
+    pending = loader.pending
+    assert pending is not None
+    loader.cancel()
+    wait([pending], timeout=10)
+    assert loader.poll() is None
+
+
+def test_decode_error_reaches_main_thread(loader: ImageLoader, tmp_path):
+    path = str(tmp_path / "missing.png")
+    ticket = loader.request(path, RESOLUTION, THUMBNAIL)
+    assert loader.pending is not None
+    loader.pending.result(timeout=10)
+    with pytest.raises(ImageLoadError) as error:
+        loader.poll()
+    assert error.value.path == path and error.value.ticket == ticket
+    assert loader.poll() is None
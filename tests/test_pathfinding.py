@@ -0,0 +1,147 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from mixmancer.display.pathfinding import Pathfinder
+
+
+def random_costs(seed: int, shape: tuple[int, int] = (12, 15)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    costs = rng.integers(1, 6, shape).astype(np.float64)
+    costs[rng.random(shape) < 0.15] = np.inf
+    return costs
+
+
+def reference_distances(pathfinder: Pathfinder, source: tuple[int, int]) -> np.ndarray:
+    """Plain Dijkstra over the neighbours of each hex"""
+    distances = np.full(pathfinder.shape, np.inf)
+    queue = [(0.0, source)]
+    while queue:
+        d, (x, y) = heapq.heappop(queue)
+        if d >= distances[y, x]:
+            continue
+        distances[y, x] = d
+        for nx, ny in pathfinder.neighbours(x, y).tolist():
+            cost = pathfinder.costs[ny, nx]
+            if np.isfinite(cost) and d + cost < distances[ny, nx]:
+                heapq.heappush(queue, (d + cost, (nx, ny)))
+    return distances
+
+
+def route_cost(pathfinder: Pathfinder, route: list[tuple[int, int]]) -> float:
+    for (ax, ay), b in zip(route, route[1:]):
+        assert b in [tuple(n) for n in pathfinder.neighbours(ax, ay).tolist()]
+    return float(sum(pathfinder.costs[y, x] for x, y in route[1:]))
+
+
+def passable(pathfinder: Pathfinder) -> list[tuple[int, int]]:
+    return [(int(x), int(y)) for y, x in np.argwhere(np.isfinite(pathfinder.costs))]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_distance_field_matches_reference(seed: int):
+    pathfinder = Pathfinder(random_costs(seed))
+    start = passable(pathfinder)[0]
+    distances, _ = pathfinder.distance_field(start)
+    assert np.allclose(distances, reference_distances(pathfinder, start))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_path_follows_distance_field(seed: int):
+    pathfinder = Pathfinder(random_costs(seed))
+    hexes = passable(pathfinder)
+    start = hexes[0]
+    distances, _ = pathfinder.distance_field(start)
+    for goal in hexes[1::7]:
+        route = pathfinder.path(start, goal)
+        if np.isinf(distances[goal[1], goal[0]]):
+            assert route is None
+            continue
+        assert route is not None
+        assert route[0] == start and route[-1] == goal
+        assert route_cost(pathfinder, route) == pytest.approx(distances[goal[1], goal[0]])
+
+
+def test_path_to_self():
+    pathfinder = Pathfinder(np.ones((4, 4)))
+    assert pathfinder.path((1, 2), (1, 2)) == [(1, 2)]
+
+
+def test_path_off_grid_or_into_impassable_hex():
+    costs = np.ones((4, 4))
+    costs[2, 3] = np.inf
+    pathfinder = Pathfinder(costs)
+    assert pathfinder.path((0, 0), (4, 0)) is None
+    assert pathfinder.path((0, 0), (3, 2)) is None
+
+
+def test_path_respects_limit():
+    pathfinder = Pathfinder(np.full((1, 10), 2.0))
+    assert pathfinder.path((0, 0), (9, 0), limit=10) is None
+    route = pathfinder.path((0, 0), (9, 0), limit=20)
+    assert route == [(x, 0) for x in range(10)]
+
+
+def test_cached_field_beyond_limit_is_not_reused():
+    pathfinder = Pathfinder(np.full((1, 10), 2.0))
+    assert pathfinder.path((0, 0), (9, 0)) is not None
+    assert pathfinder.path((0, 0), (9, 0), limit=5) is None
+    assert pathfinder.path((0, 0), (2, 0), limit=5) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_reused_field_is_most_recently_used():
+    pathfinder = Pathfinder(np.ones((4, 4)))
+    pathfinder.distance_field((0, 0))
+    pathfinder.distance_field((3, 3))
+    pathfinder.path((0, 0), (2, 2))
+    assert [source for source, _ in pathfinder.fields] == [(3, 3), (0, 0)]
+
+
+def test_wall_blocks_path():
+    costs = np.ones((6, 6))
+    costs[:, 3] = np.inf
+    pathfinder = Pathfinder(costs)
+    assert pathfinder.path((0, 0), (5, 5)) is None
+
+
+def test_set_cost_reroutes_around_blocked_hex():
+    pathfinder = Pathfinder(np.ones((5, 8)))
+    route = pathfinder.path((0, 2), (7, 2))
+    assert route is not None
+    blocked = route[3]
+    pathfinder.set_cost(*blocked, np.inf)
+    detour = pathfinder.path((0, 2), (7, 2))
+    assert detour is not None and blocked not in detour
+    distances, _ = pathfinder.distance_field((0, 2))
+    assert route_cost(pathfinder, detour) == pytest.approx(distances[2, 7])
+    assert np.allclose(distances, reference_distances(pathfinder, (0, 2)))
+
+
+def test_blocked_hex_can_be_left_but_not_entered():
+    pathfinder = Pathfinder(np.ones((5, 5)))
+    assert pathfinder.path((2, 2), (4, 2)) is not None
+    pathfinder.set_cost(2, 2, np.inf)
+    route = pathfinder.path((2, 2), (4, 2))
+    assert route is not None and route[0] == (2, 2)
+    assert pathfinder.path((0, 2), (2, 2)) is None
+    detour = pathfinder.path((0, 2), (4, 2))
+    assert detour is not None and (2, 2) not in detour
+
+
+def test_set_cost_keeps_unaffected_fields():
+    costs = np.ones((6, 6))
+    costs[:, 3] = np.inf
+    pathfinder = Pathfinder(costs)
+    pathfinder.distance_field((0, 0))
+    pathfinder.distance_field((5, 0))
+    pathfinder.set_cost(4, 3, 3.0)
+    assert [source for source, _ in pathfinder.fields] == [(0, 0)]
+
+
+def test_costs_must_be_positive():
+    with pytest.raises(ValueError):
+        Pathfinder(np.zeros((2, 2)))
+    pathfinder = Pathfinder(np.ones((2, 2)))
+    with pytest.raises(ValueError):
+        pathfinder.set_cost(0, 0, -1.0)
@@ -0,0 +1,159 @@
+import queue
+from types import SimpleNamespace
+from typing import Any
+
+import pygame
+import pytest
+
+import mixmancer.gui.scheduler as scheduler_module
+from mixmancer.gui.scheduler import Scheduler
+
+FRAME_RATE = 20
+IDLE_POLL_RATE = 10
+GRACE_PERIOD = 1.0
+
+
+class Clock:
+    """Stand-in for the time module whose monotonic only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeQueue:
+    """Data queue that records how long the scheduler waits on it. Waiting advances the clock instead of
+    sleeping."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.items: list[Any] = []
+        self.timeouts: list[float] = []
+
+    def put(self, item: Any):
+        self.items.append(item)
+
+    def empty(self) -> bool:
+        return not self.items
+
+    def get(self, timeout: float = 0.0) -> Any:
+        self.timeouts.append(timeout)
+        if self.items:
+            return self.items.pop(0)
+        self.clock.now += timeout
+        raise queue.Empty
+
+
+class FakeApp:
+    """The parts of the Controller the scheduler drives"""
+
+    def __init__(self):
+        self.bindings: list[str] = []
+        self.animating = False
+        self.processed: list[Any] = []
+        self.updates = 0
+        self.image_projector = SimpleNamespace(redraw=False)
+
+    def bind_all(self, sequence: str, func: Any, add: str = ""):
+        self.bindings.append(sequence)
+
+    def is_animating(self) -> bool:
+        return self.animating
+
+    def process_data(self, data: Any):
+        self.processed.append(data)
+
+    def update(self):
+        self.updates += 1
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(scheduler_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def app() -> FakeApp:
+    return FakeApp()
+
+
+@pytest.fixture
+def data_queue(clock: Clock) -> FakeQueue:
+    return FakeQueue(clock)
+
+
+@pytest.fixture
+def scheduler(app: FakeApp, data_queue: FakeQueue, monkeypatch) -> Scheduler:
+    monkeypatch.setattr(pygame.event, "get", lambda: [])
+    scheduler = Scheduler(app, data_queue, FRAME_RATE, IDLE_POLL_RATE, GRACE_PERIOD)  # type: ignore[arg-type]
+    # Start idle, with the last user input long past
+    scheduler.last_activity -= 10 * GRACE_PERIOD
+    return scheduler
+
+
+def test_binds_user_input(app: FakeApp, scheduler: Scheduler):
+    assert {"<Motion>", "<ButtonPress>", "<KeyPress>"} <= set(app.bindings)
+
+
+def test_idle_polls_slowly(scheduler: Scheduler, data_queue: FakeQueue):
+    assert not scheduler.is_active()
+    scheduler.wait()
+    assert data_queue.timeouts == [pytest.approx(1 / IDLE_POLL_RATE)]
+
+
+def test_animation_runs_at_frame_rate(scheduler: Scheduler, app: FakeApp, data_queue: FakeQueue):
+    app.animating = True
+    assert scheduler.is_active()
+    scheduler.wait()
+    assert data_queue.timeouts == [pytest.approx(1 / FRAME_RATE)]
+
+
+def test_user_input_is_active_for_grace_period(scheduler: Scheduler, clock: Clock):
+    scheduler.mark_activity()
+    assert scheduler.is_active()
+    clock.now += GRACE_PERIOD / 2
+    assert scheduler.is_active()
+    clock.now += GRACE_PERIOD
+    assert not scheduler.is_active()
+
+
+def test_switches_back_to_idle(scheduler: Scheduler, app: FakeApp, data_queue: FakeQueue):
+    app.animating = True
+    scheduler.wait()
+    app.animating = False
+    scheduler.wait()
+    assert data_queue.timeouts == [pytest.approx(1 / FRAME_RATE), pytest.approx(1 / IDLE_POLL_RATE)]
+
+
+def test_data_ends_wait_early(scheduler: Scheduler, app: FakeApp, data_queue: FakeQueue, clock: Clock):
+    data_queue.put({"d20": 1})
+    start = clock.now
+    scheduler.wait()
+    assert app.processed == [{"d20": 1}]
+    assert clock.now == start
+
+
+def test_overrun_frame_does_not_wait(scheduler: Scheduler, app: FakeApp, data_queue: FakeQueue, clock: Clock):
+    app.animating = True
+    scheduler.wait()
+    clock.now += 1.0
+    scheduler.wait()
+    assert len(data_queue.timeouts) == 1
+
+
+def test_step_drains_queue_and_updates(scheduler: Scheduler, app: FakeApp, data_queue: FakeQueue):
+    for roll in range(3):
+        data_queue.put(roll)
+    scheduler.step()
+    assert app.processed == [0, 1, 2]
+    assert app.updates == 1
+
+
+def test_expose_forces_redraw(scheduler: Scheduler, app: FakeApp, monkeypatch):
+    monkeypatch.setattr(pygame.event, "get", lambda: [pygame.event.Event(pygame.WINDOWEXPOSED)])
+    scheduler.process_events()
+    assert app.image_projector.redraw
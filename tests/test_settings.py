@@ -0,0 +1,69 @@
+import json
+from typing import Any
+
+import pytest
+
+from mixmancer.config.data_models import Coordinate
+from mixmancer.config.settings import Settings
+
+VALID: dict[str, Any] = {
+    "color": {"white": "#ffffff", "black": "#000000", "grey": "#36393f", "purple": "#7289da"},
+    "app_resolution": [500, 500],
+    "projector_resolution": [1280, 900],
+    "display": 1,
+    "hexmap_offset": [8, -85],
+    "hexmap_start": [143, 18],
+    "hex_size": 56,
+}
+
+
+def write_settings(tmp_path, **changes: Any) -> str:
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({**VALID, **changes}))
+    return str(path)
+
+
+def test_valid_settings(tmp_path):
+    settings = Settings(write_settings(tmp_path))
+    assert settings.projector_resolution == (1280, 900)
+    assert settings.get_hexmap_offset() == Coordinate(8, -85)
+    assert settings.get_hexmap_start() == Coordinate(143, 18)
+    assert settings.hex_size == 56
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("hexmap_start", [143.5, 18]),
+        ("hexmap_offset", ["8", 85]),
+        ("app_resolution", [500]),
+        ("projector_resolution", [1280, 900, 1]),
+        ("hexmap_start", [True, 18]),
+        ("hexmap_offset", 8),
+    ],
+)
+def test_non_integer_pair(tmp_path, key: str, value: Any):
+    with pytest.raises(ValueError, match=key):
+        Settings(write_settings(tmp_path, **{key: value}))
+
+
+@pytest.mark.parametrize("key, value", [("display", 1.0), ("hex_size", "56")])
+def test_non_integer_value(tmp_path, key: str, value: Any):
+    with pytest.raises(ValueError, match=key):
+        Settings(write_settings(tmp_path, **{key: value}))
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [("hex_size", 0), ("hex_size", -56), ("projector_resolution", [1280, 0]), ("app_resolution", [-1, 500])],
+)
+def test_non_positive_size(tmp_path, key: str, value: Any):
+    with pytest.raises(ValueError, match="must be positive"):
+        Settings(write_settings(tmp_path, **{key: value}))
+
+
+def test_missing_key(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({k: v for k, v in VALID.items() if k != "hex_size"}))
+    with pytest.raises(ValueError, match="hex_size"):
+        Settings(str(path))
@@ -0,0 +1,61 @@
+import random
+
+import pygame
+import pytest
+
+from mixmancer.display.spatial import SpatialHash
+
+
+def sprite(x: int, y: int, w: int = 100, h: int = 100) -> pygame.sprite.Sprite:
+    s = pygame.sprite.Sprite()
+    s.rect = pygame.Rect(x, y, w, h)
+    return s
+
+
+def brute_force(sprites: list[pygame.sprite.Sprite]) -> set[tuple[int, int]]:
+    return {
+        (i, j)
+        for i in range(len(sprites))
+        for j in range(i + 1, len(sprites))
+        if sprites[i].rect.colliderect(sprites[j].rect)
+    }
+
+
+def found(grid: SpatialHash[pygame.sprite.Sprite]) -> list[tuple[int, int]]:
+    index = {id(s): i for i, s in enumerate(grid.sprites)}
+    return [(index[id(a)], index[id(b)]) for a, b in grid.pairs()]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pairs_match_brute_force(seed: int):
+    rng = random.Random(seed)
+    sprites = [
+        sprite(rng.randint(-50, 1000), rng.randint(-50, 600), rng.randint(1, 250), rng.randint(1, 250))
+        for _ in range(60)
+    ]
+    grid: SpatialHash[pygame.sprite.Sprite] = SpatialHash(100)
+    grid.rebuild(sprites)
+    pairs = found(grid)
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == brute_force(sprites)
+    assert all(i < j for i, j in pairs)
+
+
+def test_pair_sharing_cells_is_reported_once():
+    grid: SpatialHash[pygame.sprite.Sprite] = SpatialHash(10)
+    grid.rebuild([sprite(0, 0), sprite(5, 5)])
+    assert found(grid) == [(0, 1)]
+
+
+def test_touching_edges_do_not_collide():
+    grid: SpatialHash[pygame.sprite.Sprite] = SpatialHash(100)
+    grid.rebuild([sprite(0, 0), sprite(100, 0), sprite(0, 100)])
+    assert grid.pairs() == []
+
+
+def test_rebuild_replaces_contents():
+    grid: SpatialHash[pygame.sprite.Sprite] = SpatialHash(100)
+    grid.rebuild([sprite(0, 0), sprite(50, 50)])
+    grid.rebuild([sprite(0, 0), sprite(500, 500)])
+    assert len(grid.sprites) == 2
+    assert grid.pairs() == []
@@ -0,0 +1,78 @@
+import itertools
+import random
+
+import pytest
+
+from mixmancer.config.data_models import Coordinate
+from mixmancer.display.dice import DICE_SIZE, Dice, spawn_slots
+
+W, H = DICE_SIZE
+
+
+def unplaced_dice(bounds: Coordinate) -> Dice:
+    """A dice with just the attributes spawn_position uses, so no spritesheets are loaded"""
+    dice = Dice.__new__(Dice)
+    dice.bounds = bounds
+    dice.w, dice.h = DICE_SIZE
+    return dice
+
+
+def overlap(a: tuple[int, int], b: tuple[int, int]) -> bool:
+    return abs(a[0] - b[0]) < W and abs(a[1] - b[1]) < H
+
+
+@pytest.mark.parametrize("bounds", [Coordinate(1000, 600), Coordinate(1280, 720), Coordinate(357, 241)])
+def test_slots_line_the_edges_without_overlap(bounds: Coordinate):
+    slots = spawn_slots(bounds, DICE_SIZE)
+    right, bottom = bounds.x - W, bounds.y - H
+    assert {(0, 0), (right, 0), (0, bottom), (right, bottom)} <= set(slots)
+    for x, y in slots:
+        assert 0 <= x <= right and 0 <= y <= bottom
+        assert x in (0, right) or y in (0, bottom)
+    assert not any(overlap(a, b) for a, b in itertools.combinations(slots, 2))
+
+
+def test_slots_fill_each_edge():
+    slots = spawn_slots(Coordinate(1000, 600), DICE_SIZE)
+    # Ten slots along the top and bottom edges, four more down each side
+    assert len(slots) == 2 * 10 + 2 * 4
+
+
+def test_slots_for_small_bounds():
+    assert spawn_slots(Coordinate(W - 1, 600), DICE_SIZE) == []
+    assert spawn_slots(Coordinate(W, H), DICE_SIZE) == [(0, 0)]
+
+
+def test_spawn_avoids_other_dice():
+    random.seed(0)
+    bounds = Coordinate(1000, 600)
+    slots = spawn_slots(bounds, DICE_SIZE)
+    dice = unplaced_dice(bounds)
+    others = [Coordinate(x, y) for x, y in slots[:-1]]
+    for _ in range(20):
+        assert dice.spawn_position(others) == slots[-1]
+
+
+def test_spawn_in_free_slot_among_nudged_dice():
+    random.seed(1)
+    bounds = Coordinate(1000, 600)
+    dice = unplaced_dice(bounds)
+    others = [Coordinate(130, 20), Coordinate(530, 470), Coordinate(880, 230)]
+    for _ in range(20):
+        position = dice.spawn_position(others)
+        assert not any(overlap(position, other) for other in others)
+
+
+def test_spawn_picks_least_crowded_slot_when_full():
+    random.seed(2)
+    bounds = Coordinate(1000, 600)
+    slots = spawn_slots(bounds, DICE_SIZE)
+    dice = unplaced_dice(bounds)
+    others = [Coordinate(x, y) for x, y in slots] + [Coordinate(x, y) for x, y in slots[1:]]
+    for _ in range(20):
+        assert dice.spawn_position(others) == slots[0]
+
+
+def test_spawn_without_room():
+    dice = unplaced_dice(Coordinate(W - 1, H - 1))
+    assert dice.spawn_position([]) == (0, 0)
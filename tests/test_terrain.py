@@ -0,0 +1,109 @@
+import math
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import mixmancer.display.terrain as terrain_module
+from mixmancer.config.parameters import TERRAIN_COLORS, TERRAIN_COSTS
+from mixmancer.display.hexgrid import HexLayout
+from mixmancer.display.terrain import TERRAIN_UNKNOWN, open_terrain_index
+
+LAYOUT = HexLayout(40, (20, 23), 40 / math.sqrt(3))
+
+
+class Calls:
+    """Counts the calls of a wrapped function"""
+
+    def __init__(self, function):
+        self.function = function
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.function(*args, **kwargs)
+
+
+@pytest.fixture
+def calls(monkeypatch) -> dict[str, Calls]:
+    wrapped = {
+        "checksum": Calls(terrain_module.file_checksum),
+        "build": Calls(terrain_module.build_terrain_index),
+    }
+    monkeypatch.setattr(terrain_module, "file_checksum", wrapped["checksum"])
+    monkeypatch.setattr(terrain_module, "build_terrain_index", wrapped["build"])
+    return wrapped
+
+
+def paint(path: str, left: str, right: str, size: tuple[int, int] = (400, 300)):
+    """Save a map whose left half is one terrain and right half another"""
+    image = Image.new("RGB", size, TERRAIN_COLORS[left])
+    image.paste(TERRAIN_COLORS[right], (size[0] // 2, 0, size[0], size[1]))
+    image.save(path)
+
+
+@pytest.fixture
+def paths(tmp_path) -> tuple[str, str]:
+    image_path = str(tmp_path / "map.png")
+    paint(image_path, "water", "forest")
+    return image_path, str(tmp_path / "map_terrain.npz")
+
+
+def test_classifies_hexes(paths):
+    index = open_terrain_index(*paths, LAYOUT)
+    assert index.at(0, 0) == "water"
+    assert index.at(8, 2) == "forest"
+    assert index.at(-1, 0) is None
+    rows, columns = index.terrain.shape
+    assert index.terrain[rows - 1, columns - 1] == TERRAIN_UNKNOWN
+    costs = index.costs(TERRAIN_COSTS)
+    assert costs[0, 0] == TERRAIN_COSTS["water"]
+    assert np.isinf(costs[rows - 1, columns - 1])
+
+
+def test_cache_hit_skips_hashing(paths, calls):
+    first = open_terrain_index(*paths, LAYOUT)
+    assert calls["build"].count == 1 and calls["checksum"].count == 1
+    second = open_terrain_index(*paths, LAYOUT)
+    assert calls["build"].count == 1 and calls["checksum"].count == 1
+    assert np.array_equal(first.terrain, second.terrain)
+
+
+def test_touched_map_is_rehashed_once(paths, calls):
+    image_path, index_path = paths
+    open_terrain_index(image_path, index_path, LAYOUT)
+    st = os.stat(image_path)
+    os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    open_terrain_index(image_path, index_path, LAYOUT)
+    assert calls["checksum"].count == 2
+    assert calls["build"].count == 1
+    open_terrain_index(image_path, index_path, LAYOUT)
+    assert calls["checksum"].count == 2
+
+
+def test_changed_map_is_rebuilt(paths, calls):
+    image_path, index_path = paths
+    open_terrain_index(image_path, index_path, LAYOUT)
+    st = os.stat(image_path)
+    paint(image_path, "snow", "forest")
+    # Make sure the signature changes even where timestamps are coarse
+    os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    index = open_terrain_index(image_path, index_path, LAYOUT)
+    assert calls["build"].count == 2
+    assert index.at(0, 0) == "snow"
+
+
+def test_changed_layout_is_rebuilt(paths, calls):
+    open_terrain_index(*paths, LAYOUT)
+    index = open_terrain_index(*paths, HexLayout(50, (25, 29), 50 / math.sqrt(3)))
+    assert calls["build"].count == 2
+    assert index.terrain.shape == HexLayout(50, (25, 29), 50 / math.sqrt(3)).grid_shape((400, 300))
+
+
+def test_unreadable_index_is_rebuilt(paths, calls):
+    image_path, index_path = paths
+    with open(index_path, "wb") as f:
+        f.write(b"not an index")
+    assert open_terrain_index(image_path, index_path, LAYOUT).at(0, 0) == "water"
+    assert calls["build"].count == 1
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+from PIL import Image
+
+import mixmancer.gui.thumbnails as thumbnails_module
+from mixmancer.gui.thumbnails import ThumbnailCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "cache" / "thumbnails.db"), (50, 50), pool_threshold=100)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def builds(monkeypatch) -> list[str]:
+    """Record the images whose thumbnails are built"""
+    built: list[str] = []
+    make = thumbnails_module.make_thumbnail
+    monkeypatch.setattr(thumbnails_module, "make_thumbnail", lambda path, dims: built.append(path) or make(path, dims))
+    return built
+
+
+def save(path: str, color: tuple[int, ...], size: tuple[int, int] = (200, 100), mode: str = "RGB"):
+    Image.new(mode, size, color).save(path)
+
+
+def bump_mtime(path: str):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def image(tmp_path) -> str:
+    path = str(tmp_path / "map.jpg")
+    save(path, (200, 30, 30))
+    return path
+
+
+def test_builds_thumbnail(cache: ThumbnailCache, image: str):
+    thumbnail = cache.get(image)
+    assert thumbnail is not None
+    assert thumbnail.size == (50, 25)
+    assert cache.lookup(image) is not None
+
+
+def test_keeps_alpha(cache: ThumbnailCache, tmp_path):
+    path = str(tmp_path / "token.png")
+    save(path, (0, 0, 0, 0), (40, 40), "RGBA")
+    thumbnail = cache.get(path)
+    assert thumbnail is not None and thumbnail.mode == "RGBA"
+
+
+def test_hit_is_not_rebuilt(cache: ThumbnailCache, image: str, builds: list[str]):
+    cache.get(image)
+    cache.get(image)
+    assert builds == [image]
+
+
+def test_persists_across_instances(cache: ThumbnailCache, image: str, builds: list[str]):
+    cache.get(image)
+    reopened = ThumbnailCache(cache.path, cache.dimensions)
+    try:
+        assert reopened.get(image) is not None
+    finally:
+        reopened.close()
+    assert builds == [image]
+
+
+def test_modified_file_is_rebuilt(cache: ThumbnailCache, image: str, builds: list[str]):
+    cache.get(image)
+    save(image, (30, 30, 200))
+    bump_mtime(image)
+    assert cache.lookup(image) is None
+    thumbnail = cache.get(image)
+    assert thumbnail is not None
+    red, green, blue = thumbnail.convert("RGB").getpixel((25, 12))
+    assert blue > 150 and red < 80
+    assert builds == [image, image]
+
+
+def test_touched_file_is_rebuilt(cache: ThumbnailCache, image: str, builds: list[str]):
+    cache.get(image)
+    bump_mtime(image)
+    cache.get(image)
+    assert builds == [image, image]
+    count = cache.connection.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0]
+    assert count == 1
+
+
+def test_unreadable_and_missing_files_are_left_out(cache: ThumbnailCache, image: str, tmp_path):
+    broken = str(tmp_path / "broken.png")
+    with open(broken, "wb") as f:
+        f.write(b"not an image")
+    missing = str(tmp_path / "missing.png")
+    thumbnails = cache.get_many([image, broken, missing])
+    assert list(thumbnails) == [image]
+    assert cache.lookup(broken) is None and cache.lookup(missing) is None
+
+
+def test_prune_removes_deleted_files(cache: ThumbnailCache, image: str):
+    cache.get(image)
+    os.remove(image)
+    cache.prune()
+    assert cache.connection.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0] == 0
+
+
+def test_pool_builds_many(tmp_path):
+    paths = []
+    for i in range(3):
+        path = str(tmp_path / f"image_{i}.png")
+        save(path, (i * 80, 0, 0))
+        paths.append(path)
+    cache = ThumbnailCache(str(tmp_path / "thumbnails.db"), (50, 50), pool_threshold=2)
+    try:
+        thumbnails = cache.get_many(paths)
+        assert cache.executor is not None
+        assert sorted(thumbnails) == sorted(paths)
+    finally:
+        cache.close()
@@ -0,0 +1,92 @@
+import math
+import os
+
+import pygame
+import pytest
+from PIL import Image
+
+import mixmancer.display.tiles as tiles_module
+from mixmancer.display.tiles import TilePyramid, build_pyramid, is_current, open_pyramid, read_index
+
+MAP_SIZE = (201, 131)
+TILE_SIZE = 64
+
+
+def color(x: int, y: int) -> tuple[int, int, int]:
+    return x % 256, y % 256, (x + 3 * y) % 256
+
+
+@pytest.fixture
+def image_path(tmp_path) -> str:
+    path = str(tmp_path / "map.png")
+    image = Image.new("RGB", MAP_SIZE)
+    image.putdata([color(x, y) for y in range(MAP_SIZE[1]) for x in range(MAP_SIZE[0])])
+    image.save(path)
+    return path
+
+
+@pytest.fixture
+def pyramid(image_path: str, tmp_path) -> TilePyramid:
+    tile_dir = str(tmp_path / "map_tiles")
+    build_pyramid(image_path, tile_dir, TILE_SIZE)
+    return TilePyramid(tile_dir)
+
+
+def test_level_sizes(pyramid: TilePyramid):
+    # 201 -> 101 -> 51, which fits in a single tile
+    assert pyramid.levels == 3
+    assert pyramid.size == MAP_SIZE
+    assert [pyramid.level_size(level) for level in range(3)] == [(201, 131), (101, 66), (51, 33)]
+
+
+def test_tiles_cover_each_level(pyramid: TilePyramid):
+    for level in range(pyramid.levels):
+        w, h = pyramid.level_size(level)
+        columns, rows = math.ceil(w / TILE_SIZE), math.ceil(h / TILE_SIZE)
+        files = os.listdir(os.path.join(pyramid.tile_dir, str(level)))
+        assert len(files) == columns * rows
+        # Edge tiles hold the remainder of the level
+        last = pyramid.get_tile(level, columns - 1, rows - 1)
+        assert last.get_size() == (w - (columns - 1) * TILE_SIZE, h - (rows - 1) * TILE_SIZE)
+
+
+def test_tiles_are_reused(pyramid: TilePyramid, monkeypatch):
+    loads = []
+    load = pygame.image.load
+    monkeypatch.setattr(pygame.image, "load", lambda path: loads.append(path) or load(path))
+    tile = pyramid.get_tile(0, 1, 1)
+    assert pyramid.get_tile(0, 1, 1) is tile
+    assert len(loads) == 1
+    assert (0, 1, 1) in pyramid.cache
+
+
+def test_blit_region_matches_map(pyramid: TilePyramid):
+    area = pygame.Rect(50, 40, 100, 60)
+    surface = pygame.Surface(area.size)
+    pyramid.blit_region(surface, 0, area, (0, 0))
+    for x, y in [(0, 0), (13, 23), (14, 24), (99, 59), (50, 30)]:
+        assert tuple(surface.get_at((x, y)))[:3] == color(area.x + x, area.y + y)
+
+
+def test_blit_region_crosses_tiles_only_where_needed(pyramid: TilePyramid):
+    pyramid.blit_region(pygame.Surface((10, 10)), 0, pygame.Rect(0, 0, 10, 10), (0, 0))
+    assert list(pyramid.cache.surfaces) == [(0, 0, 0)]
+
+
+def test_stale_pyramid_is_rebuilt(image_path: str, tmp_path, monkeypatch):
+    tile_dir = str(tmp_path / "map_tiles")
+    builds = []
+    build = tiles_module.build_pyramid
+    monkeypatch.setattr(tiles_module, "build_pyramid", lambda *args: builds.append(args) or build(*args))
+
+    open_pyramid(image_path, tile_dir)
+    assert is_current(image_path, tile_dir)
+    open_pyramid(image_path, tile_dir)
+    assert len(builds) == 1
+
+    st = os.stat(image_path)
+    os.utime(image_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert not is_current(image_path, tile_dir)
+    open_pyramid(image_path, tile_dir)
+    assert len(builds) == 2
+    assert read_index(tile_dir)["source"] == [st.st_mtime_ns + 10**9, st.st_size]
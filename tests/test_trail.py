@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from mixmancer.display.trail import TrailRenderer
+
+GRID = np.array([(0, 0), (1, 0), (2, 1), (2, 2), (3, 3), (5, 3), (6, 4)], dtype=np.int32)
+
+
+class Recorder:
+    """to_pixel stand-in that records how many grid locations it converted"""
+
+    def __init__(self, scale: float = 10.0):
+        self.scale = scale
+        self.converted = 0
+
+    def __call__(self, grid):
+        self.converted += len(grid)
+        return grid * self.scale
+
+
+def fitted(grid, scale: float = 10.0) -> TrailRenderer:
+    """A renderer fitted to the whole grid from scratch"""
+    trail = TrailRenderer()
+    trail.sync(grid, Recorder(scale), scale)
+    return trail
+
+
+def assert_same_curve(trail: TrailRenderer, expected: TrailRenderer):
+    assert np.array_equal(trail.grid, expected.grid)
+    assert np.allclose(trail.points, expected.points)
+    assert np.allclose(trail.coefficients, expected.coefficients)
+    assert np.allclose(trail.bounds, expected.bounds)
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, len(GRID)])
+def test_fit_from_scratch(length: int):
+    trail = fitted(GRID[:length])
+    assert len(trail) == length
+    assert trail.coefficients.shape == (max(0, length - 1), 4, 2)
+    assert trail.bounds.shape == (max(0, length - 1), 4)
+
+
+def test_append_converts_only_new_points():
+    trail, to_pixel = TrailRenderer(), Recorder()
+    trail.sync(GRID[:4], to_pixel, 10.0)
+    trail.sync(GRID, to_pixel, 10.0)
+    assert to_pixel.converted == len(GRID)
+    assert_same_curve(trail, fitted(GRID))
+
+
+def test_undo_refits_the_end():
+    trail, to_pixel = TrailRenderer(), Recorder()
+    trail.sync(GRID, to_pixel, 10.0)
+    trail.sync(GRID[:-2], to_pixel, 10.0)
+    assert to_pixel.converted == len(GRID)
+    assert_same_curve(trail, fitted(GRID[:-2]))
+
+
+def test_changed_point_refits_from_it():
+    moved = GRID.copy()
+    moved[3] = (4, 0)
+    trail, to_pixel = TrailRenderer(), Recorder()
+    trail.sync(GRID, to_pixel, 10.0)
+    trail.sync(moved, to_pixel, 10.0)
+    assert to_pixel.converted == len(GRID) + len(GRID) - 3
+    assert_same_curve(trail, fitted(moved))
+
+
+def test_unchanged_history_is_skipped():
+    trail, to_pixel = TrailRenderer(), Recorder()
+    trail.sync(GRID, to_pixel, 10.0)
+    trail.sync(GRID.copy(), to_pixel, 10.0)
+    assert to_pixel.converted == len(GRID)
+
+
+def test_geometry_change_refits_everything():
+    trail, to_pixel = TrailRenderer(), Recorder(20.0)
+    trail.sync(GRID, Recorder(10.0), 10.0)
+    trail.sync(GRID, to_pixel, 20.0)
+    assert to_pixel.converted == len(GRID)
+    assert_same_curve(trail, fitted(GRID, 20.0))
+
+
+def test_curve_passes_through_points():
+    trail = fitted(GRID)
+    runs = trail.sample(1.0, (0.0, 0.0), (1000, 1000))
+    assert len(runs) == 1
+    run = runs[0]
+    for point in trail.points:
+        assert np.isclose(run, point).all(axis=1).any()
+
+
+def test_sample_culls_offscreen_segments():
+    trail = fitted(GRID)
+    assert trail.sample(1.0, (-1000.0, -1000.0), (100, 100)) == []